@@ -1,18 +1,48 @@
-import io
-import matplotlib
-
-# Use a non-interactive backend (required when no display is available)
-matplotlib.use("Agg")
+import os
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Optional
 
 from fastapi import FastAPI, Response, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
+from pydantic import BaseModel, Field
+
+from render_pool import (
+    RenderFailedException,
+    RenderPool,
+    RenderQueueFullException,
+    RenderTimeoutException,
+)
+
+# --- Render Worker Pool ---
+# Plot code runs in separate worker processes (with matplotlib, numpy and pandas
+# pre-imported), so a slow or stuck render never blocks the event loop and
+# pyplot's global state is never shared between concurrent requests.
+RENDER_POOL = RenderPool(
+    workers=int(os.getenv("RENDER_WORKERS", "2")),
+    timeout=float(os.getenv("RENDER_TIMEOUT_SECONDS", "30")),
+    memory_limit_mb=int(os.getenv("RENDER_MEMORY_LIMIT_MB", "1024")),
+    max_queue=int(os.getenv("RENDER_MAX_QUEUE", "16")),
+    max_jobs_per_worker=int(os.getenv("RENDER_MAX_JOBS_PER_WORKER", "50")),
+    spawn_retry_backoff=float(os.getenv("RENDER_SPAWN_RETRY_BACKOFF_SECONDS", "1")),
+    spawn_retry_max_backoff=float(os.getenv("RENDER_SPAWN_RETRY_MAX_BACKOFF_SECONDS", "60")),
+)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Start the workers up front so the first request doesn't pay for the imports.
+    await RENDER_POOL.start()
+    yield
+    await RENDER_POOL.stop()
+
 
 # --- FastAPI App Initialization ---
-app = FastAPI(title="Pyplot Code Executor API", description="An API that executes Matplotlib code and returns a PNG image.")
+app = FastAPI(
+    title="Pyplot Code Executor API",
+    description="An API that executes Matplotlib code and returns a PNG, WebP or SVG image.",
+    lifespan=lifespan,
+)
 
 # Allow cross-origin requests from local frontends
 app.add_middleware(
@@ -24,10 +54,28 @@ app.add_middleware(
 )
 
 
-# --- Pydantic Model for Request Body ---
+# --- Pydantic Models for Request Body ---
 # This defines the expected structure of the JSON payload
+class ImageFormat(str, Enum):
+    PNG = "png"
+    WEBP = "webp"
+    SVG = "svg"
+
+    @property
+    def mime_type(self) -> str:
+        return "image/svg+xml" if self is ImageFormat.SVG else f"image/{self.value}"
+
+
 class PyplotCode(BaseModel):
     code: str
+    # Output controls, so the server encodes only as many pixels as the client shows.
+    format: ImageFormat = ImageFormat.PNG
+    dpi: Optional[int] = Field(default=None, ge=10, le=600)
+    # Raster size limits in pixels; the dpi is lowered to fit. Ignored for SVG.
+    max_width: Optional[int] = Field(default=None, ge=16, le=8192)
+    max_height: Optional[int] = Field(default=None, ge=16, le=8192)
+    # Lossless compression effort 0-9 (PNG zlib level; switches WebP to lossless).
+    compression: Optional[int] = Field(default=None, ge=0, le=9)
 
 
 # --- The API Endpoint ---
@@ -35,42 +83,34 @@ class PyplotCode(BaseModel):
 async def generate_graph(payload: PyplotCode):
     """
     Executes raw Python code that uses Matplotlib (pyplot) to generate a graph.
-    Returns the graph as a PNG image byte array.
+    Returns the graph as an image byte array in the requested format.
     """
-
-    # Create an in-memory binary stream to save the image to.
-    # This avoids saving a file to disk on the server.
-    image_buffer = io.BytesIO()
-
-    # Define the execution scope for the user's code.
-    # We provide common libraries like plt, np, and pd so the user's code
-    # doesn't have to import them.
-    execution_globals = {
-        "plt": plt,
-        "np": np,
-        "pd": pd,
-    }
+    options = payload.model_dump(mode="json", exclude={"code"})
 
     try:
-        # The DANGEROUS part: executing arbitrary code.
-        exec(payload.code, execution_globals)
-
-        # Save the current figure created by the executed code to the buffer.
-        # We specify the format as 'png'.
-        plt.savefig(image_buffer, format="png", bbox_inches="tight")
-
-        # Move the buffer's cursor to the beginning to be read.
-        image_buffer.seek(0)
-
-        # Return the image as a response.
-        # The media_type 'image/png' tells the browser to render it as an image.
-        return Response(content=image_buffer.getvalue(), media_type="image/png")
-
-    except Exception as e:
+        # The DANGEROUS part: executing arbitrary code. It runs in a worker process
+        # with a memory limit and a timeout, which limits the damage but is no sandbox.
+        # The worker saves the resulting figure with the requested options and closes all figures.
+        image_bytes = await RENDER_POOL.render({"code": payload.code, "options": options})
+    except RenderQueueFullException as e:
+        # Too many renders are already queued; the client should retry later.
+        raise HTTPException(status_code=503, detail=str(e))
+    except RenderTimeoutException as e:
+        # The worker running the code was killed and replaced.
+        raise HTTPException(status_code=504, detail=str(e))
+    except RenderFailedException as e:
         # If the user's code fails, return a 400 error with the exception message.
         # This helps with debugging on the frontend.
         raise HTTPException(status_code=400, detail=f"Error executing code: {e}")
-    finally:
-        # IMPORTANT: Clear the current figure to free up memory and prevent
-        # plots from bleeding into subsequent requests.
-        plt.close("all")
+
+    # Return the image as a response.
+    # The media_type tells the browser to render it as an image.
+    return Response(content=image_bytes, media_type=payload.format.mime_type)
+
+
+@app.get("/render-stats")
+async def render_stats():
+    """
+    Returns the worker pool size, queue length and job outcome counters.
+    """
+    return RENDER_POOL.stats()
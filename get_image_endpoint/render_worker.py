@@ -0,0 +1,126 @@
+"""
+Render worker process, started by RenderPool as `python render_worker.py <memory_limit_mb>`.
+
+Jobs and results are length-prefixed pickles on stdin/stdout. Anything the plot code
+prints goes to stderr. The module has no application imports so it can run as a script.
+"""
+import io
+import os
+import pickle
+import struct
+import sys
+import traceback
+
+HEADER = struct.Struct("!I")
+
+
+def read_message(stream):
+    header = stream.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    return pickle.loads(stream.read(HEADER.unpack(header)[0]))
+
+
+def write_message(stream, message):
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    stream.write(HEADER.pack(len(payload)) + payload)
+    stream.flush()
+
+
+def run_worker(memory_limit_mb: int):
+    if memory_limit_mb > 0:
+        import resource
+
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    # One BLAS thread per worker: the pool provides the parallelism.
+    os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+    requests = sys.stdin.buffer
+    responses = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import numpy as np
+    import pandas as pd
+
+    write_message(responses, ("ready", os.getpid()))
+    while True:
+        job = read_message(requests)
+        if job is None:
+            return
+        write_message(responses, _render(job, plt, np, pd))
+
+
+def _render(job: dict, plt, np, pd) -> tuple:
+    execution_globals = {
+        "plt": plt,
+        "np": np,
+        "pd": pd,
+    }
+    for name, (columns, column_names) in job.get("frames", {}).items():
+        execution_globals[name] = pd.DataFrame(columns, columns=column_names)
+
+    image_buffer = io.BytesIO()
+    try:
+        exec(job["code"], execution_globals)
+        figure = plt.gcf()
+        figure.savefig(image_buffer, **_save_options(figure, job.get("options", {})))
+        return "ok", image_buffer.getvalue()
+    except MemoryError:
+        return "error", "Rendering ran out of memory"
+    except Exception as e:
+        return "error", f"{type(e).__name__}: {e}" if str(e) else traceback.format_exc(limit=1)
+    finally:
+        plt.close("all")
+
+
+def _save_options(figure, options: dict) -> dict:
+    """
+    savefig arguments for the requested format, dpi, size limit and compression.
+
+    Raster output is capped at `max_width` x `max_height` by lowering the dpi, so only the
+    pixels the client will display are encoded. The saved image is cropped to the tight
+    bounding box, which can be larger than the canvas when labels spill over its edges, so
+    with a cap the box is computed here and passed explicitly: the dpi is scaled against
+    the size that is actually saved.
+    """
+    image_format = options.get("format", "png")
+    save = {"format": image_format, "bbox_inches": "tight"}
+    if image_format == "svg":
+        return save
+
+    dpi = options.get("dpi") or figure.dpi
+    save["dpi"] = dpi
+    max_width, max_height = options.get("max_width"), options.get("max_height")
+    if max_width or max_height:
+        from matplotlib import rcParams
+
+        bbox = figure.get_tightbbox(figure.canvas.get_renderer()).padded(rcParams["savefig.pad_inches"])
+        save["bbox_inches"] = bbox
+        scales = [
+            limit / (size * dpi)
+            for limit, size in ((max_width, bbox.width), (max_height, bbox.height))
+            if limit
+        ]
+        save["dpi"] = dpi * min([1.0, *scales])
+
+    compression = options.get("compression")
+    if image_format == "png" and compression is not None:
+        save["pil_kwargs"] = {"compress_level": compression}
+    elif image_format == "webp":
+        if compression is None:
+            save["pil_kwargs"] = {"quality": 90}
+        else:
+            # Pillow's lossless WebP effort: `method` 0-6 and `quality` 0-100.
+            save["pil_kwargs"] = {"lossless": True, "method": round(compression * 6 / 9),
+                                  "quality": round(compression * 100 / 9)}
+    return save
+
+
+if __name__ == "__main__":
+    run_worker(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
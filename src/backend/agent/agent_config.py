@@ -6,5 +6,7 @@ AGENT_LLM = AzureChatOpenAI(
     azure_endpoint=AZURE_OPENAI_CONFIG.endpoint,
     api_version=AZURE_OPENAI_CONFIG.api_version,
     api_key=AZURE_OPENAI_CONFIG.api_key,
-    model=AZURE_OPENAI_CONFIG.deployment_name
+    model=AZURE_OPENAI_CONFIG.deployment_name,
+    # Report token usage on streamed responses too, for the per-turn trace.
+    stream_usage=True,
 )
@@ -0,0 +1,240 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import aiosqlite
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from configs.config import CheckpointConfig, CHECKPOINT_CONFIG
+from configs.logger import LOGGER
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """
+    In-memory checkpointer that bounds memory per thread and in total.
+
+    Only the newest `max_checkpoints_per_thread` checkpoints (and the channel blobs they
+    reference) are kept for each thread. Threads are evicted in LRU order once more than
+    `max_threads` are stored, and any thread idle for longer than `ttl_seconds` is dropped.
+    """
+
+    def __init__(self, max_threads: int, ttl_seconds: int, max_checkpoints_per_thread: int):
+        super().__init__()
+        self._max_threads = max_threads
+        self._ttl_seconds = ttl_seconds
+        # The running step still reads its parent checkpoint, so never keep fewer than two.
+        self._max_checkpoints_per_thread = max(2, max_checkpoints_per_thread)
+        self._last_access: OrderedDict[str, float] = OrderedDict()
+
+    def get_tuple(self, config: RunnableConfig):
+        self._touch(config["configurable"]["thread_id"])
+        return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        self._touch(thread_id)
+        saved_config = super().put(config, checkpoint, metadata, new_versions)
+        self._prune(thread_id, config["configurable"]["checkpoint_ns"])
+        return saved_config
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        self._touch(config["configurable"]["thread_id"])
+        return super().put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._last_access.pop(thread_id, None)
+        super().delete_thread(thread_id)
+
+    async def compact(self):
+        self._evict_expired()
+
+    async def usage_by_thread(self) -> Dict[str, int]:
+        usage: Dict[str, int] = {}
+        for thread_id, namespaces in self.storage.items():
+            usage[thread_id] = sum(
+                len(checkpoint[1]) + len(metadata[1])
+                for checkpoints in namespaces.values()
+                for checkpoint, metadata, _ in checkpoints.values()
+            )
+        for (thread_id, *_), writes in self.writes.items():
+            usage[thread_id] = usage.get(thread_id, 0) + sum(len(value[1]) for _, _, value, _ in writes.values())
+        for (thread_id, *_), value in self.blobs.items():
+            usage[thread_id] = usage.get(thread_id, 0) + len(value[1])
+        return usage
+
+    def _touch(self, thread_id: str):
+        self._last_access[thread_id] = time.monotonic()
+        self._last_access.move_to_end(thread_id)
+        self._evict_expired()
+        while len(self._last_access) > self._max_threads:
+            evicted, _ = self._last_access.popitem(last=False)
+            super().delete_thread(evicted)
+
+    def _evict_expired(self):
+        deadline = time.monotonic() - self._ttl_seconds
+        while self._last_access:
+            thread_id, last_access = next(iter(self._last_access.items()))
+            if last_access >= deadline:
+                break
+            self._last_access.popitem(last=False)
+            super().delete_thread(thread_id)
+
+    def _prune(self, thread_id: str, checkpoint_ns: str):
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if len(checkpoints) <= self._max_checkpoints_per_thread:
+            return
+
+        stale_ids = sorted(checkpoints)[:-self._max_checkpoints_per_thread]
+        for checkpoint_id in stale_ids:
+            del checkpoints[checkpoint_id]
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+
+        referenced = set()
+        for checkpoint, _, _ in checkpoints.values():
+            referenced.update(self.serde.loads_typed(checkpoint)["channel_versions"].items())
+        for key in [
+            key for key in self.blobs
+            if key[0] == thread_id and key[1] == checkpoint_ns and (key[2], key[3]) not in referenced
+        ]:
+            del self.blobs[key]
+
+
+class CompactingSqliteSaver(AsyncSqliteSaver):
+    """
+    SQLite checkpointer that periodically drops superseded checkpoints.
+
+    The latest `max_checkpoints_per_thread` checkpoints of every thread are kept, writes of
+    deleted checkpoints are removed and the database file is vacuumed.
+    """
+
+    def __init__(self, conn: aiosqlite.Connection, max_checkpoints_per_thread: int):
+        super().__init__(conn)
+        self._max_checkpoints_per_thread = max(2, max_checkpoints_per_thread)
+
+    async def compact(self):
+        await self.setup()
+        async with self.lock:
+            await self.conn.execute(
+                """
+                DELETE FROM checkpoints WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, ROW_NUMBER() OVER (
+                            PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+                        ) AS position
+                        FROM checkpoints
+                    ) WHERE position > ?
+                )
+                """,
+                (self._max_checkpoints_per_thread,),
+            )
+            await self.conn.execute(
+                """
+                DELETE FROM writes WHERE NOT EXISTS (
+                    SELECT 1 FROM checkpoints
+                    WHERE checkpoints.thread_id = writes.thread_id
+                    AND checkpoints.checkpoint_ns = writes.checkpoint_ns
+                    AND checkpoints.checkpoint_id = writes.checkpoint_id
+                )
+                """
+            )
+            await self.conn.commit()
+            await self.conn.execute("VACUUM")
+
+    async def usage_by_thread(self) -> Dict[str, int]:
+        await self.setup()
+        usage: Dict[str, int] = {}
+        async with self.lock:
+            async with self.conn.execute(
+                    "SELECT thread_id, SUM(LENGTH(checkpoint) + LENGTH(metadata)) FROM checkpoints GROUP BY thread_id"
+            ) as cursor:
+                async for thread_id, size in cursor:
+                    usage[thread_id] = size or 0
+            async with self.conn.execute(
+                    "SELECT thread_id, SUM(LENGTH(value)) FROM writes GROUP BY thread_id"
+            ) as cursor:
+                async for thread_id, size in cursor:
+                    usage[thread_id] = usage.get(thread_id, 0) + (size or 0)
+        return usage
+
+
+class CheckpointStore:
+    """
+    Owns the conversation checkpointer selected by CheckpointConfig for the app lifetime.
+
+    The SQLite saver binds to the running event loop, so the backend is created in `open`
+    (called from the application lifespan) rather than at import time.
+    """
+
+    def __init__(self, config: CheckpointConfig):
+        self._config = config
+        self._saver: Optional[BaseCheckpointSaver] = None
+        self._compaction_task: Optional[asyncio.Task] = None
+
+    @property
+    def saver(self) -> BaseCheckpointSaver:
+        if self._saver is None:
+            if self._config.backend != "memory":
+                raise RuntimeError(f"Checkpoint backend '{self._config.backend}' is not open")
+            self._saver = self._create_memory_saver()
+        return self._saver
+
+    async def open(self):
+        if self._saver is not None:
+            return
+        if self._config.backend == "memory":
+            self._saver = self._create_memory_saver()
+        elif self._config.backend == "sqlite":
+            saver = CompactingSqliteSaver(
+                aiosqlite.connect(self._config.sqlite_path),
+                self._config.max_checkpoints_per_thread,
+            )
+            await saver.setup()
+            self._saver = saver
+        else:
+            raise ValueError(f"Unknown checkpoint backend: {self._config.backend}")
+
+        if self._config.compaction_interval > 0:
+            self._compaction_task = asyncio.create_task(self._compaction_loop())
+
+    async def close(self):
+        if self._compaction_task is not None:
+            self._compaction_task.cancel()
+            try:
+                await self._compaction_task
+            except asyncio.CancelledError:
+                pass
+            self._compaction_task = None
+        if isinstance(self._saver, CompactingSqliteSaver):
+            await self._saver.conn.close()
+            self._saver = None
+
+    async def usage(self) -> dict:
+        usage = await self.saver.usage_by_thread()
+        return {
+            "backend": self._config.backend,
+            "threads": len(usage),
+            "total_bytes": sum(usage.values()),
+            "sessions": dict(sorted(usage.items(), key=lambda item: item[1], reverse=True)[:100]),
+        }
+
+    def _create_memory_saver(self) -> BoundedMemorySaver:
+        return BoundedMemorySaver(
+            max_threads=self._config.max_threads,
+            ttl_seconds=self._config.ttl_seconds,
+            max_checkpoints_per_thread=self._config.max_checkpoints_per_thread,
+        )
+
+    async def _compaction_loop(self):
+        while True:
+            await asyncio.sleep(self._config.compaction_interval)
+            try:
+                await self._saver.compact()
+            except Exception as e:
+                LOGGER.warning(f"Checkpoint compaction failed: {e}")
+
+
+CHECKPOINT_STORE = CheckpointStore(CHECKPOINT_CONFIG)
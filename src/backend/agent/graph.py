@@ -1,34 +1,92 @@
 from typing import Annotated
 from typing import List
 
+from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.tools import BaseTool
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langchain_mcp_adapters.sessions import StreamableHttpConnection
 from langchain_mcp_adapters.tools import load_mcp_tools
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import StateGraph, END, START
 from langgraph.graph.message import AnyMessage, add_messages
+from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import tools_condition, ToolNode
-from typing_extensions import TypedDict
+from typing_extensions import NotRequired, TypedDict
 
 from agent.agent_config import AGENT_LLM
+from agent.checkpointers import CHECKPOINT_STORE
+from agent.history import compact_tool_messages, remove_messages, render_transcript, split_for_budget
+from agent.mcp_session_pool import MCPSessionPool
+from configs.config import HISTORY_CONFIG, MCP_CONFIG
+from configs.logger import LOGGER
 from prompts.chat_system_prompt import CHAT_SYSTEM_PROMPT
+from prompts.history_summary_prompt import HISTORY_SUMMARY_PROMPT
+from services.metrics import track_dependency
 
-GRAPH_MEMORY = MemorySaver()
+MCP_CONNECTIONS = {
+    "shopify": StreamableHttpConnection(url="http://localhost:8001/mcp", transport="streamable_http"),
+}
 
-MCP_SERVER_CLIENT = MultiServerMCPClient(
-    {
-        "shopify": StreamableHttpConnection(url="http://localhost:8001/mcp", transport="streamable_http"),
-    }
+MCP_SESSION_POOL = MCPSessionPool(
+    "shopify",
+    MCP_CONNECTIONS["shopify"],
+    size=MCP_CONFIG.pool_size,
+    acquire_timeout=MCP_CONFIG.pool_acquire_timeout,
+    health_check_interval=MCP_CONFIG.pool_health_check_interval,
 )
 
+MCP_SERVER_CLIENT = MultiServerMCPClient(MCP_CONNECTIONS, tool_interceptors=[MCP_SESSION_POOL])
 
-async def create_graph(*sessions):
-    tools = []
-    for session in sessions:
-        tool_set = await load_mcp_tools(session)
-        tools.extend(tool_set)
 
+class State(TypedDict):
+    messages: Annotated[List[AnyMessage], add_messages]
+    summary: NotRequired[str]
+
+
+async def history_node(state: State) -> dict:
+    """
+    Keep the prompt within HISTORY_CONFIG's token budget before every LLM call.
+
+    Bulky tool payloads are replaced in place, and turns that no longer fit are folded into
+    the running summary and removed from the checkpointed history.
+    """
+    replacements = compact_tool_messages(state["messages"], HISTORY_CONFIG)
+    replaced = {message.id: message for message in replacements}
+    messages = [replaced.get(message.id, message) for message in state["messages"]]
+
+    old_messages, _ = split_for_budget(messages, HISTORY_CONFIG)
+    if not old_messages:
+        return {"messages": replacements}
+
+    summary = state.get("summary", "")
+    if HISTORY_CONFIG.summarize:
+        try:
+            async with track_dependency("llm", "summarize"):
+                response = await AGENT_LLM.ainvoke(HISTORY_SUMMARY_PROMPT.format(
+                    summary=summary or "(none)",
+                    messages=render_transcript(old_messages, HISTORY_CONFIG.tool_payload_max_chars),
+                ))
+            summary = response.content
+        except Exception as e:
+            LOGGER.warning(f"History summarization failed, dropping old turns without summary: {e}")
+
+    removed_ids = {message.id for message in old_messages}
+    return {
+        "messages": [m for m in replacements if m.id not in removed_ids] + remove_messages(old_messages),
+        "summary": summary,
+    }
+
+
+def build_graph(tools: List[BaseTool]) -> CompiledStateGraph:
+    """
+    Compile the chat agent graph for an already loaded set of tools.
+
+    Args:
+        tools (List[BaseTool]): Tools the chat node may call.
+
+    Returns:
+        CompiledStateGraph: Compiled agent graph backed by the configured checkpointer.
+    """
     llm_with_tool = AGENT_LLM.bind_tools(tools)
 
     prompt_template = ChatPromptTemplate.from_messages([
@@ -37,28 +95,40 @@ async def create_graph(*sessions):
     ])
     chat_llm = prompt_template | llm_with_tool
 
-    class State(TypedDict):
-        messages: Annotated[List[AnyMessage], add_messages]
-
     async def chat_node(state: State) -> State:
-        state["messages"] = await chat_llm.ainvoke({"messages": state["messages"]})
+        messages = state["messages"]
+        if state.get("summary"):
+            messages = [SystemMessage(content=f"Summary of the earlier conversation:\n{state['summary']}"), *messages]
+        async with track_dependency("llm", "chat"):
+            state["messages"] = await chat_llm.ainvoke({"messages": messages})
         return state
 
     agent_workflow = (
         StateGraph(State)
 
+        .add_node("history_node", history_node)
         .add_node("chat_node", chat_node)
         .add_node("tool_node", ToolNode(tools=tools))
 
-        .add_edge(START, 'chat_node')
+        .add_edge(START, 'history_node')
+        .add_edge('history_node', 'chat_node')
 
         .add_conditional_edges(
             'chat_node',
             tools_condition,
             {"tools": "tool_node", "__end__": END}
         )
-        .add_edge('tool_node', 'chat_node')
+        .add_edge('tool_node', 'history_node')
     )
 
-    graph = agent_workflow.compile(checkpointer=GRAPH_MEMORY)
+    graph = agent_workflow.compile(checkpointer=CHECKPOINT_STORE.saver)
     return graph
+
+
+async def create_graph(*sessions):
+    tools = []
+    for session in sessions:
+        tool_set = await load_mcp_tools(session)
+        tools.extend(tool_set)
+
+    return build_graph(tools)
@@ -0,0 +1,91 @@
+import asyncio
+import hashlib
+import json
+from typing import List, Optional
+
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langgraph.graph.state import CompiledStateGraph
+
+from agent.graph import MCP_SERVER_CLIENT, build_graph
+from configs.config import MCP_CONFIG
+from configs.logger import LOGGER
+
+
+def _tools_signature(tools: List[BaseTool]) -> str:
+    """
+    Build a stable fingerprint of a tool list so the graph is only recompiled when it changes.
+    """
+    described = []
+    for tool in sorted(tools, key=lambda item: item.name):
+        schema = tool.args_schema if isinstance(tool.args_schema, dict) else tool.args
+        described.append({"name": tool.name, "description": tool.description, "schema": schema})
+    return hashlib.sha256(json.dumps(described, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class GraphRegistry:
+    """
+    Keeps a single compiled agent graph alive for the whole application.
+
+    The graph is compiled once from the MCP tool list and reused by every chat turn.
+    A background task periodically re-lists the MCP tools and recompiles the graph
+    only when the tool signature has changed.
+    """
+
+    def __init__(self, client: MultiServerMCPClient, refresh_interval: int):
+        self._client = client
+        self._refresh_interval = refresh_interval
+        self._graph: Optional[CompiledStateGraph] = None
+        self._signature: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def get_graph(self) -> CompiledStateGraph:
+        if self._graph is None:
+            await self.refresh()
+        return self._graph
+
+    async def refresh(self) -> bool:
+        """
+        Re-list MCP tools and recompile the graph if the tool list changed.
+
+        Returns:
+            bool: True when a new graph was compiled.
+        """
+        async with self._lock:
+            tools = await self._client.get_tools()
+            signature = _tools_signature(tools)
+            if self._graph is not None and signature == self._signature:
+                return False
+            self._graph = build_graph(tools)
+            self._signature = signature
+            LOGGER.info(f"Agent graph compiled with {len(tools)} MCP tools")
+            return True
+
+    async def start(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            LOGGER.warning(f"Initial agent graph compilation failed, will retry on demand: {e}")
+        if self._refresh_interval > 0:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                LOGGER.warning(f"Agent graph refresh failed: {e}")
+
+
+GRAPH_REGISTRY = GraphRegistry(MCP_SERVER_CLIENT, MCP_CONFIG.tools_refresh_interval)
@@ -0,0 +1,71 @@
+import json
+from typing import List, Optional, Tuple
+
+from langchain_core.messages import AnyMessage, HumanMessage, RemoveMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from configs.config import HistoryConfig
+
+TRUNCATION_MARKER = " characters of tool output>"
+
+
+def _compact_tool_content(content, max_chars: int) -> Optional[str]:
+    """
+    Return a truncated replacement for a bulky tool payload, or None if it is small enough
+    or was already truncated on an earlier pass.
+    """
+    if not isinstance(content, str):
+        content = json.dumps(content, default=str)
+    if len(content) <= max_chars or content.endswith(TRUNCATION_MARKER):
+        return None
+    return f"{content[:max_chars]}... <truncated {len(content) - max_chars}{TRUNCATION_MARKER}"
+
+
+def compact_tool_messages(messages: List[AnyMessage], config: HistoryConfig) -> List[ToolMessage]:
+    """
+    Build replacement ToolMessages (same ids) for bulky tool outputs.
+
+    Outputs are only truncated once they belong to a previous turn, so the model still sees
+    the full result of the tools it just called. Images never reach the history (tools return
+    an image_id reference), so there is nothing image-specific to strip here.
+    """
+    last_human = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=0)
+    replacements = []
+    for message in messages[:last_human]:
+        if not isinstance(message, ToolMessage):
+            continue
+        compacted = _compact_tool_content(message.content, config.tool_payload_max_chars)
+        if compacted is not None:
+            replacements.append(message.model_copy(update={"content": compacted}))
+    return replacements
+
+
+def split_for_budget(messages: List[AnyMessage], config: HistoryConfig) -> Tuple[List[AnyMessage], List[AnyMessage]]:
+    """
+    Split history into (old, kept) so that `kept` fits the token budget.
+
+    Cuts only happen right before a HumanMessage, so an AI tool call is never separated from
+    its ToolMessages, and the current turn is always kept whole.
+    """
+    if count_tokens_approximately(messages) <= config.max_tokens:
+        return [], messages
+
+    boundaries = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage) and i > 0]
+    if not boundaries:
+        return [], messages
+    for boundary in boundaries:
+        if count_tokens_approximately(messages[boundary:]) <= config.target_tokens:
+            return messages[:boundary], messages[boundary:]
+    return messages[:boundaries[-1]], messages[boundaries[-1]:]
+
+
+def render_transcript(messages: List[AnyMessage], max_chars_per_message: int) -> str:
+    lines = []
+    for message in messages:
+        content = message.content if isinstance(message.content, str) else json.dumps(message.content, default=str)
+        lines.append(f"{message.type}: {content[:max_chars_per_message]}")
+    return "\n".join(lines)
+
+
+def remove_messages(messages: List[AnyMessage]) -> List[RemoveMessage]:
+    return [RemoveMessage(id=message.id) for message in messages if message.id]
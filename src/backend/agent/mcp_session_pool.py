@@ -0,0 +1,183 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Set
+
+from langchain_mcp_adapters.interceptors import MCPToolCallRequest, MCPToolCallResult
+from langchain_mcp_adapters.sessions import Connection, create_session
+from mcp import ClientSession
+
+from configs.logger import LOGGER
+from services.metrics import track_dependency
+
+
+class _PooledSession:
+    """
+    A warm MCP session kept open by its own task.
+
+    The MCP transports are anyio context managers, so a session must be entered and
+    exited in the same task. Each pooled session therefore lives inside a holder task
+    that keeps the context open until `closed` is set.
+    """
+
+    def __init__(self):
+        self.session: Optional[ClientSession] = None
+        self.task: Optional[asyncio.Task] = None
+        self.closed = asyncio.Event()
+        self.uses = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def alive(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+
+class MCPSessionPool:
+    """
+    Pool of initialized MCP client sessions shared by all chat connections.
+
+    Sessions are opened once and handed out per tool call, so a chat turn no longer pays
+    for the streamable-HTTP handshake. Idle sessions are pinged before reuse and any
+    session that fails during use is discarded and replaced lazily.
+
+    The pool is also a langchain-mcp-adapters tool interceptor: registering it on
+    MultiServerMCPClient routes every tool call for `server_name` through a pooled session.
+    """
+
+    def __init__(
+            self,
+            server_name: str,
+            connection: Connection,
+            size: int,
+            acquire_timeout: float,
+            health_check_interval: float,
+    ):
+        self.server_name = server_name
+        self._connection = connection
+        self._size = size
+        self._acquire_timeout = acquire_timeout
+        self._health_check_interval = health_check_interval
+        self._idle: asyncio.Queue[_PooledSession] = asyncio.Queue()
+        self._sessions: Set[_PooledSession] = set()
+        self._opening = 0
+
+        self._acquired = 0
+        self._reused = 0
+        self._created = 0
+        self._discarded = 0
+        self._acquire_time_total = 0.0
+        self._acquire_time_max = 0.0
+
+    async def start(self):
+        results = await asyncio.gather(*(self._open() for _ in range(self._size)), return_exceptions=True)
+        for result in results:
+            if isinstance(result, _PooledSession):
+                self._idle.put_nowait(result)
+            else:
+                LOGGER.warning(f"Could not warm MCP session for '{self.server_name}': {result}")
+
+    async def stop(self):
+        sessions = list(self._sessions)
+        for pooled in sessions:
+            pooled.closed.set()
+        await asyncio.gather(*(pooled.task for pooled in sessions if pooled.task), return_exceptions=True)
+        self._sessions.clear()
+        self._idle = asyncio.Queue()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[ClientSession]:
+        started = time.perf_counter()
+        pooled = await asyncio.wait_for(self._checkout(), timeout=self._acquire_timeout)
+        elapsed = time.perf_counter() - started
+        self._acquired += 1
+        self._acquire_time_total += elapsed
+        self._acquire_time_max = max(self._acquire_time_max, elapsed)
+        if pooled.uses > 0:
+            self._reused += 1
+        pooled.uses += 1
+
+        try:
+            yield pooled.session
+        except BaseException:
+            self._discard(pooled)
+            raise
+        else:
+            pooled.last_used = time.monotonic()
+            if pooled.alive:
+                self._idle.put_nowait(pooled)
+            else:
+                self._discard(pooled)
+
+    async def __call__(self, request: MCPToolCallRequest, handler) -> MCPToolCallResult:
+        if request.server_name != self.server_name:
+            return await handler(request)
+        async with track_dependency("mcp", request.name), self.acquire() as session:
+            return await session.call_tool(request.name, request.args)
+
+    def metrics(self) -> dict:
+        return {
+            "server_name": self.server_name,
+            "size": self._size,
+            "open": len(self._sessions),
+            "idle": self._idle.qsize(),
+            "acquired": self._acquired,
+            "reused": self._reused,
+            "reuse_rate": self._reused / self._acquired if self._acquired else 0.0,
+            "created": self._created,
+            "discarded": self._discarded,
+            "acquire_latency_avg_ms": 1000 * self._acquire_time_total / self._acquired if self._acquired else 0.0,
+            "acquire_latency_max_ms": 1000 * self._acquire_time_max,
+        }
+
+    async def _checkout(self) -> _PooledSession:
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                if len(self._sessions) + self._opening < self._size:
+                    return await self._open()
+                pooled = await self._idle.get()
+
+            if not pooled.alive:
+                self._discard(pooled)
+                continue
+            if time.monotonic() - pooled.last_used > self._health_check_interval:
+                try:
+                    await pooled.session.send_ping()
+                except Exception as e:
+                    LOGGER.warning(f"MCP session for '{self.server_name}' failed health check: {e}")
+                    self._discard(pooled)
+                    continue
+            return pooled
+
+    async def _open(self) -> _PooledSession:
+        pooled = _PooledSession()
+        ready = asyncio.get_running_loop().create_future()
+        self._opening += 1
+        try:
+            pooled.task = asyncio.create_task(self._hold(pooled, ready))
+            await ready
+        finally:
+            self._opening -= 1
+        self._sessions.add(pooled)
+        self._created += 1
+        return pooled
+
+    async def _hold(self, pooled: _PooledSession, ready: asyncio.Future):
+        try:
+            async with create_session(self._connection) as session:
+                await session.initialize()
+                pooled.session = session
+                ready.set_result(None)
+                await pooled.closed.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                LOGGER.warning(f"MCP session for '{self.server_name}' closed unexpectedly: {e}")
+
+    def _discard(self, pooled: _PooledSession):
+        if pooled in self._sessions:
+            self._sessions.discard(pooled)
+            self._discarded += 1
+        pooled.closed.set()
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import ToolMessage
+from langchain_core.outputs import LLMResult
+
+from configs.config import TraceConfig, TRACE_CONFIG
+from configs.logger import LOGGER
+
+GRAPH_NODES = ("history_node", "chat_node", "tool_node")
+
+
+def _size(value: Any) -> int:
+    if isinstance(value, ToolMessage):
+        value = value.content
+    return len(value) if isinstance(value, str) else len(json.dumps(value, default=str))
+
+
+class TurnTracer(AsyncCallbackHandler):
+    """
+    Callback handler that records one agent turn: graph node spans, LLM calls (latency,
+    time to first token, token usage) and tool calls (argument/result size, latency).
+
+    Pass it in the `callbacks` of the graph run config; `finish()` returns the trace.
+    """
+
+    def __init__(self, session_id: Optional[str], request_id: Optional[str]):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.session_id = session_id
+        self.request_id = request_id
+        self._started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self._open: Dict[UUID, dict] = {}
+        self.spans: List[dict] = []
+        self.llm_calls: List[dict] = []
+        self.tool_calls: List[dict] = []
+
+    def _elapsed_ms(self, since: Optional[float] = None) -> float:
+        return round(1000 * (time.perf_counter() - (self._started if since is None else since)), 1)
+
+    def _begin(self, run_id: UUID, record: dict, into: List[dict]):
+        record["start_ms"] = self._elapsed_ms()
+        into.append(record)
+        self._open[run_id] = {"record": record, "started": time.perf_counter()}
+
+    def _end(self, run_id: UUID, status: str) -> Optional[dict]:
+        entry = self._open.pop(run_id, None)
+        if entry is None:
+            return None
+        record = entry["record"]
+        record["duration_ms"] = self._elapsed_ms(entry["started"])
+        record["status"] = status
+        return record
+
+    async def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        # Runnables inside a node inherit its metadata; only the node run itself is a span.
+        if node in GRAPH_NODES and kwargs.get("name") == node:
+            self._begin(run_id, {"node": node}, self.spans)
+
+    async def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id, "ok")
+
+    async def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, "error")
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._begin(run_id, {
+            "node": (metadata or {}).get("langgraph_node"),
+            "model": (metadata or {}).get("ls_model_name"),
+            "input_messages": sum(len(batch) for batch in messages),
+        }, self.llm_calls)
+
+    async def on_llm_new_token(self, token, *, run_id, **kwargs):
+        entry = self._open.get(run_id)
+        if entry is not None and "ttft_ms" not in entry["record"]:
+            entry["record"]["ttft_ms"] = self._elapsed_ms(entry["started"])
+
+    async def on_llm_end(self, response: LLMResult, *, run_id, **kwargs):
+        record = self._end(run_id, "ok")
+        if record is None:
+            return
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    record["input_tokens"] = record.get("input_tokens", 0) + usage.get("input_tokens", 0)
+                    record["output_tokens"] = record.get("output_tokens", 0) + usage.get("output_tokens", 0)
+                tool_calls = getattr(getattr(generation, "message", None), "tool_calls", None)
+                if tool_calls:
+                    record["tool_calls"] = len(tool_calls)
+
+    async def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, "error")
+
+    async def on_tool_start(self, serialized, input_str, *, run_id, inputs=None, **kwargs):
+        self._begin(run_id, {
+            "name": kwargs.get("name") or (serialized or {}).get("name"),
+            "args_chars": _size(inputs if inputs is not None else input_str),
+        }, self.tool_calls)
+
+    async def on_tool_end(self, output, *, run_id, **kwargs):
+        record = self._end(run_id, "error" if getattr(output, "status", None) == "error" else "ok")
+        if record is not None:
+            record["result_chars"] = _size(output)
+
+    async def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, "error")
+
+    def finish(self, outcome: str) -> dict:
+        for run_id in list(self._open):
+            self._end(run_id, outcome)
+        return {
+            "trace_id": self.trace_id,
+            "session_id": self.session_id,
+            "request_id": self.request_id,
+            "started_at": self._started_at.isoformat(timespec="milliseconds"),
+            "duration_ms": self._elapsed_ms(),
+            "outcome": outcome,
+            "iterations": sum(1 for span in self.spans if span["node"] == "chat_node"),
+            "llm_ms": round(sum(call.get("duration_ms", 0) for call in self.llm_calls), 1),
+            "tool_ms": round(sum(call.get("duration_ms", 0) for call in self.tool_calls), 1),
+            "input_tokens": sum(call.get("input_tokens", 0) for call in self.llm_calls),
+            "output_tokens": sum(call.get("output_tokens", 0) for call in self.llm_calls),
+            "spans": self.spans,
+            "llm_calls": self.llm_calls,
+            "tool_calls": self.tool_calls,
+        }
+
+
+class TraceSink:
+    """
+    Logs a one-line summary of every turn trace and appends the full trace to a JSONL file
+    when `jsonl_path` is set.
+    """
+
+    def __init__(self, config: TraceConfig):
+        self._config = config
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._config.enabled
+
+    @property
+    def send_to_client(self) -> bool:
+        return self._config.enabled and self._config.send_to_client
+
+    async def record(self, trace: dict):
+        LOGGER.info(
+            f"Agent turn {trace['outcome']} in {trace['duration_ms']:.0f} ms: "
+            f"{trace['iterations']} iterations, {len(trace['llm_calls'])} LLM calls "
+            f"({trace['llm_ms']:.0f} ms, {trace['input_tokens']}+{trace['output_tokens']} tokens), "
+            f"{len(trace['tool_calls'])} tool calls ({trace['tool_ms']:.0f} ms)",
+            extra={"trace": trace},
+        )
+        if self._config.jsonl_path:
+            line = json.dumps(trace, default=str)
+            async with self._lock:
+                await asyncio.to_thread(self._append, line)
+
+    def _append(self, line: str):
+        try:
+            with open(self._config.jsonl_path, "a", encoding="utf-8") as file:
+                file.write(line + "\n")
+        except OSError as e:
+            LOGGER.warning(f"Could not write agent trace to {self._config.jsonl_path}: {e}")
+
+
+TRACE_SINK = TraceSink(TRACE_CONFIG)
@@ -0,0 +1,108 @@
+"""
+Compare decode paths for n8n product payloads.
+
+Run from src/backend:
+    python -m benchmarks.shopify_parse_benchmark --products 5000 --variants 3
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable, List
+
+from schemas.shopify import ShopifySchema
+from services.shopify_service import PRODUCTS_ADAPTER, PRODUCT_RECORDS_ADAPTER
+
+
+def build_payload(products: int, variants: int) -> bytes:
+    return json.dumps([
+        {
+            "id": product_id,
+            "title": f"Product {product_id}",
+            "body_html": "<p>" + "Lorem ipsum dolor sit amet. " * 20 + "</p>",
+            "vendor": f"Vendor {product_id % 25}",
+            "product_type": "Snowboard",
+            "created_at": "2024-01-01T00:00:00-00:00",
+            "handle": f"product-{product_id}",
+            "updated_at": "2024-01-02T00:00:00-00:00",
+            "published_at": "2024-01-01T00:00:00-00:00",
+            "published_scope": "global",
+            "tags": "winter, sport, sale",
+            "status": "active",
+            "admin_graphql_api_id": f"gid://shopify/Product/{product_id}",
+            "variants": [
+                {
+                    "id": product_id * 100 + variant_id,
+                    "product_id": product_id,
+                    "title": f"Size {variant_id}",
+                    "price": "199.99",
+                    "position": variant_id,
+                    "inventory_policy": "deny",
+                    "option1": f"Size {variant_id}",
+                    "created_at": "2024-01-01T00:00:00-00:00",
+                    "updated_at": "2024-01-02T00:00:00-00:00",
+                    "taxable": True,
+                    "fulfillment_service": "manual",
+                    "grams": 1200,
+                    "inventory_management": "shopify",
+                    "requires_shipping": True,
+                    "sku": f"SKU-{product_id}-{variant_id}",
+                    "weight": 1.2,
+                    "weight_unit": "kg",
+                    "inventory_item_id": product_id * 1000 + variant_id,
+                    "inventory_quantity": variant_id * 3,
+                    "old_inventory_quantity": variant_id * 3,
+                    "admin_graphql_api_id": f"gid://shopify/ProductVariant/{product_id * 100 + variant_id}",
+                }
+                for variant_id in range(variants)
+            ],
+        }
+        for product_id in range(products)
+    ]).encode("utf-8")
+
+
+def per_object(raw: bytes) -> List[ShopifySchema]:
+    return [ShopifySchema(**product) for product in json.loads(raw)]
+
+
+def bulk_models(raw: bytes) -> list:
+    return PRODUCTS_ADAPTER.validate_json(raw)
+
+
+def bulk_records(raw: bytes) -> list:
+    return PRODUCT_RECORDS_ADAPTER.validate_json(raw)
+
+
+def measure(name: str, decode: Callable[[bytes], list], raw: bytes, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        decode(raw)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    result = decode(raw)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    print(f"{name:<28}{1000 * min(timings):>10.1f} ms{1000 * sum(timings) / repeat:>10.1f} ms{retained / 2 ** 20:>10.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--variants", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raw = build_payload(args.products, args.variants)
+    print(f"payload: {args.products} products x {args.variants} variants, {len(raw) / 2 ** 20:.1f} MiB")
+    print(f"{'path':<28}{'best':>13}{'mean':>13}{'retained':>14}")
+    measure("json.loads + ShopifySchema", per_object, raw, args.repeat)
+    measure("TypeAdapter -> models", bulk_models, raw, args.repeat)
+    measure("TypeAdapter -> records", bulk_records, raw, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,12 @@ load_dotenv()
 
 class AppConfig(BaseModel):
     log_level: str = os.getenv('APP_LOG_LEVEL', 'INFO')
+    # json | text
+    log_format: str = os.getenv('APP_LOG_FORMAT', 'json')
+    # Logged payloads (plot code, SQL) longer than this are truncated...
+    log_payload_max_chars: int = int(os.getenv('APP_LOG_PAYLOAD_MAX_CHARS', '1000'))
+    # ...except for this fraction of them, which is logged in full
+    log_payload_sample_rate: float = float(os.getenv('APP_LOG_PAYLOAD_SAMPLE_RATE', '0.01'))
 
 
 class AzureOpenAIConfig(BaseModel):
@@ -21,27 +27,157 @@ class AzureOpenAIConfig(BaseModel):
 
 class MCPConfig(BaseModel):
     url: str = os.getenv('MCP_B8N_URL')
+    tools_refresh_interval: int = int(os.getenv('MCP_TOOLS_REFRESH_INTERVAL', '300'))
+    pool_size: int = int(os.getenv('MCP_POOL_SIZE', '4'))
+    pool_acquire_timeout: float = float(os.getenv('MCP_POOL_ACQUIRE_TIMEOUT', '10'))
+    pool_health_check_interval: float = float(os.getenv('MCP_POOL_HEALTH_CHECK_INTERVAL', '30'))
+
+
+class ChatConfig(BaseModel):
+    max_pending_requests: int = int(os.getenv('CHAT_MAX_PENDING_REQUESTS', '8'))
+    max_concurrent_turns: int = int(os.getenv('CHAT_MAX_CONCURRENT_TURNS', '2'))
+    # url: send a link to the image | binary: send the image bytes as a binary frame
+    image_delivery: str = os.getenv('CHAT_IMAGE_DELIVERY', 'url')
+    # Absolute base URL under which browsers can reach the MCP server's /images route,
+    # required in url mode (checked at startup)
+    image_public_url: str = os.getenv('CHAT_IMAGE_PUBLIC_URL', os.getenv('MCP_B8N_URL', ''))
+
+
+class CheckpointConfig(BaseModel):
+    backend: str = os.getenv('CHECKPOINT_BACKEND', 'memory')
+    max_threads: int = int(os.getenv('CHECKPOINT_MAX_THREADS', '1000'))
+    ttl_seconds: int = int(os.getenv('CHECKPOINT_TTL_SECONDS', '86400'))
+    max_checkpoints_per_thread: int = int(os.getenv('CHECKPOINT_MAX_PER_THREAD', '5'))
+    sqlite_path: str = os.getenv('CHECKPOINT_SQLITE_PATH', 'checkpoints.sqlite')
+    compaction_interval: int = int(os.getenv('CHECKPOINT_COMPACTION_INTERVAL', '600'))
+
+
+class HistoryConfig(BaseModel):
+    max_tokens: int = int(os.getenv('HISTORY_MAX_TOKENS', '8000'))
+    target_tokens: int = int(os.getenv('HISTORY_TARGET_TOKENS', '4000'))
+    tool_payload_max_chars: int = int(os.getenv('HISTORY_TOOL_PAYLOAD_MAX_CHARS', '2000'))
+    summarize: bool = os.getenv('HISTORY_SUMMARIZE', 'true').lower() == 'true'
 
 
 class N8NConfig(BaseModel):
     url: List[str] = ast.literal_eval(os.getenv('N8N_URL', '[]'))
 
 
+class CatalogConfig(BaseModel):
+    ttl: float = float(os.getenv('CATALOG_TTL_SECONDS', '300'))
+    stale_ttl: float = float(os.getenv('CATALOG_STALE_TTL_SECONDS', '900'))
+    # models | records (slotted dataclasses, smaller and faster to build)
+    storage: str = os.getenv('CATALOG_STORAGE', 'models')
+
+
+class HttpClientConfig(BaseModel):
+    pool_limit: int = int(os.getenv('HTTP_POOL_LIMIT', '100'))
+    pool_limit_per_host: int = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '10'))
+    keepalive_timeout: float = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '30'))
+    dns_cache_ttl: int = int(os.getenv('HTTP_DNS_CACHE_TTL', '300'))
+    connect_timeout: float = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+    total_timeout: float = float(os.getenv('HTTP_TOTAL_TIMEOUT', '60'))
+    max_retries: int = int(os.getenv('HTTP_MAX_RETRIES', '3'))
+    retry_backoff: float = float(os.getenv('HTTP_RETRY_BACKOFF', '0.5'))
+
+
 class AzureCosmosDBConfig(BaseModel):
     uri: str = os.getenv('AZURE_COSMOS_DB_URI')
     key: str = os.getenv('AZURE_COSMOS_DB_KEY')
     database_name: str = os.getenv('AZURE_COSMOS_DB_DATABASE_NAME')
     supplier_container_name: str = os.getenv('AZURE_COSMOS_SUPPLIER_CONTAINER_NAME')
     orders_container_name: str = os.getenv('AZURE_COSMOS_SUPPLIER_ORDERS_NAME')
+    # Set to false for the local emulator's self-signed certificate
+    verify_ssl: bool = os.getenv('AZURE_COSMOS_DB_VERIFY_SSL', 'true').lower() == 'true'
+
+
+class SupplierSyncConfig(BaseModel):
+    sync_interval: float = float(os.getenv('SUPPLIER_SYNC_INTERVAL_SECONDS', '30'))
+    full_resync_interval: float = float(os.getenv('SUPPLIER_FULL_RESYNC_INTERVAL_SECONDS', '86400'))
+    snapshot_path: str = os.getenv('SUPPLIER_SNAPSHOT_PATH', 'suppliers_snapshot.json')
 
 
 class PostgreSQLConfig(BaseModel):
     jdbc_url: str = os.getenv('POSTGRES_JDBC')
+    pool_min_size: int = int(os.getenv('POSTGRES_POOL_MIN_SIZE', '1'))
+    pool_max_size: int = int(os.getenv('POSTGRES_POOL_MAX_SIZE', '10'))
+    pool_max_inactive_lifetime: float = float(os.getenv('POSTGRES_POOL_MAX_INACTIVE_LIFETIME', '300'))
+    pool_acquire_timeout: float = float(os.getenv('POSTGRES_POOL_ACQUIRE_TIMEOUT', '10'))
+    statement_cache_size: int = int(os.getenv('POSTGRES_STATEMENT_CACHE_SIZE', '100'))
+    query_timeout: float = float(os.getenv('POSTGRES_QUERY_TIMEOUT', '30'))
+    query_default_rows: int = int(os.getenv('POSTGRES_QUERY_DEFAULT_ROWS', '200'))
+    query_max_rows: int = int(os.getenv('POSTGRES_QUERY_MAX_ROWS', '1000'))
+    cursor_prefetch: int = int(os.getenv('POSTGRES_CURSOR_PREFETCH', '500'))
+    handle_max_rows: int = int(os.getenv('POSTGRES_HANDLE_MAX_ROWS', '50000'))
+    # Only for /orders/export; stream mode of /orders/query (an MCP tool) uses the query limits
+    stream_max_rows: int = int(os.getenv('POSTGRES_STREAM_MAX_ROWS', '100000'))
+
+
+class QueryCacheConfig(BaseModel):
+    enabled: bool = os.getenv('ORDERS_QUERY_CACHE_ENABLED', 'true').lower() == 'true'
+    ttl: float = float(os.getenv('ORDERS_QUERY_CACHE_TTL_SECONDS', '300'))
+    max_entries: int = int(os.getenv('ORDERS_QUERY_CACHE_MAX_ENTRIES', '256'))
+
+
+class ResultStoreConfig(BaseModel):
+    ttl: float = float(os.getenv('ORDERS_RESULT_STORE_TTL_SECONDS', '1800'))
+    max_entries: int = int(os.getenv('ORDERS_RESULT_STORE_MAX_ENTRIES', '64'))
+    max_total_rows: int = int(os.getenv('ORDERS_RESULT_STORE_MAX_TOTAL_ROWS', '200000'))
+
+
+class InventoryConfig(BaseModel):
+    sales_window_days: int = int(os.getenv('INVENTORY_SALES_WINDOW_DAYS', '30'))
+    sales_ttl: float = float(os.getenv('INVENTORY_SALES_TTL_SECONDS', '300'))
+
+
+class RenderConfig(BaseModel):
+    workers: int = int(os.getenv('RENDER_WORKERS', '2'))
+    timeout: float = float(os.getenv('RENDER_TIMEOUT_SECONDS', '30'))
+    memory_limit_mb: int = int(os.getenv('RENDER_MEMORY_LIMIT_MB', '1024'))
+    max_queue: int = int(os.getenv('RENDER_MAX_QUEUE', '16'))
+    max_jobs_per_worker: int = int(os.getenv('RENDER_MAX_JOBS_PER_WORKER', '50'))
+    startup_timeout: float = float(os.getenv('RENDER_STARTUP_TIMEOUT_SECONDS', '60'))
+    spawn_retry_backoff: float = float(os.getenv('RENDER_SPAWN_RETRY_BACKOFF_SECONDS', '1'))
+    spawn_retry_max_backoff: float = float(os.getenv('RENDER_SPAWN_RETRY_MAX_BACKOFF_SECONDS', '60'))
+
+
+class RenderCacheConfig(BaseModel):
+    enabled: bool = os.getenv('RENDER_CACHE_ENABLED', 'true').lower() == 'true'
+    max_bytes: int = int(os.getenv('RENDER_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+    # Empty disables the on-disk tier
+    directory: str = os.getenv('RENDER_CACHE_DIR', '')
+    max_disk_bytes: int = int(os.getenv('RENDER_CACHE_MAX_DISK_BYTES', str(512 * 1024 * 1024)))
+
+
+class ImageStoreConfig(BaseModel):
+    ttl: float = float(os.getenv('IMAGE_STORE_TTL_SECONDS', '3600'))
+    max_bytes: int = int(os.getenv('IMAGE_STORE_MAX_BYTES', str(128 * 1024 * 1024)))
+
+
+class TraceConfig(BaseModel):
+    enabled: bool = os.getenv('AGENT_TRACE_ENABLED', 'true').lower() == 'true'
+    # Also send each turn's trace to the chat client as a 'trace' event
+    send_to_client: bool = os.getenv('AGENT_TRACE_SEND_TO_CLIENT', 'false').lower() == 'true'
+    # Append every trace as one JSON line to this file; empty disables the file sink
+    jsonl_path: str = os.getenv('AGENT_TRACE_JSONL_PATH', '')
 
 
 APP_CONFIG = AppConfig()
 AZURE_OPENAI_CONFIG = AzureOpenAIConfig()
 MCP_CONFIG = MCPConfig()
+CHAT_CONFIG = ChatConfig()
+CHECKPOINT_CONFIG = CheckpointConfig()
+HISTORY_CONFIG = HistoryConfig()
 N8N_CONFIG = N8NConfig()
+HTTP_CLIENT_CONFIG = HttpClientConfig()
+CATALOG_CONFIG = CatalogConfig()
 AZURE_COSMOS_DB_CONFIG = AzureCosmosDBConfig()
+SUPPLIER_SYNC_CONFIG = SupplierSyncConfig()
+INVENTORY_CONFIG = InventoryConfig()
+RENDER_CONFIG = RenderConfig()
+RENDER_CACHE_CONFIG = RenderCacheConfig()
+IMAGE_STORE_CONFIG = ImageStoreConfig()
+TRACE_CONFIG = TraceConfig()
 POSTGRESQL_CONFIG = PostgreSQLConfig()
+ORDERS_QUERY_CACHE_CONFIG = QueryCacheConfig()
+ORDERS_RESULT_STORE_CONFIG = ResultStoreConfig()
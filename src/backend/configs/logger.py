@@ -1,30 +1,115 @@
+import atexit
+import hashlib
+import json
 import logging
+import queue
+import random
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
 from configs.config import APP_CONFIG
 
-LOGGER_CONFIG = {
-    "version": 1,
-    "disable_existing_loggers": False,
-    "formatters": {
-        "custom": {
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s - %(message)s",
-        }
-    },
-    "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "formatter": "custom",
-            "level": APP_CONFIG.log_level
-        }
-    },
-    "loggers": {
-        "api": {
-            "handlers": ["console"],
-            "level": APP_CONFIG.log_level,
-            "propagate": True
+# Correlation ids of the HTTP request / WebSocket connection and chat session being handled.
+# Set by CorrelationIdMiddleware and the chat connection handler, added to every record.
+REQUEST_ID: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+SESSION_ID: ContextVar[Optional[str]] = ContextVar("session_id", default=None)
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s - %(message)s"
+
+
+class ContextFilter(logging.Filter):
+    """Stamp records with the correlation ids of the current task."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = REQUEST_ID.get()
+        record.session_id = SESSION_ID.get()
+        return True
+
+
+class PayloadSamplingFilter(logging.Filter):
+    """
+    Cap the `payload` extra (generated code, SQL) at `max_chars`.
+
+    A `sample_rate` fraction of oversized payloads is kept whole so full examples still
+    show up in the logs. Every payload gets its length and a short hash, so truncated
+    copies of the same payload can be matched.
+    """
+
+    def __init__(self, max_chars: int, sample_rate: float):
+        super().__init__()
+        self._max_chars = max_chars
+        self._sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        payload = getattr(record, "payload", None)
+        if payload is None:
+            return True
+        payload = str(payload)
+        record.payload_chars = len(payload)
+        record.payload_sha256 = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+        if len(payload) > self._max_chars and random.random() >= self._sample_rate:
+            payload = f"{payload[:self._max_chars]}..."
+        record.payload = payload
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    FIELDS = ("request_id", "session_id", "payload", "payload_chars", "payload_sha256", "trace")
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "func": record.funcName,
+            "message": record.getMessage(),
         }
-    }
-}
+        for field in self.FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        ids = " ".join(
+            f"{field}={value}" for field in ("request_id", "session_id")
+            if (value := getattr(record, field, None)) is not None
+        )
+        if ids:
+            line = f"{line} [{ids}]"
+        if getattr(record, "payload", None) is not None:
+            line = f"{line}\n{record.payload}"
+        return line
+
+
+def _setup() -> logging.Logger:
+    """
+    Route the `api` logger through a queue: callers (often the event loop) only render the
+    message and enqueue the record, and a listener thread formats it and writes it out.
+    """
+    console = logging.StreamHandler()
+    console.setLevel(APP_CONFIG.log_level)
+    console.setFormatter(JsonFormatter() if APP_CONFIG.log_format == "json" else TextFormatter(TEXT_FORMAT))
+
+    records = queue.SimpleQueue()
+    handler = QueueHandler(records)
+    # Filters run in the calling task, where the correlation ids are set.
+    handler.addFilter(ContextFilter())
+    handler.addFilter(PayloadSamplingFilter(APP_CONFIG.log_payload_max_chars, APP_CONFIG.log_payload_sample_rate))
+    listener = QueueListener(records, console, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger = logging.getLogger("api")
+    logger.setLevel(APP_CONFIG.log_level)
+    logger.addHandler(handler)
+    logger.propagate = False
+    return logger
+
 
-logging.config.dictConfig(LOGGER_CONFIG)
-LOGGER = logging.getLogger('api')
+LOGGER = _setup()
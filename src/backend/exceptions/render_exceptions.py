@@ -0,0 +1,14 @@
+class RenderException(Exception):
+    pass
+
+
+class RenderQueueFullException(RenderException):
+    pass
+
+
+class RenderTimeoutException(RenderException):
+    pass
+
+
+class RenderFailedException(RenderException):
+    pass
@@ -1,58 +1,174 @@
+import asyncio
 import json
-from typing import Optional
+from typing import Optional, Protocol
 
-from langchain_core.messages import AIMessage, ToolMessage
-from starlette.websockets import WebSocket
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+from pydantic import BaseModel
 
-from agent.graph import GRAPH_MEMORY, MCP_SERVER_CLIENT, create_graph
-from configs.logger import LOGGER
+from agent.graph_registry import GRAPH_REGISTRY
+from agent.tracing import TRACE_SINK, TurnTracer
+from configs.config import CHAT_CONFIG, HTTP_CLIENT_CONFIG, MCP_CONFIG
+from configs.logger import LOGGER, REQUEST_ID
 from exceptions.agent_exceptions import GeneralAgentException
-from schemas.websocket import UserRequest, BotResponse
+from schemas.websocket import UserRequest, BotResponse, ImageEvent, MessageType, TokenDelta, ToolEvent, TraceEvent
+from services.http_client import HttpClient
+
+IMAGE_HTTP_CLIENT = HttpClient(HTTP_CLIENT_CONFIG, dependency="mcp_images")
+
+
+def check_image_delivery():
+    """
+    Fail at startup on an image delivery setup the browser cannot use.
+
+    In `url` mode the browser fetches images itself, so the link must be absolute: a bare
+    /images/... path would resolve against the frontend origin.
+    """
+    if CHAT_CONFIG.image_delivery not in ("url", "binary"):
+        raise RuntimeError(f"CHAT_IMAGE_DELIVERY must be 'url' or 'binary', got {CHAT_CONFIG.image_delivery!r}")
+    if CHAT_CONFIG.image_delivery == "url" and not CHAT_CONFIG.image_public_url.startswith(("http://", "https://")):
+        raise RuntimeError("CHAT_IMAGE_PUBLIC_URL must be an absolute http(s) URL when CHAT_IMAGE_DELIVERY=url")
+
+
+class ChatSender(Protocol):
+    async def send_json(self, data) -> None:
+        ...
+
+    async def send_binary(self, header, data: bytes) -> None:
+        ...
 
 
 class AgentChatHandler:
-    def __init__(self, user_request: UserRequest, websocket: WebSocket):
+    def __init__(self, user_request: UserRequest, websocket: ChatSender):
         self.user_request = user_request
         self.websocket = websocket
 
     async def handle_request(self) -> Optional[BotResponse]:
+        """
+        Run one agent turn, streaming token deltas and tool progress to the client as they happen.
+
+        When tracing is enabled the turn's node, LLM and tool timings are recorded and, if
+        configured, sent to the client as a trace event before the final message.
+
+        Returns:
+            Optional[BotResponse]: The final bot message, sent by the caller.
+        """
         config = {
             "configurable": {
                 "thread_id": self.user_request.session_id
             },
-            "checkpoint": GRAPH_MEMORY,
         }
-        last_message = None
+        tracer = None
+        if TRACE_SINK.enabled:
+            tracer = TurnTracer(self.user_request.session_id, REQUEST_ID.get())
+            config["callbacks"] = [tracer]
+        final_message = None
+        outcome = "error"
         try:
-            async with MCP_SERVER_CLIENT.session("shopify") as shopify_session:
-                agent = await create_graph(shopify_session)
-                async for name, mode, chunk in agent.astream(
-                        {"messages": self.user_request.text},
-                        subgraphs=True,
-                        config=config,
-                        stream_mode=["custom", "values"]
-                ):
-                    if mode == "custom":
-                        pass
-                    elif mode == "values":
-                        last_message = next(iter(chunk.values()))
-                    else:
-                        LOGGER.error(f"Unexpected mode: {mode}")
-                if isinstance(last_message[-1], AIMessage):
-                    for _ in range(3):
-                        index = 0
-                        try:
-                            if isinstance(last_message[-(index + 2)], ToolMessage):
-                                res = json.loads(last_message[-2].content)
-                                if 'image' in res:
-                                    await self.websocket.send_json(res)
-                                    break
-                        except Exception:
-                            pass
-                        finally:
-                            index += 1
-                    return BotResponse(text=last_message[-1].content)
+            agent = await GRAPH_REGISTRY.get_graph()
+            async for mode, chunk in agent.astream(
+                    {"messages": self.user_request.text},
+                    config=config,
+                    stream_mode=["messages", "updates"]
+            ):
+                if mode == "messages":
+                    message, metadata = chunk
+                    if (
+                            metadata.get("langgraph_node") == "chat_node"
+                            and isinstance(message, AIMessageChunk)
+                            and isinstance(message.content, str)
+                            and message.content
+                    ):
+                        await self._send(TokenDelta(session_id=self.user_request.session_id, text=message.content))
+                elif mode == "updates":
+                    for node_name, update in chunk.items():
+                        if node_name not in ("chat_node", "tool_node"):
+                            continue
+                        for message in self._update_messages(update):
+                            if isinstance(message, AIMessage):
+                                final_message = message
+                                await self._on_ai_message(message)
+                            elif isinstance(message, ToolMessage):
+                                await self._on_tool_message(message)
+                else:
+                    LOGGER.error(f"Unexpected mode: {mode}")
+            outcome = "ok"
+            if final_message is not None:
+                return BotResponse(session_id=self.user_request.session_id, text=final_message.content)
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
         except Exception as ex:
 
             LOGGER.error(f"Error in AgentChatHandler: {ex}")
             raise GeneralAgentException(ex)
+        finally:
+            if tracer is not None:
+                await self._finish_trace(tracer, outcome)
+
+    async def _finish_trace(self, tracer: TurnTracer, outcome: str):
+        trace = tracer.finish(outcome)
+        # Shielded so a cancelled turn still gets its trace written.
+        await asyncio.shield(TRACE_SINK.record(trace))
+        if TRACE_SINK.send_to_client and outcome != "cancelled":
+            try:
+                await self._send(TraceEvent(session_id=self.user_request.session_id, trace=trace))
+            except Exception as e:
+                LOGGER.debug(f"Could not send trace: {e}")
+
+    async def _on_ai_message(self, message: AIMessage):
+        for tool_call in message.tool_calls:
+            await self._send(ToolEvent(
+                type=MessageType.TOOL_START,
+                session_id=self.user_request.session_id,
+                name=tool_call["name"],
+                tool_call_id=tool_call.get("id"),
+            ))
+
+    async def _on_tool_message(self, message: ToolMessage):
+        await self._send(ToolEvent(
+            type=MessageType.TOOL_END,
+            session_id=self.user_request.session_id,
+            name=message.name or "",
+            tool_call_id=message.tool_call_id,
+            status=message.status,
+        ))
+        try:
+            res = json.loads(message.content)
+        except (TypeError, ValueError):
+            return
+        if isinstance(res, dict) and 'image_id' in res:
+            await self._send_image(res)
+
+    async def _send_image(self, reference: dict):
+        # The tool result only carries a reference to the image stored by the MCP server.
+        event = ImageEvent(
+            session_id=self.user_request.session_id,
+            image_id=reference["image_id"],
+            mime_type=reference.get("mime_type", "image/png"),
+            size=reference.get("size", 0),
+        )
+        if CHAT_CONFIG.image_delivery == "binary":
+            try:
+                data = await IMAGE_HTTP_CLIENT.get_bytes(
+                    f"{MCP_CONFIG.url}{reference['url']}",
+                    stats_key=f"{MCP_CONFIG.url}/images/{{image_id}}",
+                )
+            except Exception as e:
+                LOGGER.error(f"Could not fetch image {event.image_id}: {e}")
+                return
+            event.size = len(data)
+            event.binary = True
+            await self.websocket.send_binary(event.model_dump(mode="json", by_alias=True), data)
+        else:
+            event.url = f"{CHAT_CONFIG.image_public_url}{reference['url']}"
+            await self._send(event)
+
+    async def _send(self, event: BaseModel):
+        await self.websocket.send_json(event.model_dump(mode="json", by_alias=True))
+
+    @staticmethod
+    def _update_messages(update) -> list:
+        if not isinstance(update, dict):
+            return []
+        messages = update.get("messages", [])
+        return messages if isinstance(messages, list) else [messages]
@@ -0,0 +1,147 @@
+import asyncio
+import json
+from typing import Dict, Optional
+
+from pydantic import BaseModel, ValidationError
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from configs.logger import LOGGER, SESSION_ID
+from handlers.agent_chat_handler import AgentChatHandler
+from schemas.websocket import ClientMessageType, ControlMessage, MessageType, StatusEvent, UserRequest
+
+
+class ChatConnectionHandler:
+    """
+    Schedules agent turns for a single chat WebSocket.
+
+    Frames are read continuously, so pings and cancel messages are handled while a turn is
+    running. Each session gets its own FIFO of turns (a thread's checkpoints must be written
+    in order), turns from different sessions run concurrently up to `max_concurrent_turns`,
+    and at most `max_pending` turns may be queued or running before new ones are rejected.
+    A malformed frame is answered with an error event; only a disconnect ends the connection.
+    """
+
+    def __init__(self, websocket: WebSocket, max_pending: int, max_concurrent_turns: int):
+        self.websocket = websocket
+        self._max_pending = max_pending
+        self._turn_slots = asyncio.Semaphore(max_concurrent_turns)
+        self._send_lock = asyncio.Lock()
+        self._pending = 0
+        self._queues: Dict[Optional[str], asyncio.Queue] = {}
+        self._workers: Dict[Optional[str], asyncio.Task] = {}
+        self._running: Dict[Optional[str], asyncio.Task] = {}
+
+    async def run(self):
+        try:
+            while True:
+                message = await self.websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                await self._dispatch(message.get("text"))
+        except WebSocketDisconnect:
+            LOGGER.debug("WebSocket disconnected")
+        finally:
+            await self._shutdown()
+
+    async def send_json(self, data):
+        async with self._send_lock:
+            await self.websocket.send_json(data)
+
+    async def send_binary(self, header, data: bytes):
+        """Send a JSON header and the binary frame it describes with nothing in between."""
+        async with self._send_lock:
+            await self.websocket.send_json(header)
+            await self.websocket.send_bytes(data)
+
+    async def _dispatch(self, frame: Optional[str]):
+        try:
+            data = json.loads(frame) if frame is not None else None
+        except ValueError as e:
+            await self._send(StatusEvent(type=MessageType.ERROR, detail=f"Invalid message: {e}"))
+            return
+        if not isinstance(data, dict):
+            await self._send(StatusEvent(type=MessageType.ERROR, detail="Invalid message: expected a JSON object"))
+            return
+
+        message_type = data.get("type", ClientMessageType.MESSAGE.value)
+        try:
+            if message_type == ClientMessageType.PING.value:
+                await self._send(StatusEvent(type=MessageType.PONG))
+            elif message_type == ClientMessageType.CANCEL.value:
+                control = ControlMessage(**data)
+                self._cancel(control.session_id)
+                await self._send(StatusEvent(type=MessageType.CANCELLED, session_id=control.session_id))
+            else:
+                await self._enqueue(UserRequest(**data))
+        except ValidationError as e:
+            await self._send(StatusEvent(type=MessageType.ERROR, detail=f"Invalid message: {e.errors()}"))
+
+    async def _enqueue(self, user_request: UserRequest):
+        session_id = user_request.session_id
+        if self._pending >= self._max_pending:
+            await self._send(StatusEvent(
+                type=MessageType.ERROR,
+                session_id=session_id,
+                detail="Too many pending requests, try again later",
+            ))
+            return
+
+        self._pending += 1
+        self._queues.setdefault(session_id, asyncio.Queue()).put_nowait(user_request)
+        if session_id not in self._workers:
+            self._workers[session_id] = asyncio.create_task(self._session_worker(session_id))
+
+    def _cancel(self, session_id: Optional[str]):
+        queue = self._queues.get(session_id)
+        while queue is not None and not queue.empty():
+            queue.get_nowait()
+            self._pending -= 1
+        running = self._running.get(session_id)
+        if running is not None:
+            running.cancel()
+
+    async def _session_worker(self, session_id: Optional[str]):
+        queue = self._queues[session_id]
+        try:
+            while not queue.empty():
+                user_request = queue.get_nowait()
+                try:
+                    async with self._turn_slots:
+                        turn = asyncio.create_task(self._run_turn(user_request))
+                        self._running[session_id] = turn
+                        try:
+                            await asyncio.wait({turn})
+                        finally:
+                            turn.cancel()
+                            self._running.pop(session_id, None)
+                finally:
+                    self._pending -= 1
+        finally:
+            self._workers.pop(session_id, None)
+            self._queues.pop(session_id, None)
+
+    async def _run_turn(self, user_request: UserRequest):
+        # Runs in its own task, so the session id only tags this turn's log records.
+        SESSION_ID.set(user_request.session_id)
+        try:
+            response = await AgentChatHandler(user_request, self).handle_request()
+            if response is not None:
+                await self._send(response)
+        except asyncio.CancelledError:
+            LOGGER.debug(f"Chat turn cancelled for session {user_request.session_id}")
+            raise
+        except Exception as e:
+            LOGGER.error(f"Chat turn failed for session {user_request.session_id}: {e}")
+            await self._send(StatusEvent(type=MessageType.ERROR, session_id=user_request.session_id, detail=str(e)))
+
+    async def _send(self, event: BaseModel):
+        try:
+            await self.send_json(event.model_dump(mode="json", by_alias=True))
+        except Exception as e:
+            LOGGER.debug(f"Could not send {event.__class__.__name__}: {e}")
+
+    async def _shutdown(self):
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
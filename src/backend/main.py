@@ -1,10 +1,34 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
+from agent.checkpointers import CHECKPOINT_STORE
+from agent.graph import MCP_SESSION_POOL
+from agent.graph_registry import GRAPH_REGISTRY
+from handlers.agent_chat_handler import IMAGE_HTTP_CLIENT, check_image_delivery
+from middlewares.correlation import CorrelationIdMiddleware
+from middlewares.metrics import MetricsMiddleware
 from routers.chat_router import chat_router
 from routers.health_router import health_router
+from routers.metrics_router import metrics_router
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    check_image_delivery()
+    await CHECKPOINT_STORE.open()
+    await MCP_SESSION_POOL.start()
+    await GRAPH_REGISTRY.start()
+    await IMAGE_HTTP_CLIENT.start()
+    yield
+    await IMAGE_HTTP_CLIENT.close()
+    await GRAPH_REGISTRY.stop()
+    await MCP_SESSION_POOL.stop()
+    await CHECKPOINT_STORE.close()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,6 +39,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CorrelationIdMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(chat_router)
 app.include_router(health_router, prefix="/health", tags=["health"])
+app.include_router(metrics_router, tags=["metrics"])
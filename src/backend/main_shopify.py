@@ -1,14 +1,46 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi_mcp import FastApiMCP
 from starlette.middleware.cors import CORSMiddleware
 
+from configs.logger import LOGGER
+from middlewares.correlation import CorrelationIdMiddleware
+from middlewares.metrics import MetricsMiddleware
+from routers.artifact_router import artifact_router
 from routers.orders_router import orders_router
+from routers.stats_router import stats_router
 from routers.suppliers_router import supplier_router
 from routers.image_router import image_router
+from routers.inventory_router import inventory_router
+from routers.metrics_router import metrics_router
 from routers.shopify_router import shopify_router
+from services.cosmos_db_service import ORDERS_DB_POOL, SUPPLIER_SNAPSHOT
+from services.render_pool import RENDER_POOL
+from services.shopify_catalog import SHOPIFY_CATALOG
+from services.shopify_service import N8N_HTTP_CLIENT
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await N8N_HTTP_CLIENT.start()
+    SHOPIFY_CATALOG.start()
+    try:
+        await ORDERS_DB_POOL.start()
+    except Exception as e:
+        LOGGER.warning(f"Orders database pool not started, will retry on first query: {e}")
+    await SUPPLIER_SNAPSHOT.start()
+    await RENDER_POOL.start()
+    yield
+    await RENDER_POOL.stop()
+    await SUPPLIER_SNAPSHOT.stop()
+    await ORDERS_DB_POOL.close()
+    await SHOPIFY_CATALOG.stop()
+    await N8N_HTTP_CLIENT.close()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -20,13 +52,19 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CorrelationIdMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(shopify_router, prefix="/shopify", tags=["shopify"])
 app.include_router(image_router)
 app.include_router(supplier_router, prefix="/suppliers", tags=["suppliers"])
 app.include_router(orders_router, prefix="/orders", tags=["orders"])
+app.include_router(inventory_router, prefix="/inventory", tags=["inventory"])
+app.include_router(stats_router, prefix="/stats", tags=["stats"])
+app.include_router(artifact_router, prefix="/images", tags=["artifacts"])
+app.include_router(metrics_router, tags=["metrics"])
 
-mcp = FastApiMCP(app)
+mcp = FastApiMCP(app, exclude_tags=["stats", "artifacts", "metrics", "exports"])
 
 mcp.mount_http()
 
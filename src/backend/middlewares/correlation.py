@@ -0,0 +1,38 @@
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from configs.logger import REQUEST_ID
+
+REQUEST_ID_HEADER = "x-request-id"
+
+
+class CorrelationIdMiddleware:
+    """
+    Give every HTTP request and WebSocket connection a request id for log correlation.
+
+    An incoming X-Request-ID header is reused so ids carry across services; otherwise one is
+    generated. The id is echoed in the X-Request-ID response header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get(REQUEST_ID_HEADER) or uuid.uuid4().hex[:16]
+        token = REQUEST_ID.set(request_id)
+
+        async def send_with_request_id(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            REQUEST_ID.reset(token)
@@ -0,0 +1,13 @@
+HISTORY_SUMMARY_PROMPT = """
+You maintain a running summary of a conversation between a user and a shopping assistant.
+
+Update the existing summary with the new messages below. Keep facts the assistant may need later:
+product names, ids and SKUs, numbers the user asked about, decisions made and open questions.
+Drop greetings, raw tool dumps and plotting code. Answer with the updated summary only.
+
+Existing summary:
+{summary}
+
+New messages:
+{messages}
+"""
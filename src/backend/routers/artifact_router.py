@@ -0,0 +1,20 @@
+from fastapi import APIRouter, HTTPException
+from starlette.responses import Response
+
+from services.image_store import IMAGE_STORE
+
+artifact_router = APIRouter()
+
+
+@artifact_router.get("/{image_id}")
+async def get_image_endpoint(image_id: str):
+    """Raw bytes of a rendered image. Ids are content hashes, so the response never changes.
+    """
+    image = IMAGE_STORE.get(image_id)
+    if image is None:
+        raise HTTPException(status_code=404, detail=f"Image {image_id} not found or expired")
+    return Response(
+        content=image.data,
+        media_type=image.mime_type,
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
@@ -1,9 +1,9 @@
 from fastapi import APIRouter
 from starlette.websockets import WebSocket
 
+from configs.config import CHAT_CONFIG
 from configs.logger import LOGGER
-from handlers.agent_chat_handler import AgentChatHandler
-from schemas.websocket import UserRequest
+from handlers.chat_connection_handler import ChatConnectionHandler
 
 chat_router = APIRouter()
 
@@ -11,14 +11,10 @@ chat_router = APIRouter()
 @chat_router.websocket("/ws/chat")
 async def chat_websocket(websocket: WebSocket):
     await websocket.accept()
-    LOGGER.debug(f"WebSocket accepted")
-    try:
-        while True:
-            data = await websocket.receive_json()
-            user_request = UserRequest(**data)
-            chat_handler = AgentChatHandler(user_request, websocket)
-            response = await chat_handler.handle_request()
-            await websocket.send_json(response.model_dump())
-    except Exception as e:
-        await websocket.close()
-        LOGGER.warning(f"WebSocket connection closed due to: {e}")
+    LOGGER.debug("WebSocket accepted")
+    connection = ChatConnectionHandler(
+        websocket,
+        max_pending=CHAT_CONFIG.max_pending_requests,
+        max_concurrent_turns=CHAT_CONFIG.max_concurrent_turns,
+    )
+    await connection.run()
@@ -1,5 +1,7 @@
 from fastapi import APIRouter
 
+from agent.checkpointers import CHECKPOINT_STORE
+from agent.graph import MCP_SESSION_POOL
 from configs.logger import LOGGER
 
 health_router = APIRouter()
@@ -11,3 +13,17 @@ async def health_endpoint():
     """
     LOGGER.debug("Health check endpoint is running.")
     return {"status": "ok"}
+
+
+@health_router.get("/mcp-pool")
+async def mcp_pool_endpoint():
+    """MCP session pool statistics: open/idle sessions, reuse rate and acquire latency.
+    """
+    return MCP_SESSION_POOL.metrics()
+
+
+@health_router.get("/checkpoints")
+async def checkpoints_endpoint():
+    """Conversation checkpoint storage per session, largest first.
+    """
+    return await CHECKPOINT_STORE.usage()
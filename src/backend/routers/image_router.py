@@ -1,37 +1,53 @@
-import base64
-import io
-
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
 from fastapi import APIRouter, HTTPException
 
-from schemas.image import PyplotCode
+from configs.logger import LOGGER
+from exceptions.render_exceptions import (
+    RenderFailedException,
+    RenderQueueFullException,
+    RenderTimeoutException,
+)
+from schemas.image import ImageReference, PyplotCode
+from services.cosmos_db_service import ORDERS_RESULT_STORE
+from services.image_store import IMAGE_STORE
+from services.render_cache import RENDER_CACHE
+from services.render_pool import RENDER_POOL
 
 image_router = APIRouter()
 
 
 @image_router.post(
     "/generate-graph",
-    summary="Generate diagram using Matplotlib code."
+    summary="Generate diagram using Matplotlib code.",
+    response_model=ImageReference,
 )
 async def generate_diagram(payload: PyplotCode):
-    print(payload.code)
-    image_buffer = io.BytesIO()
-    execution_globals = {
-        "plt": plt,
-        "np": np,
-        "pd": pd,
-    }
+    LOGGER.debug("Rendering plot code", extra={"payload": payload.code})
+    frames = {}
+    for name, result_id in payload.data.items():
+        if not name.isidentifier():
+            raise HTTPException(status_code=400, detail=f"Invalid variable name: {name}")
+        result = ORDERS_RESULT_STORE.get(result_id)
+        if result is None:
+            raise HTTPException(status_code=404, detail=f"Query result {result_id} not found or expired")
+        frames[name] = (result.columns, result.column_names)
 
+    options = payload.options.model_dump(mode="json")
+    job = {"code": payload.code, "frames": frames, "options": options}
+    cache_key = RENDER_CACHE.key(payload.code, options, payload.data)
     try:
-        exec(payload.code, execution_globals)
-        plt.savefig(image_buffer, format="png", bbox_inches="tight")
-        image_buffer.seek(0)
-        img_bytes = image_buffer.getvalue()
-        img_b64 = base64.b64encode(img_bytes).decode("utf-8")
-        return {"image": img_b64}
-    except Exception as e:
+        img_bytes = await RENDER_CACHE.get_or_render(cache_key, lambda: RENDER_POOL.render(job))
+    except RenderQueueFullException as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except RenderTimeoutException as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except RenderFailedException as e:
         raise HTTPException(status_code=400, detail=f"Error executing code: {e}")
-    finally:
-        plt.close("all")
+    # Only a short reference goes back to the agent; the chat server fetches the bytes
+    # (or hands the URL to the browser), so the image never enters the LLM history.
+    image = IMAGE_STORE.put(img_bytes, payload.options.format.mime_type)
+    return ImageReference(
+        image_id=image.image_id,
+        url=f"/images/{image.image_id}",
+        mime_type=image.mime_type,
+        size=len(image.data),
+    )
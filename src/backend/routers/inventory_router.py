@@ -0,0 +1,51 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from configs.logger import LOGGER
+from schemas.inventory import InventoryPage, InventorySortField
+from services.inventory_view import INVENTORY_VIEW
+
+inventory_router = APIRouter()
+
+
+@inventory_router.get(
+    "/view",
+    summary="Get stock, supplier terms and sales velocity per product.",
+    description="One row per Shopify product with its stock, its suppliers' lead time and unit cost, "
+                "units sold and daily sales velocity over the recent window, days of stock cover and "
+                "a needs_reorder flag (cover shorter than the shortest lead time). "
+                "Use this for replenishment questions instead of combining /shopify, /suppliers and /orders.",
+    response_model=InventoryPage,
+)
+async def get_inventory_view(
+        product_id: Optional[str] = Query(None, description="Exact Shopify product id."),
+        sku: Optional[str] = Query(None, description="Variant SKU, case-insensitive."),
+        needs_reorder: Optional[bool] = Query(None, description="Only products that need (or don't need) reordering."),
+        sort_by: InventorySortField = Query(InventorySortField.DAYS_OF_COVER, description="Field to sort by."),
+        descending: bool = Query(False, description="Sort in descending order."),
+        limit: int = Query(50, ge=1, le=500, description="Maximum number of products to return."),
+) -> InventoryPage:
+    LOGGER.debug("Fetching inventory view")
+    try:
+        items = await INVENTORY_VIEW.items()
+    except Exception as e:
+        LOGGER.error(f"Error building inventory view: {e}")
+        raise HTTPException(status_code=404, detail=f"Inventory information not found: {e}")
+
+    if product_id is not None:
+        items = [item for item in items if item.product_id == product_id]
+    if sku is not None:
+        items = [item for item in items if sku.lower() in (item_sku.lower() for item_sku in item.skus)]
+    if needs_reorder is not None:
+        items = [item for item in items if item.needs_reorder == needs_reorder]
+
+    present = [item for item in items if getattr(item, sort_by.value) is not None]
+    missing = [item for item in items if getattr(item, sort_by.value) is None]
+    present.sort(key=lambda item: getattr(item, sort_by.value), reverse=descending)
+    return InventoryPage(
+        items=(present + missing)[:limit],
+        total=len(items),
+        sales_window_days=INVENTORY_VIEW.sales_window_days,
+        sales_available=INVENTORY_VIEW.sales_available,
+    )
@@ -1,23 +1,57 @@
-from typing import Any
+from typing import Union
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
 from configs.logger import LOGGER
-from schemas.cosmos import PostgresSQLQuerySchema
-from services.cosmos_db_service import query_orders_container
+from schemas.cosmos import (
+    OrdersQueryMode,
+    OrdersQueryResult,
+    OrdersQuerySummary,
+    PostgresSQLExportSchema,
+    PostgresSQLQuerySchema,
+)
+from services.cosmos_db_service import query_orders_container, stream_orders_container, summarize_orders_query
 
 orders_router = APIRouter()
 
 
 @orders_router.post(
     "/query",
-    summary="Execute a query to get orders."
+    summary="Execute a query to get orders.",
+    description="Runs a read-only SQL query against the orders database. "
+                "By default at most `max_rows` rows are returned with a `truncated` flag; "
+                "use mode `columns` for one array per column, mode `handle` to keep the rows on the server "
+                "and get a `result_id` to pass to /generate-graph, mode `summary` to get the row count and "
+                "per-column aggregates instead of rows, or mode `stream` to receive up to `max_rows` rows as NDJSON.",
+    response_model_exclude_none=True,
 )
-async def get_orders_by_query(query: PostgresSQLQuerySchema) -> Any:
-    LOGGER.debug("Fetching all orders information")
+async def get_orders_by_query(query: PostgresSQLQuerySchema) -> Union[OrdersQueryResult, OrdersQuerySummary]:
+    LOGGER.debug(f"Fetching orders information ({query.mode.value})", extra={"payload": query.query})
+    if query.mode == OrdersQueryMode.STREAM:
+        return StreamingResponse(
+            stream_orders_container(query.query, query.max_rows),
+            media_type="application/x-ndjson",
+        )
     try:
-        print(query.query)
-        return await query_orders_container(query.query)
+        if query.mode == OrdersQueryMode.SUMMARY:
+            return await summarize_orders_query(query.query)
+        return await query_orders_container(query.query, query.max_rows, query.mode)
     except Exception as e:
-        LOGGER.error("Error fetching suppliers information: {e}")
+        LOGGER.error(f"Error fetching orders information: {e}")
         raise HTTPException(status_code=404, detail="Orders information not found")
+
+
+@orders_router.post(
+    "/export",
+    summary="Stream the full result of a query as NDJSON.",
+    description="Runs a read-only SQL query and streams its rows as NDJSON, up to the server export limit. "
+                "Meant for direct HTTP clients; it is not exposed as an MCP tool.",
+    tags=["exports"],
+)
+async def export_orders_by_query(query: PostgresSQLExportSchema) -> StreamingResponse:
+    LOGGER.debug("Exporting orders", extra={"payload": query.query})
+    return StreamingResponse(
+        stream_orders_container(query.query, query.max_rows, export=True),
+        media_type="application/x-ndjson",
+    )
@@ -1,10 +1,19 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
 
 from configs.logger import LOGGER
-from schemas.shopify import ShopifySchema
-from services.shopify_service import get_shopify_data
+from schemas.shopify import ShopifyPage, ShopifySchema
+from services.shopify_catalog import SHOPIFY_CATALOG
+from services.shopify_projection import (
+    COMPACT_FIELDS,
+    ProjectionError,
+    decode_cursor,
+    encode_cursor,
+    parse_fields,
+    project,
+)
 
 shopify_router = APIRouter()
 
@@ -12,22 +21,96 @@ shopify_router = APIRouter()
 @shopify_router.get(
     "/all",
     summary="Get all products from Shopify.",
-    description="Get all products from Shopify.",
-    response_model=List[ShopifySchema]
+    description="Get all products from Shopify, one page at a time. "
+                "Pass `next_cursor` from the previous page as `cursor` to continue. "
+                "If the catalog was refreshed in between, the cursor is rejected with 409 "
+                "and paging has to restart from the first page. "
+                "Use `fields` (e.g. id,title,variants.sku,variants.inventory_quantity) "
+                "or `compact=true` to return only the needed fields.",
+    response_model=ShopifyPage
 )
-async def get_all_products_from_shopify() -> List[ShopifySchema]:
+async def get_all_products_from_shopify(
+        cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page."),
+        limit: int = Query(50, ge=1, le=500, description="Maximum number of products per page."),
+        fields: Optional[str] = Query(None, description="Comma-separated fields, variant fields as variants.<field>."),
+        compact: bool = Query(False, description="Return only key product and variant fields, without empty values."),
+) -> JSONResponse:
     """
     Get all products from Shopify.
 
+    Args:
+        cursor (Optional[str]): Pagination cursor.
+        limit (int): Page size.
+        fields (Optional[str]): Field projection.
+        compact (bool): Compact mode.
+
     Returns:
-        List[ShopifySchema]: All products data from Shopify.
+        ShopifyPage: One page of (projected) products from Shopify.
     """
     LOGGER.debug("Fetching all products from Shopify")
     try:
-        return await get_shopify_data()
+        include = parse_fields(fields or (COMPACT_FIELDS if compact else None))
+        offset, version = decode_cursor(cursor)
+    except ProjectionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        catalog = await SHOPIFY_CATALOG.snapshot()
+    except Exception as e:
+        LOGGER.error(f"Error fetching products from Shopify: {e}")
+        raise HTTPException(status_code=404, detail=f"Products not found: {e}")
+    if version is not None and version != catalog.version:
+        raise HTTPException(
+            status_code=409,
+            detail="The catalog changed since this cursor was issued, restart from the first page.",
+        )
+
+    products = catalog.products
+    end = offset + limit
+    page = ShopifyPage.model_construct(
+        items=project(products[offset:end], include, exclude_none=compact),
+        total=len(products),
+        next_cursor=encode_cursor(end, catalog.version) if end < len(products) else None,
+    )
+    # The items are already plain dicts, so skip response_model re-validation.
+    return JSONResponse(content=page.model_dump())
+
+
+@shopify_router.get(
+    "/search",
+    summary="Search products.",
+    description="Search products by words from title, SKU, tags, vendor or product type. "
+                "Matches prefixes and tolerates typos. Prefer this over /all to find specific products.",
+    response_model=List[ShopifySchema]
+)
+async def search_products(
+        q: Optional[str] = Query(None, description="Search text, e.g. 'blue snowboard'."),
+        vendor: Optional[str] = Query(None, description="Exact vendor name, case-insensitive."),
+        product_type: Optional[str] = Query(None, description="Exact product type, case-insensitive."),
+        tags: Optional[str] = Query(None, description="Comma-separated tags the product must all have."),
+        status: Optional[str] = Query(None, description="Product status, e.g. active, draft, archived."),
+        limit: int = Query(10, ge=1, le=100, description="Maximum number of products to return."),
+) -> List[ShopifySchema]:
+    """
+    Search products.
+
+    Args:
+        q (Optional[str]): Free-text query.
+        vendor (Optional[str]): Vendor filter.
+        product_type (Optional[str]): Product type filter.
+        tags (Optional[str]): Comma-separated required tags.
+        status (Optional[str]): Status filter.
+        limit (int): Maximum number of results.
+
+    Returns:
+        List[ShopifySchema]: Best matching Shopify products.
+    """
+    LOGGER.debug("Searching products in Shopify")
+    try:
+        catalog = await SHOPIFY_CATALOG.snapshot()
     except Exception as e:
         LOGGER.error(f"Error fetching products from Shopify: {e}")
         raise HTTPException(status_code=404, detail=f"Products not found: {e}")
+    return catalog.search_index.search(q, vendor, product_type, tags, status, limit)
 
 
 @shopify_router.get(
@@ -48,8 +131,86 @@ async def get_products_by_product_name(product_name: str) -> List[ShopifySchema]
     """
     LOGGER.debug("Fetching products by name from Shopify")
     try:
-        not_filtered_result = await get_shopify_data()
-        return list(filter(lambda item: item.title.lower() == product_name.lower(), not_filtered_result))
+        catalog = await SHOPIFY_CATALOG.snapshot()
+        return catalog.by_title.get(product_name.lower(), [])
+    except Exception as e:
+        LOGGER.error(f"Error fetching products from Shopify: {e}")
+        raise HTTPException(status_code=404, detail=f"Products not found: {e}")
+
+
+@shopify_router.get(
+    "/id/{product_id}",
+    summary="Get a product by id.",
+    description="Get a product by its Shopify product id.",
+    response_model=ShopifySchema
+)
+async def get_product_by_id(product_id: int) -> ShopifySchema:
+    """
+    Get a product by id.
+
+    Args:
+        product_id (int): Shopify product id.
+
+    Returns:
+        ShopifySchema: Shopify product.
+    """
+    LOGGER.debug("Fetching product by id from Shopify")
+    try:
+        catalog = await SHOPIFY_CATALOG.snapshot()
+    except Exception as e:
+        LOGGER.error(f"Error fetching products from Shopify: {e}")
+        raise HTTPException(status_code=404, detail=f"Products not found: {e}")
+    product = catalog.by_id.get(product_id)
+    if product is None:
+        raise HTTPException(status_code=404, detail=f"Product {product_id} not found")
+    return product
+
+
+@shopify_router.get(
+    "/sku/{sku}",
+    summary="Get products by variant SKU.",
+    description="Get products that have a variant with the given SKU.",
+    response_model=List[ShopifySchema]
+)
+async def get_products_by_sku(sku: str) -> List[ShopifySchema]:
+    """
+    Get products by variant SKU.
+
+    Args:
+        sku (str): Variant SKU, case-insensitive.
+
+    Returns:
+        List[ShopifySchema]: Shopify products.
+    """
+    LOGGER.debug("Fetching products by SKU from Shopify")
+    try:
+        catalog = await SHOPIFY_CATALOG.snapshot()
+        return catalog.by_sku.get(sku.lower(), [])
+    except Exception as e:
+        LOGGER.error(f"Error fetching products from Shopify: {e}")
+        raise HTTPException(status_code=404, detail=f"Products not found: {e}")
+
+
+@shopify_router.get(
+    "/vendor/{vendor}",
+    summary="Get products by vendor.",
+    description="Get products by vendor.",
+    response_model=List[ShopifySchema]
+)
+async def get_products_by_vendor(vendor: str) -> List[ShopifySchema]:
+    """
+    Get products by vendor.
+
+    Args:
+        vendor (str): Vendor name, case-insensitive.
+
+    Returns:
+        List[ShopifySchema]: Shopify products.
+    """
+    LOGGER.debug("Fetching products by vendor from Shopify")
+    try:
+        catalog = await SHOPIFY_CATALOG.snapshot()
+        return catalog.by_vendor.get(vendor.lower(), [])
     except Exception as e:
         LOGGER.error(f"Error fetching products from Shopify: {e}")
         raise HTTPException(status_code=404, detail=f"Products not found: {e}")
@@ -0,0 +1,90 @@
+from typing import Optional
+
+from fastapi import APIRouter
+
+from services.cosmos_db_service import ORDERS_DB_POOL, ORDERS_QUERY_CACHE, ORDERS_RESULT_STORE, SUPPLIER_SNAPSHOT
+from services.image_store import IMAGE_STORE
+from services.inventory_view import INVENTORY_VIEW
+from services.render_cache import RENDER_CACHE
+from services.render_pool import RENDER_POOL
+from services.shopify_catalog import SHOPIFY_CATALOG
+from services.shopify_service import N8N_HTTP_CLIENT
+
+stats_router = APIRouter()
+
+
+@stats_router.get("/upstreams")
+async def upstream_stats_endpoint():
+    """Request count, retries, errors and latency per n8n upstream URL.
+    """
+    return N8N_HTTP_CLIENT.stats()
+
+
+@stats_router.get("/catalog")
+async def catalog_stats_endpoint():
+    """Shopify catalog cache size, age and hit/miss counters.
+    """
+    return SHOPIFY_CATALOG.stats()
+
+
+@stats_router.get("/postgres")
+async def postgres_stats_endpoint():
+    """Orders database pool size, connection wait time and query latency.
+    """
+    return ORDERS_DB_POOL.stats()
+
+
+@stats_router.get("/suppliers")
+async def supplier_stats_endpoint():
+    """Supplier snapshot size, age, change-feed syncs and RU consumed.
+    """
+    return SUPPLIER_SNAPSHOT.stats()
+
+
+@stats_router.get("/inventory")
+async def inventory_stats_endpoint():
+    """Inventory view size, rebuild count and source versions.
+    """
+    return INVENTORY_VIEW.stats()
+
+
+@stats_router.get("/render")
+async def render_stats_endpoint():
+    """Plot render worker pool size, queue and job outcomes.
+    """
+    return RENDER_POOL.stats()
+
+
+@stats_router.get("/render-cache")
+async def render_cache_stats_endpoint():
+    """Rendered image cache size and hit rate.
+    """
+    return RENDER_CACHE.stats()
+
+
+@stats_router.get("/images")
+async def image_store_stats_endpoint():
+    """Rendered images held for download by image_id.
+    """
+    return IMAGE_STORE.stats()
+
+
+@stats_router.get("/orders-cache")
+async def orders_cache_stats_endpoint():
+    """Orders query result cache size and hit/miss counters.
+    """
+    return ORDERS_QUERY_CACHE.stats()
+
+
+@stats_router.get("/orders-results")
+async def orders_results_stats_endpoint():
+    """Query results held for reference by result_id.
+    """
+    return ORDERS_RESULT_STORE.stats()
+
+
+@stats_router.delete("/orders-cache")
+async def invalidate_orders_cache_endpoint(table: Optional[str] = None):
+    """Drop cached orders query results, all of them or those that reference `table`.
+    """
+    return {"invalidated": ORDERS_QUERY_CACHE.invalidate(table)}
@@ -1,10 +1,10 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 
 from configs.logger import LOGGER
-from schemas.cosmos import SupplierProductSchema
-from services.cosmos_db_service import get_all_suppliers_from_container
+from schemas.cosmos import SupplierProductSchema, SupplierQueryResult, SupplierSortField
+from services.cosmos_db_service import SUPPLIER_SNAPSHOT, get_all_suppliers_from_container
 
 supplier_router = APIRouter()
 
@@ -18,5 +18,46 @@ async def get_all_suppliers() -> List[SupplierProductSchema]:
     try:
         return await get_all_suppliers_from_container()
     except Exception as e:
-        LOGGER.error("Error fetching suppliers information: {e}")
+        LOGGER.error(f"Error fetching suppliers information: {e}")
         raise HTTPException(status_code=404, detail="Suppliers information not found")
+
+
+@supplier_router.get(
+    "/query",
+    summary="Find supplier products matching filters.",
+    description="Filter supplier products by supplier, product, stock below reorder point, "
+                "lead time and unit cost ranges, sorted and limited on the server. "
+                "Prefer this over /all, e.g. below_reorder_point=true to find products to reorder.",
+)
+async def query_suppliers(
+        supplier_id: Optional[str] = Query(None, description="Exact supplier id."),
+        product_id: Optional[str] = Query(None, description="Exact product id."),
+        below_reorder_point: bool = Query(False, description="Only items with current_stock < reorder_point."),
+        min_lead_time_days: Optional[int] = Query(None, ge=0),
+        max_lead_time_days: Optional[int] = Query(None, ge=0),
+        min_unit_cost: Optional[float] = Query(None, ge=0),
+        max_unit_cost: Optional[float] = Query(None, ge=0),
+        sort_by: Optional[SupplierSortField] = Query(None, description="Field to sort by."),
+        descending: bool = Query(False, description="Sort in descending order."),
+        limit: int = Query(50, ge=1, le=500, description="Maximum number of items to return."),
+) -> SupplierQueryResult:
+    LOGGER.debug("Querying suppliers information")
+    try:
+        index = await SUPPLIER_SNAPSHOT.index()
+    except Exception as e:
+        LOGGER.error(f"Error fetching suppliers information: {e}")
+        raise HTTPException(status_code=404, detail="Suppliers information not found")
+
+    items, total = index.query(
+        supplier_id=supplier_id,
+        product_id=product_id,
+        below_reorder_point=below_reorder_point,
+        min_lead_time_days=min_lead_time_days,
+        max_lead_time_days=max_lead_time_days,
+        min_unit_cost=min_unit_cost,
+        max_unit_cost=max_unit_cost,
+        sort_by=sort_by.value if sort_by else None,
+        descending=descending,
+        limit=limit,
+    )
+    return SupplierQueryResult(items=items, total=total)
@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
 
 
 class SupplierProductSchema(BaseModel):
@@ -15,5 +18,65 @@ class SupplierProductSchema(BaseModel):
     reorder_point: int
 
 
+class SupplierSortField(str, Enum):
+    SUPPLIER_ID = "supplier_id"
+    SUPPLIER_NAME = "supplier_name"
+    PRODUCT_ID = "product_id"
+    PRODUCT_NAME = "product_name"
+    LEAD_TIME_DAYS = "lead_time_days"
+    MIN_ORDER_QTY = "min_order_qty"
+    UNIT_COST = "unit_cost"
+    CURRENT_STOCK = "current_stock"
+    REORDER_POINT = "reorder_point"
+
+
+class SupplierQueryResult(BaseModel):
+    items: List[SupplierProductSchema]
+    total: int
+
+
+class OrdersQueryMode(str, Enum):
+    ROWS = "rows"
+    COLUMNS = "columns"
+    HANDLE = "handle"
+    STREAM = "stream"
+    SUMMARY = "summary"
+
+
 class PostgresSQLQuerySchema(BaseModel):
     query: str
+    mode: OrdersQueryMode = Field(
+        OrdersQueryMode.ROWS,
+        description="rows: JSON rows up to max_rows; columns: one array of values per column; "
+                    "handle: only a result_id, column names and row count, the rows stay on the server "
+                    "and can be loaded by /generate-graph; stream: NDJSON rows; "
+                    "summary: row count and per-column aggregates computed by the database.",
+    )
+    max_rows: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Maximum number of rows to return (or keep, in handle mode). Capped by the server limit.",
+    )
+
+
+class PostgresSQLExportSchema(BaseModel):
+    query: str
+    max_rows: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Maximum number of rows to stream. Capped by the server export limit.",
+    )
+
+
+class OrdersQueryResult(BaseModel):
+    result_id: str
+    column_names: List[str]
+    row_count: int
+    truncated: bool
+    rows: Optional[List[Dict[str, Any]]] = None
+    columns: Optional[Dict[str, List[Any]]] = None
+
+
+class OrdersQuerySummary(BaseModel):
+    row_count: int
+    columns: Dict[str, Dict[str, Any]]
@@ -1,5 +1,52 @@
-from pydantic import BaseModel
+from enum import Enum
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ImageFormat(str, Enum):
+    PNG = "png"
+    WEBP = "webp"
+    SVG = "svg"
+
+    @property
+    def mime_type(self) -> str:
+        return "image/svg+xml" if self is ImageFormat.SVG else f"image/{self.value}"
+
+
+class RenderOptions(BaseModel):
+    format: ImageFormat = ImageFormat.PNG
+    dpi: Optional[int] = Field(
+        default=None, ge=10, le=600,
+        description="Resolution of raster output. Defaults to the figure's own dpi (usually 100).",
+    )
+    max_width: Optional[int] = Field(
+        default=None, ge=16, le=8192,
+        description="Maximum raster width in pixels; the dpi is lowered to fit. Ignored for SVG.",
+    )
+    max_height: Optional[int] = Field(
+        default=None, ge=16, le=8192,
+        description="Maximum raster height in pixels; the dpi is lowered to fit. Ignored for SVG.",
+    )
+    compression: Optional[int] = Field(
+        default=None, ge=0, le=9,
+        description="Lossless compression effort, 0 (fastest) to 9 (smallest). "
+                    "Sets the PNG zlib level; for WebP it also switches to lossless encoding.",
+    )
 
 
 class PyplotCode(BaseModel):
     code: str
+    data: Dict[str, str] = Field(
+        default_factory=dict,
+        description="DataFrames to preload before running the code, as {variable_name: result_id} "
+                    "with result ids returned by /orders/query.",
+    )
+    options: RenderOptions = Field(default_factory=RenderOptions)
+
+
+class ImageReference(BaseModel):
+    image_id: str
+    url: str = Field(description="Path under which the image bytes can be fetched.")
+    mime_type: str
+    size: int
@@ -0,0 +1,42 @@
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class InventorySupplier(BaseModel):
+    supplier_id: Optional[str] = None
+    supplier_name: Optional[str] = None
+    lead_time_days: Optional[int] = None
+    unit_cost: Optional[float] = None
+    currency: Optional[str] = None
+    min_order_qty: Optional[int] = None
+    supplier_stock: Optional[int] = None
+    reorder_point: Optional[int] = None
+
+
+class InventoryItem(BaseModel):
+    product_id: str
+    title: Optional[str] = None
+    skus: List[str] = []
+    stock: int
+    suppliers: List[InventorySupplier] = []
+    units_sold: int
+    daily_velocity: float
+    days_of_cover: Optional[float] = None
+    min_lead_time_days: Optional[int] = None
+    needs_reorder: bool
+
+
+class InventorySortField(str, Enum):
+    DAYS_OF_COVER = "days_of_cover"
+    DAILY_VELOCITY = "daily_velocity"
+    UNITS_SOLD = "units_sold"
+    STOCK = "stock"
+
+
+class InventoryPage(BaseModel):
+    items: List[InventoryItem]
+    total: int
+    sales_window_days: int
+    sales_available: bool
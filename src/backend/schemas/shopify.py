@@ -1,4 +1,5 @@
-from typing import List, Optional
+import dataclasses
+from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel
 
@@ -48,3 +49,36 @@ class ShopifySchema(BaseModel):
     status: Optional[str] = None
     admin_graphql_api_id: Optional[str] = None
     variants: List[ShopifyVariant] = []
+
+
+class ShopifyPage(BaseModel):
+    items: List[Dict[str, Any]]
+    total: int
+    next_cursor: Optional[str] = None
+
+
+def _record_fields(model: type[BaseModel], overrides: Optional[Dict[str, Any]] = None) -> list:
+    overrides = overrides or {}
+    return [
+        (name, *overrides[name]) if name in overrides else (name, field.annotation, dataclasses.field(default=None))
+        for name, field in model.model_fields.items()
+    ]
+
+
+# Slotted dataclass mirrors of the schemas above, used as the compact in-memory form of the
+# cached catalog. Pydantic validates straight into them, and FastAPI serializes them like models.
+ShopifyVariantRecord = dataclasses.make_dataclass(
+    "ShopifyVariantRecord",
+    _record_fields(ShopifyVariant),
+    slots=True,
+)
+
+ShopifyProductRecord = dataclasses.make_dataclass(
+    "ShopifyProductRecord",
+    _record_fields(ShopifySchema, {
+        "variants": (List[ShopifyVariantRecord], dataclasses.field(default_factory=list)),
+    }),
+    slots=True,
+)
+
+ShopifyProduct = Union[ShopifySchema, ShopifyProductRecord]
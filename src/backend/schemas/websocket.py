@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from pydantic import BaseModel, Field
 
@@ -9,12 +9,82 @@ class SenderType(str, Enum):
     BOT = "bot"
 
 
+class ClientMessageType(str, Enum):
+    MESSAGE = "message"
+    CANCEL = "cancel"
+    PING = "ping"
+
+
+class MessageType(str, Enum):
+    TOKEN = "token"
+    TOOL_START = "tool_start"
+    TOOL_END = "tool_end"
+    FINAL = "final"
+    CANCELLED = "cancelled"
+    ERROR = "error"
+    PONG = "pong"
+    IMAGE = "image"
+    TRACE = "trace"
+
+
 class UserRequest(BaseModel):
     text: str
     sender: SenderType = SenderType.USER
     session_id: Optional[str] = Field(alias='sessionId')
 
 
+class ControlMessage(BaseModel):
+    type: ClientMessageType
+    session_id: Optional[str] = Field(default=None, alias='sessionId')
+
+
 class BotResponse(BaseModel):
     sender: SenderType = SenderType.BOT
+    type: MessageType = MessageType.FINAL
+    session_id: Optional[str] = Field(default=None, serialization_alias='sessionId')
     text: str
+
+
+class TokenDelta(BaseModel):
+    sender: SenderType = SenderType.BOT
+    type: MessageType = MessageType.TOKEN
+    session_id: Optional[str] = Field(default=None, serialization_alias='sessionId')
+    text: str
+
+
+class ToolEvent(BaseModel):
+    sender: SenderType = SenderType.BOT
+    type: MessageType
+    session_id: Optional[str] = Field(default=None, serialization_alias='sessionId')
+    name: str
+    tool_call_id: Optional[str] = None
+    status: Optional[str] = None
+
+
+class StatusEvent(BaseModel):
+    sender: SenderType = SenderType.BOT
+    type: MessageType
+    session_id: Optional[str] = Field(default=None, serialization_alias='sessionId')
+    detail: Optional[str] = None
+
+
+class ImageEvent(BaseModel):
+    """
+    A rendered image. With `binary` set, the image bytes follow in the next binary frame;
+    otherwise they are fetched from `url`.
+    """
+    sender: SenderType = SenderType.BOT
+    type: MessageType = MessageType.IMAGE
+    session_id: Optional[str] = Field(default=None, serialization_alias='sessionId')
+    image_id: str
+    mime_type: str
+    size: int
+    url: Optional[str] = None
+    binary: bool = False
+
+
+class TraceEvent(BaseModel):
+    sender: SenderType = SenderType.BOT
+    type: MessageType = MessageType.TRACE
+    session_id: Optional[str] = Field(default=None, serialization_alias='sessionId')
+    trace: Dict[str, Any]
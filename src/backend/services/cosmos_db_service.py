@@ -1,34 +1,203 @@
-from typing import List, Any
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-import asyncpg
 from azure.cosmos.aio import CosmosClient
-from azure.cosmos.exceptions import CosmosHttpResponseError
 
-from configs.config import AZURE_COSMOS_DB_CONFIG, POSTGRESQL_CONFIG
-from schemas.cosmos import SupplierProductSchema
+from configs.config import (
+    AZURE_COSMOS_DB_CONFIG,
+    ORDERS_QUERY_CACHE_CONFIG,
+    ORDERS_RESULT_STORE_CONFIG,
+    POSTGRESQL_CONFIG,
+    SUPPLIER_SYNC_CONFIG,
+)
+from configs.logger import LOGGER
+from schemas.cosmos import OrdersQueryMode, OrdersQueryResult, OrdersQuerySummary, SupplierProductSchema
+from services.postgres_pool import PostgresPool
+from services.query_cache import QueryResultCache
+from services.query_results import QueryResultStore, StoredResult
+from services.supplier_snapshot import SupplierSnapshot
+
+ORDERS_DB_POOL = PostgresPool(POSTGRESQL_CONFIG)
+ORDERS_QUERY_CACHE = QueryResultCache(ORDERS_QUERY_CACHE_CONFIG)
+ORDERS_RESULT_STORE = QueryResultStore(ORDERS_RESULT_STORE_CONFIG)
+SUPPLIER_SNAPSHOT = SupplierSnapshot(
+    lambda: CosmosClient(
+        AZURE_COSMOS_DB_CONFIG.uri,
+        AZURE_COSMOS_DB_CONFIG.key,
+        connection_verify=AZURE_COSMOS_DB_CONFIG.verify_ssl,
+    ),
+    AZURE_COSMOS_DB_CONFIG,
+    SUPPLIER_SYNC_CONFIG,
+)
+
+NUMERIC_TYPES = {"int2", "int4", "int8", "float4", "float8", "numeric", "money"}
+ORDERED_TYPES = {"text", "varchar", "bpchar", "name", "date", "time", "timestamp", "timestamptz", "uuid"}
 
 
 async def get_all_suppliers_from_container() -> List[SupplierProductSchema]:
-    items = []
-    async with CosmosClient(AZURE_COSMOS_DB_CONFIG.uri, AZURE_COSMOS_DB_CONFIG.key) as client:
-        try:
-            database = client.get_database_client(AZURE_COSMOS_DB_CONFIG.database_name)
-            container = database.get_container_client(AZURE_COSMOS_DB_CONFIG.supplier_container_name)
-            async for item in container.read_all_items():
-                items.append(item)
-        except CosmosHttpResponseError as e:
-            raise e
-    return items
-
-
-async def query_orders_container(query: str) -> Any:
-    conn = None
+    return await SUPPLIER_SNAPSHOT.items()
+
+
+async def fetch_units_sold(window_days: int) -> List[Tuple[Optional[str], Optional[str], int]]:
+    """
+    Units sold per (product_id, sku) over the last `window_days` days, cancelled orders excluded.
+
+    `order_date` is stored as ISO-8601 text, so it is compared as text rather than cast.
+    """
+    rows = await ORDERS_DB_POOL.fetch(
+        """
+        SELECT product_id, sku, COALESCE(SUM(quantity), 0) AS units
+        FROM orders_data
+        WHERE order_date >= to_char(current_date - $1::int, 'YYYY-MM-DD')
+          AND COALESCE(order_status, '') NOT ILIKE 'cancel%'
+        GROUP BY product_id, sku
+        """,
+        window_days,
+    )
+    return [(row["product_id"], row["sku"], row["units"]) for row in rows]
+
+
+def _row_limit(max_rows: Optional[int], mode: OrdersQueryMode) -> int:
+    if mode == OrdersQueryMode.HANDLE:
+        return min(max_rows or POSTGRESQL_CONFIG.handle_max_rows, POSTGRESQL_CONFIG.handle_max_rows)
+    return min(max_rows or POSTGRESQL_CONFIG.query_default_rows, POSTGRESQL_CONFIG.query_max_rows)
+
+
+async def fetch_orders_result(query: str, limit: int) -> StoredResult:
+    """
+    Run `query` through a server-side cursor and keep at most `limit` rows, column by column.
+
+    One extra row is read to tell whether the result was truncated; the rest of the
+    result set is never transferred. Results are registered in ORDERS_RESULT_STORE, so they
+    can be referenced by `result_id`. The query cache only maps the normalized SQL and limit
+    to that id, so cached rows stay within the store's row budget; a result the store has
+    evicted is fetched again.
+    """
+    cache_key = ORDERS_QUERY_CACHE.key(query, "result", limit)
+    cached_id = ORDERS_QUERY_CACHE.get(cache_key)
+    if cached_id is not None:
+        cached = ORDERS_RESULT_STORE.get(cached_id)
+        if cached is not None:
+            return cached
+
+    columns: Dict[str, List[Any]] = {}
+    row_count = 0
+    truncated = False
+    async with ORDERS_DB_POOL.cursor(query, prefetch=min(limit + 1, POSTGRESQL_CONFIG.cursor_prefetch)) as cursor:
+        async for row in cursor:
+            if row_count == limit:
+                truncated = True
+                break
+            if not columns:
+                columns = {name: [] for name in row.keys()}
+            for values, value in zip(columns.values(), row.values()):
+                values.append(value)
+            row_count += 1
+    if not columns:
+        # No row to take the names from: describe the statement instead.
+        columns = {attribute.name: [] for attribute in await ORDERS_DB_POOL.attributes(query)}
+
+    result = ORDERS_RESULT_STORE.put(StoredResult(query, columns, row_count, truncated))
+    ORDERS_QUERY_CACHE.put(cache_key, result.result_id)
+    return result
+
+
+async def query_orders_container(
+        query: str,
+        max_rows: Optional[int] = None,
+        mode: OrdersQueryMode = OrdersQueryMode.ROWS,
+) -> OrdersQueryResult:
+    result = await fetch_orders_result(query, _row_limit(max_rows, mode))
+    response = OrdersQueryResult(
+        result_id=result.result_id,
+        column_names=result.column_names,
+        row_count=result.row_count,
+        truncated=result.truncated,
+    )
+    if mode == OrdersQueryMode.ROWS:
+        response.rows = result.rows()
+    elif mode == OrdersQueryMode.COLUMNS:
+        response.columns = result.columns
+    return response
+
+
+async def stream_orders_container(
+        query: str,
+        max_rows: Optional[int] = None,
+        export: bool = False,
+) -> AsyncIterator[str]:
+    """
+    Yield the rows of `query` as NDJSON lines, fetched from a server-side cursor in batches.
+
+    The stream stops after `max_rows` rows. Stream mode of /orders/query is also an MCP tool
+    whose whole body ends up in the model's context, so it gets the same caps as rows mode;
+    only `export` streams (the /orders/export route, hidden from MCP) may go up to
+    POSTGRES_STREAM_MAX_ROWS. The last line is a `{"_meta": ...}` record with the row count
+    and truncation flag, or an `{"_error": ...}` record if the query failed after the
+    response had started.
+    """
+    if export:
+        limit = min(max_rows or POSTGRESQL_CONFIG.stream_max_rows, POSTGRESQL_CONFIG.stream_max_rows)
+    else:
+        limit = _row_limit(max_rows, OrdersQueryMode.STREAM)
+    row_count = 0
+    truncated = False
     try:
-        conn = await asyncpg.connect(POSTGRESQL_CONFIG.jdbc_url)
-        rows = await conn.fetch(query)
-        return [dict(row) for row in rows]
+        async with ORDERS_DB_POOL.cursor(query, prefetch=min(limit + 1, POSTGRESQL_CONFIG.cursor_prefetch)) as cursor:
+            async for row in cursor:
+                if row_count == limit:
+                    truncated = True
+                    break
+                row_count += 1
+                yield json.dumps(dict(row), default=str) + "\n"
     except Exception as e:
-        raise e
-    finally:
-        if conn:
-            await conn.close()
+        LOGGER.error(f"Orders query stream failed after {row_count} rows: {e}")
+        yield json.dumps({"_error": str(e), "row_count": row_count}) + "\n"
+        return
+    yield json.dumps({"_meta": {"row_count": row_count, "truncated": truncated}}) + "\n"
+
+
+async def summarize_orders_query(query: str) -> OrdersQuerySummary:
+    """
+    Summarize the result of `query` without returning its rows.
+
+    The aggregates run in the database over `query` as a subquery: the total row count,
+    non-null counts per column, min/max/avg/sum for numeric columns and min/max/distinct
+    counts for text and temporal columns. Like the other modes, the query runs in a
+    read-only transaction.
+    """
+    cache_key = ORDERS_QUERY_CACHE.key(query, "summary")
+    cached = ORDERS_QUERY_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    inner = query.strip().rstrip(";")
+    attributes = await ORDERS_DB_POOL.attributes(inner)
+
+    aliases = [f"c{position}" for position in range(len(attributes))]
+    selects = ["count(*)"]
+    plan = []
+    for alias, attribute in zip(aliases, attributes):
+        aggregates = {"non_null": f"count({alias})"}
+        if attribute.type.name in NUMERIC_TYPES:
+            aggregates.update(
+                min=f"min({alias})", max=f"max({alias})", avg=f"avg({alias})", sum=f"sum({alias})"
+            )
+        elif attribute.type.name in ORDERED_TYPES:
+            aggregates.update(min=f"min({alias})", max=f"max({alias})", distinct=f"count(DISTINCT {alias})")
+        plan.append((attribute, list(aggregates)))
+        selects.extend(aggregates.values())
+
+    summary_sql = f"SELECT {', '.join(selects)} FROM ({inner}) AS q({', '.join(aliases)})"
+    row = (await ORDERS_DB_POOL.fetch(summary_sql, readonly=True))[0]
+
+    values = iter(row.values())
+    row_count = next(values)
+    columns = {}
+    for attribute, names in plan:
+        column = {"type": attribute.type.name}
+        column.update((name, next(values)) for name in names)
+        columns[attribute.name] = column
+    summary = OrdersQuerySummary(row_count=row_count, columns=columns)
+    ORDERS_QUERY_CACHE.put(cache_key, summary)
+    return summary
@@ -0,0 +1,136 @@
+import asyncio
+import random
+import time
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from configs.config import HttpClientConfig
+from configs.logger import LOGGER, REQUEST_ID
+from services.metrics import track_dependency
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LatencyStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_seconds = 0.0
+
+    def observe(self, seconds: float):
+        self.requests += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.last_seconds = seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "latency_avg_ms": 1000 * self.total_seconds / self.requests if self.requests else 0.0,
+            "latency_max_ms": 1000 * self.max_seconds,
+            "latency_last_ms": 1000 * self.last_seconds,
+        }
+
+
+class HttpClient:
+    """
+    Application-wide aiohttp client with a tuned connection pool.
+
+    Connections are kept alive between requests so upstream calls reuse DNS, TCP and TLS
+    setup. Requests that fail with a connection error, timeout or retryable status are
+    retried with exponential backoff and full jitter. Latency is tracked per upstream URL
+    (or per `stats_key` when one is given), and whole calls (retries included) are exported
+    as metrics under `dependency`.
+    """
+
+    def __init__(self, config: HttpClientConfig, dependency: str = "http"):
+        self._config = config
+        self._dependency = dependency
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._stats: Dict[str, LatencyStats] = {}
+
+    async def start(self):
+        if self._session is not None:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self._config.pool_limit,
+            limit_per_host=self._config.pool_limit_per_host,
+            keepalive_timeout=self._config.keepalive_timeout,
+            ttl_dns_cache=self._config.dns_cache_ttl,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self._config.total_timeout,
+            sock_connect=self._config.connect_timeout,
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            raise RuntimeError("HTTP client is not started")
+        return self._session
+
+    async def post_json(self, url: str, **kwargs) -> Any:
+        """
+        POST to `url` and decode the JSON response, retrying transient failures.
+        """
+        return await self._request("POST", url, lambda response: response.json(), **kwargs)
+
+    async def post_bytes(self, url: str, **kwargs) -> bytes:
+        """
+        POST to `url` and return the raw response body, retrying transient failures.
+        """
+        return await self._request("POST", url, lambda response: response.read(), **kwargs)
+
+    async def get_bytes(self, url: str, stats_key: Optional[str] = None, **kwargs) -> bytes:
+        """
+        GET `url` and return the raw response body, retrying transient failures.
+
+        Latency is tracked under `stats_key` (e.g. a route template) instead of the URL when
+        given, so URLs with ids in them don't each get their own stats entry.
+        """
+        return await self._request("GET", url, lambda response: response.read(), stats_key=stats_key, **kwargs)
+
+    def stats(self) -> Dict[str, dict]:
+        return {url: stats.as_dict() for url, stats in self._stats.items()}
+
+    async def _request(self, method: str, url: str, read, stats_key: Optional[str] = None, **kwargs) -> Any:
+        async with track_dependency(self._dependency, method):
+            return await self._request_with_retries(method, url, read, stats_key or url, **kwargs)
+
+    async def _request_with_retries(self, method: str, url: str, read, stats_key: str, **kwargs) -> Any:
+        stats = self._stats.setdefault(stats_key, LatencyStats())
+        request_id = REQUEST_ID.get()
+        if request_id is not None:
+            kwargs["headers"] = {"X-Request-ID": request_id, **kwargs.get("headers", {})}
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                async with self.session.request(method, url, **kwargs) as response:
+                    response.raise_for_status()
+                    result = await read(response)
+                stats.observe(time.perf_counter() - started)
+                return result
+            except (aiohttp.ClientConnectionError, aiohttp.ClientResponseError, asyncio.TimeoutError) as e:
+                stats.observe(time.perf_counter() - started)
+                retryable = not isinstance(e, aiohttp.ClientResponseError) or e.status in RETRYABLE_STATUSES
+                if not retryable or attempt >= self._config.max_retries:
+                    stats.errors += 1
+                    raise
+                delay = random.uniform(0, self._config.retry_backoff * 2 ** attempt)
+                LOGGER.warning(f"{method} {url} failed ({e}), retrying in {delay:.2f}s")
+                stats.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
@@ -0,0 +1,88 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from configs.config import ImageStoreConfig, IMAGE_STORE_CONFIG
+
+
+class StoredImage:
+    __slots__ = ("image_id", "data", "mime_type", "created_at")
+
+    def __init__(self, image_id: str, data: bytes, mime_type: str):
+        self.image_id = image_id
+        self.data = data
+        self.mime_type = mime_type
+        self.created_at = time.monotonic()
+
+
+class ImageStore:
+    """
+    Rendered images addressable by a short id, served as raw bytes from /images/{id}.
+
+    Ids are derived from the image content, so re-rendering the same chart returns the same
+    id. Images expire `ttl` seconds after they were stored; the least recently used ones are
+    dropped once the total size exceeds `max_bytes`.
+    """
+
+    def __init__(self, config: ImageStoreConfig):
+        self._ttl = config.ttl
+        self._max_bytes = config.max_bytes
+        self._images: OrderedDict[str, StoredImage] = OrderedDict()
+        self._bytes = 0
+
+        self._stored = 0
+        self._served = 0
+        self._not_found = 0
+        self._evictions = 0
+
+    def put(self, data: bytes, mime_type: str) -> StoredImage:
+        image_id = f"img_{hashlib.sha256(data).hexdigest()[:16]}"
+        image = self._images.get(image_id)
+        if image is None:
+            image = StoredImage(image_id, data, mime_type)
+            self._images[image_id] = image
+            self._bytes += len(data)
+            self._stored += 1
+        else:
+            image.created_at = time.monotonic()
+        self._images.move_to_end(image_id)
+        self._evict()
+        return image
+
+    def get(self, image_id: str) -> Optional[StoredImage]:
+        self._evict()
+        image = self._images.get(image_id)
+        if image is None:
+            self._not_found += 1
+            return None
+        self._images.move_to_end(image_id)
+        self._served += 1
+        return image
+
+    def stats(self) -> dict:
+        return {
+            "images": len(self._images),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "stored": self._stored,
+            "served": self._served,
+            "not_found": self._not_found,
+            "evictions": self._evictions,
+        }
+
+    def _evict(self):
+        deadline = time.monotonic() - self._ttl
+        expired = [image_id for image_id, image in self._images.items() if image.created_at < deadline]
+        for image_id in expired:
+            self._drop(image_id)
+        while self._bytes > self._max_bytes and len(self._images) > 1:
+            self._drop(next(iter(self._images)))
+
+    def _drop(self, image_id: str):
+        image = self._images.pop(image_id)
+        self._bytes -= len(image.data)
+        self._evictions += 1
+
+
+IMAGE_STORE = ImageStore(IMAGE_STORE_CONFIG)
@@ -0,0 +1,245 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from configs.config import InventoryConfig, INVENTORY_CONFIG
+from configs.logger import LOGGER
+from schemas.inventory import InventoryItem, InventorySupplier
+from services.cosmos_db_service import SUPPLIER_SNAPSHOT, fetch_units_sold
+from services.shopify_catalog import SHOPIFY_CATALOG, ShopifyCatalog
+from services.supplier_snapshot import SupplierSnapshot
+
+SalesLoader = Callable[[int], Awaitable[List[Tuple[Optional[str], Optional[str], int]]]]
+
+
+def _supplier(item: dict) -> InventorySupplier:
+    return InventorySupplier(
+        supplier_id=item.get("supplier_id"),
+        supplier_name=item.get("supplier_name"),
+        lead_time_days=item.get("lead_time_days"),
+        unit_cost=item.get("unit_cost"),
+        currency=item.get("currency"),
+        min_order_qty=item.get("min_order_qty"),
+        supplier_stock=item.get("current_stock"),
+        reorder_point=item.get("reorder_point"),
+    )
+
+
+class InventoryView:
+    """
+    Materialized join of Shopify stock, supplier terms and recent sales, one row per product.
+
+    Each source is versioned: the catalog and supplier snapshots by their own refreshes,
+    sales by a query cached for `sales_ttl` seconds. When a version moves only the rows of
+    the products it touched are rebuilt: catalog products are diffed against the last
+    refresh, supplier items come from the change feed (or a regroup diff after a full
+    resync) and units sold are diffed per product, so a sales refresh that changed nothing
+    rebuilds nothing.
+
+    Supplier items and order lines are matched to a product by Shopify product id first
+    and by variant SKU otherwise.
+    """
+
+    def __init__(
+            self,
+            catalog: ShopifyCatalog,
+            suppliers: SupplierSnapshot,
+            sales_loader: SalesLoader,
+            config: InventoryConfig,
+    ):
+        self._catalog = catalog
+        self._suppliers = suppliers
+        self._sales_loader = sales_loader
+        self._window_days = config.sales_window_days
+        self._sales_ttl = config.sales_ttl
+        self._sales_lock = asyncio.Lock()
+
+        self._sales: List[Tuple[Optional[str], Optional[str], int]] = []
+        self._sales_loaded_at: Optional[float] = None
+        self._sales_version = 0
+        self._sales_errors = 0
+
+        self._products: Dict[str, Any] = {}
+        # Sales match a key to the first product having it, suppliers to every such product.
+        self._product_keys: Dict[str, str] = {}
+        self._products_by_key: Dict[str, Set[str]] = {}
+        self._units_sold: Dict[str, int] = {}
+        self._suppliers_by_key: Dict[str, Dict[str, InventorySupplier]] = {}
+        self._supplier_keys: Dict[str, str] = {}
+        self._suppliers_version: Optional[int] = None
+
+        self._rows: Dict[str, InventoryItem] = {}
+        self._items: List[InventoryItem] = []
+        self._versions: Optional[tuple] = None
+        self._rebuilds = 0
+        self._rows_rebuilt = 0
+
+    @property
+    def sales_window_days(self) -> int:
+        return self._window_days
+
+    @property
+    def sales_available(self) -> bool:
+        return self._sales_loaded_at is not None
+
+    async def items(self) -> List[InventoryItem]:
+        catalog = await self._catalog.snapshot()
+        supplier_items = await self._suppliers.items()
+        await self._refresh_sales()
+
+        versions = (catalog.version, self._suppliers.version, self._sales_version)
+        if versions == self._versions:
+            return self._items
+
+        catalog_changed = self._versions is None or catalog.version != self._versions[0]
+        changed: Set[str] = set()
+        if catalog_changed:
+            changed |= self._apply_catalog(catalog.products)
+        if self._suppliers_version != self._suppliers.version:
+            changed |= self._apply_suppliers(supplier_items)
+        if catalog_changed or self._sales_version != self._versions[2]:
+            changed |= self._apply_sales()
+
+        for product_id in changed:
+            product = self._products.get(product_id)
+            if product is None:
+                self._rows.pop(product_id, None)
+            else:
+                self._rows[product_id] = self._row(product_id, product)
+        if changed or catalog_changed:
+            self._items = [self._rows[product_id] for product_id in self._products]
+            self._rebuilds += 1
+            self._rows_rebuilt += len(changed)
+        self._versions = versions
+        return self._items
+
+    def stats(self) -> dict:
+        return {
+            "items": len(self._items),
+            "rebuilds": self._rebuilds,
+            "rows_rebuilt": self._rows_rebuilt,
+            "catalog_version": self._versions[0] if self._versions else None,
+            "supplier_version": self._versions[1] if self._versions else None,
+            "sales_version": self._sales_version,
+            "sales_age_seconds": time.monotonic() - self._sales_loaded_at if self._sales_loaded_at else None,
+            "sales_errors": self._sales_errors,
+        }
+
+    async def _refresh_sales(self):
+        if self._sales_loaded_at is not None and time.monotonic() - self._sales_loaded_at < self._sales_ttl:
+            return
+        async with self._sales_lock:
+            if self._sales_loaded_at is not None and time.monotonic() - self._sales_loaded_at < self._sales_ttl:
+                return
+            try:
+                self._sales = await self._sales_loader(self._window_days)
+            except Exception as e:
+                # Keep serving stock and supplier data with the last known sales.
+                self._sales_errors += 1
+                LOGGER.warning(f"Inventory view sales refresh failed: {e}")
+                return
+            self._sales_loaded_at = time.monotonic()
+            self._sales_version += 1
+
+    def _apply_catalog(self, products) -> Set[str]:
+        """Swap in the new catalog and return the ids of added, removed or changed products."""
+        by_id = {str(product.id): product for product in products if product.id is not None}
+        changed = {product_id for product_id, product in by_id.items() if self._products.get(product_id) != product}
+        changed |= self._products.keys() - by_id.keys()
+        self._products = by_id
+
+        product_keys: Dict[str, str] = {}
+        products_by_key: Dict[str, Set[str]] = defaultdict(set)
+        for product_id, product in by_id.items():
+            product_keys[product_id] = product_id
+            products_by_key[product_id].add(product_id)
+            for variant in product.variants:
+                if variant.sku:
+                    product_keys.setdefault(variant.sku.lower(), product_id)
+                    products_by_key[variant.sku.lower()].add(product_id)
+        self._product_keys = product_keys
+        self._products_by_key = dict(products_by_key)
+        return changed
+
+    def _apply_suppliers(self, supplier_items: List[dict]) -> Set[str]:
+        """Apply supplier changes and return the ids of the products whose suppliers moved."""
+        changes = None
+        if self._suppliers_version is not None:
+            changes = self._suppliers.changes_since(self._suppliers_version)
+        self._suppliers_version = self._suppliers.version
+
+        if changes is None:
+            previous = self._suppliers_by_key
+            self._suppliers_by_key = {}
+            self._supplier_keys = {}
+            for item in supplier_items:
+                self._put_supplier(item)
+            keys = {
+                key for key in previous.keys() | self._suppliers_by_key.keys()
+                if list(previous.get(key, {}).values()) != list(self._suppliers_by_key.get(key, {}).values())
+            }
+        else:
+            keys = set()
+            for item in changes:
+                old_key = self._supplier_keys.pop(item["id"], None)
+                if old_key is not None:
+                    keys.add(old_key)
+                    self._suppliers_by_key[old_key].pop(item["id"], None)
+                new_key = self._put_supplier(item)
+                if new_key is not None:
+                    keys.add(new_key)
+        return {product_id for key in keys for product_id in self._products_by_key.get(key, ())}
+
+    def _put_supplier(self, item: dict) -> Optional[str]:
+        if item.get("product_id") is None:
+            return None
+        key = str(item["product_id"]).lower()
+        self._suppliers_by_key.setdefault(key, {})[item["id"]] = _supplier(item)
+        self._supplier_keys[item["id"]] = key
+        return key
+
+    def _apply_sales(self) -> Set[str]:
+        """Re-aggregate units sold per product and return the ids whose total changed."""
+        units_sold: Dict[str, int] = defaultdict(int)
+        for product_id, sku, units in self._sales:
+            key = self._product_keys.get(str(product_id)) or (sku and self._product_keys.get(sku.lower()))
+            if key:
+                units_sold[key] += int(units)
+        changed = {
+            product_id for product_id in self._units_sold.keys() | units_sold.keys()
+            if self._units_sold.get(product_id, 0) != units_sold.get(product_id, 0)
+        }
+        self._units_sold = dict(units_sold)
+        return changed
+
+    def _row(self, product_id: str, product) -> InventoryItem:
+        skus = [variant.sku for variant in product.variants if variant.sku]
+        suppliers = list(self._suppliers_by_key.get(product_id, {}).values())
+        for sku in skus:
+            suppliers.extend(self._suppliers_by_key.get(sku.lower(), {}).values())
+
+        stock = sum(variant.inventory_quantity or 0 for variant in product.variants)
+        sold = self._units_sold.get(product_id, 0)
+        velocity = sold / self._window_days
+        days_of_cover = stock / velocity if velocity else None
+        lead_times = [supplier.lead_time_days for supplier in suppliers if supplier.lead_time_days is not None]
+        min_lead_time = min(lead_times) if lead_times else None
+        return InventoryItem(
+            product_id=product_id,
+            title=product.title,
+            skus=skus,
+            stock=stock,
+            suppliers=suppliers,
+            units_sold=sold,
+            daily_velocity=round(velocity, 3),
+            days_of_cover=round(days_of_cover, 1) if days_of_cover is not None else None,
+            min_lead_time_days=min_lead_time,
+            needs_reorder=(
+                    stock <= 0 or (days_of_cover is not None and min_lead_time is not None
+                                   and days_of_cover <= min_lead_time)
+            ),
+        )
+
+
+INVENTORY_VIEW = InventoryView(SHOPIFY_CATALOG, SUPPLIER_SNAPSHOT, fetch_units_sold, INVENTORY_CONFIG)
@@ -0,0 +1,46 @@
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from prometheus_client import Gauge, Histogram
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, until the response body has been sent.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests being handled and WebSocket connections open, by route template.",
+    ["method", "route"],
+)
+DEPENDENCY_CALL_DURATION = Histogram(
+    "dependency_call_duration_seconds",
+    "Latency of calls to external dependencies (n8n, Cosmos, Postgres, LLM, MCP, render workers).",
+    ["dependency", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+@asynccontextmanager
+async def track_dependency(dependency: str, operation: str) -> AsyncIterator[None]:
+    """
+    Time the enclosed call to an external dependency.
+
+    The outcome label is `ok`, `error` or `cancelled`, so slow failures don't hide in the
+    success latencies.
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except BaseException as e:
+        if not isinstance(e, Exception):
+            outcome = "cancelled"
+        raise
+    finally:
+        DEPENDENCY_CALL_DURATION.labels(dependency, operation, outcome).observe(time.perf_counter() - started)
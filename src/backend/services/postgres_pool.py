@@ -0,0 +1,161 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+import asyncpg
+
+from configs.config import PostgreSQLConfig
+from services.metrics import track_dependency
+
+
+class PostgresPool:
+    """
+    Lifespan-managed asyncpg pool for the orders database.
+
+    Connections are reused across requests, idle ones are recycled after
+    `max_inactive_lifetime` seconds and each connection keeps a prepared-statement cache.
+    The pool is created lazily if the database was unreachable at startup.
+    Time spent waiting for a connection and running queries is tracked.
+    """
+
+    def __init__(self, config: PostgreSQLConfig):
+        self._config = config
+        self._pool: Optional[asyncpg.Pool] = None
+        self._lock = asyncio.Lock()
+
+        self._acquired = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._queries = 0
+        self._query_errors = 0
+        self._query_total = 0.0
+        self._query_max = 0.0
+
+    async def start(self):
+        await self._ensure_pool()
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        pool = await self._ensure_pool()
+        started = time.perf_counter()
+        async with pool.acquire(timeout=self._config.pool_acquire_timeout) as connection:
+            waited = time.perf_counter() - started
+            self._acquired += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            yield connection
+
+    async def fetch(self, query: str, *args, readonly: bool = False) -> List[asyncpg.Record]:
+        """
+        Run `query` and return all rows. Use `readonly` for SQL that is not trusted to be a
+        plain SELECT, so side-effecting functions called from it fail instead of running.
+        """
+        async with self.acquire() as connection:
+            started = time.perf_counter()
+            try:
+                async with track_dependency("postgres", "fetch"):
+                    if readonly:
+                        async with connection.transaction(readonly=True):
+                            return await connection.fetch(query, *args, timeout=self._config.query_timeout)
+                    return await connection.fetch(query, *args, timeout=self._config.query_timeout)
+            except Exception:
+                self._query_errors += 1
+                raise
+            finally:
+                self._observe_query(time.perf_counter() - started)
+
+    @asynccontextmanager
+    async def cursor(self, query: str, *args, prefetch: int) -> AsyncIterator[AsyncIterator[asyncpg.Record]]:
+        """
+        Open a server-side cursor inside a read-only transaction.
+
+        Rows are fetched `prefetch` at a time, so memory stays flat however many rows the
+        query produces. Only the database round trips (opening the cursor and each batch
+        fetch) count as query time, not the time the caller spends on the rows in between.
+        """
+        elapsed = 0.0
+
+        async def rows() -> AsyncIterator[asyncpg.Record]:
+            nonlocal elapsed
+            started = time.perf_counter()
+            try:
+                async with track_dependency("postgres", "cursor_open"):
+                    cursor = await connection.cursor(query, *args, timeout=self._config.query_timeout)
+            finally:
+                elapsed += time.perf_counter() - started
+            while True:
+                started = time.perf_counter()
+                try:
+                    async with track_dependency("postgres", "cursor_fetch"):
+                        batch = await cursor.fetch(prefetch, timeout=self._config.query_timeout)
+                finally:
+                    elapsed += time.perf_counter() - started
+                for row in batch:
+                    yield row
+                if len(batch) < prefetch:
+                    return
+
+        async with self.acquire() as connection:
+            try:
+                async with connection.transaction(readonly=True):
+                    iterator = rows()
+                    try:
+                        yield iterator
+                    finally:
+                        await iterator.aclose()
+            except Exception:
+                self._query_errors += 1
+                raise
+            finally:
+                self._observe_query(elapsed)
+
+    async def attributes(self, query: str) -> tuple:
+        """
+        Describe the result columns of `query` without executing it.
+        """
+        async with self.acquire() as connection:
+            async with track_dependency("postgres", "describe"):
+                statement = await connection.prepare(query, timeout=self._config.query_timeout)
+            return statement.get_attributes()
+
+    def stats(self) -> dict:
+        pool = self._pool
+        return {
+            "size": pool.get_size() if pool else 0,
+            "idle": pool.get_idle_size() if pool else 0,
+            "min_size": self._config.pool_min_size,
+            "max_size": self._config.pool_max_size,
+            "acquired": self._acquired,
+            "wait_avg_ms": 1000 * self._wait_total / self._acquired if self._acquired else 0.0,
+            "wait_max_ms": 1000 * self._wait_max,
+            "queries": self._queries,
+            "query_errors": self._query_errors,
+            "query_avg_ms": 1000 * self._query_total / self._queries if self._queries else 0.0,
+            "query_max_ms": 1000 * self._query_max,
+        }
+
+    def _observe_query(self, seconds: float):
+        self._queries += 1
+        self._query_total += seconds
+        self._query_max = max(self._query_max, seconds)
+
+    async def _ensure_pool(self) -> asyncpg.Pool:
+        if self._pool is not None:
+            return self._pool
+        async with self._lock:
+            if self._pool is None:
+                self._pool = await asyncpg.create_pool(
+                    self._config.jdbc_url,
+                    min_size=self._config.pool_min_size,
+                    max_size=self._config.pool_max_size,
+                    max_inactive_connection_lifetime=self._config.pool_max_inactive_lifetime,
+                    statement_cache_size=self._config.statement_cache_size,
+                    command_timeout=self._config.query_timeout,
+                )
+        return self._pool
@@ -0,0 +1,165 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from schemas.shopify import ShopifyProduct
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "sku": 2.0,
+    "tags": 1.5,
+    "vendor": 1.0,
+    "product_type": 1.0,
+    "variant": 0.5,
+}
+
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.6
+FUZZY_SCORE = 0.4
+MIN_PREFIX_LENGTH = 2
+MIN_FUZZY_LENGTH = 4
+MAX_PREFIX_EXPANSIONS = 50
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def _split_tags(tags: Optional[str]) -> Set[str]:
+    return {tag.strip().lower() for tag in tags.split(",") if tag.strip()} if tags else set()
+
+
+def _deletions(term: str) -> Set[str]:
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True if `a` and `b` differ by at most one insertion, deletion, substitution or transposition."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:] or (
+            i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+        )
+    return a[i:] == b[i + 1:]
+
+
+class ProductSearchIndex:
+    """
+    Inverted index over catalog products with prefix and typo-tolerant term matching.
+
+    Every query token must match some indexed term of a product, either exactly, as a
+    prefix, or within one edit (for tokens of at least MIN_FUZZY_LENGTH characters).
+    Products are ranked by the sum of their best per-token match, weighted by field.
+    """
+
+    def __init__(self, products: List[ShopifyProduct]):
+        self._products = products
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._deletes: Dict[str, Set[str]] = defaultdict(set)
+
+        for position, product in enumerate(products):
+            for field, text in self._field_texts(product):
+                weight = FIELD_WEIGHTS[field]
+                for term in tokenize(text):
+                    postings = self._postings[term]
+                    postings[position] = max(postings.get(position, 0.0), weight)
+
+        self._vocabulary = sorted(self._postings)
+        for term in self._vocabulary:
+            if len(term) >= MIN_FUZZY_LENGTH - 1:
+                for deletion in _deletions(term):
+                    self._deletes[deletion].add(term)
+
+    def search(
+            self,
+            query: Optional[str] = None,
+            vendor: Optional[str] = None,
+            product_type: Optional[str] = None,
+            tags: Optional[str] = None,
+            status: Optional[str] = None,
+            limit: int = 10,
+    ) -> List[ShopifyProduct]:
+        tokens = tokenize(query)
+        if tokens:
+            scores = self._score(tokens)
+        else:
+            scores = {position: 0.0 for position in range(len(self._products))}
+
+        required_tags = _split_tags(tags)
+        matches = []
+        for position, score in scores.items():
+            product = self._products[position]
+            if vendor and (product.vendor or "").lower() != vendor.lower():
+                continue
+            if product_type and (product.product_type or "").lower() != product_type.lower():
+                continue
+            if status and (product.status or "").lower() != status.lower():
+                continue
+            if required_tags and not required_tags <= _split_tags(product.tags):
+                continue
+            matches.append((score, position))
+
+        matches.sort(key=lambda match: (-match[0], match[1]))
+        return [self._products[position] for _, position in matches[:limit]]
+
+    def _score(self, tokens: List[str]) -> Dict[int, float]:
+        scores: Optional[Dict[int, float]] = None
+        for token in tokens:
+            token_scores: Dict[int, float] = {}
+            for term, match_score in self._expand(token):
+                for position, weight in self._postings[term].items():
+                    token_scores[position] = max(token_scores.get(position, 0.0), weight * match_score)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    position: score + token_scores[position]
+                    for position, score in scores.items() if position in token_scores
+                }
+            if not scores:
+                return {}
+        return scores or {}
+
+    def _expand(self, token: str) -> Iterable[tuple]:
+        if token in self._postings:
+            yield token, EXACT_SCORE
+
+        if len(token) >= MIN_PREFIX_LENGTH:
+            start = bisect_left(self._vocabulary, token)
+            for term in self._vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+                if not term.startswith(token):
+                    break
+                if term != token:
+                    yield term, PREFIX_SCORE
+
+        if len(token) >= MIN_FUZZY_LENGTH:
+            candidates = set(self._deletes.get(token, ()))
+            for deletion in _deletions(token) | {token}:
+                if deletion in self._postings:
+                    candidates.add(deletion)
+                candidates.update(self._deletes.get(deletion, ()))
+            for term in candidates:
+                if term != token and not term.startswith(token) and _within_one_edit(token, term):
+                    yield term, FUZZY_SCORE
+
+    @staticmethod
+    def _field_texts(product: ShopifyProduct) -> Iterable[tuple]:
+        yield "title", product.title
+        yield "title", product.handle
+        yield "vendor", product.vendor
+        yield "product_type", product.product_type
+        yield "tags", product.tags
+        for variant in product.variants:
+            yield "sku", variant.sku
+            yield "variant", variant.title
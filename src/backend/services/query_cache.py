@@ -0,0 +1,116 @@
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from configs.config import QueryCacheConfig
+
+SQL_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<comment>--[^\n]*|/\*.*?\*/)
+    | (?P<literal>'(?:[^']|'')*'|"(?:[^"]|"")*"|\$(?P<tag>\w*)\$.*?\$(?P=tag)\$)
+    | (?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+    | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<space>\s+)
+    | (?P<operator>[<>=!:|&+\-*/%^~]+)
+    | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Canonical form of a SQL statement for use as a cache key.
+
+    Comments and a trailing semicolon are dropped, whitespace is collapsed to single spaces
+    between tokens and unquoted keywords and identifiers are lower-cased (PostgreSQL folds
+    them anyway). String literals, quoted identifiers and numbers are kept verbatim, so
+    queries that differ in a value never share a key.
+    """
+    tokens = []
+    for match in SQL_TOKEN_PATTERN.finditer(sql):
+        kind = match.lastgroup
+        if kind in ("comment", "space"):
+            continue
+        tokens.append(match.group().lower() if kind == "word" else match.group())
+    while tokens and tokens[-1] == ";":
+        tokens.pop()
+    return " ".join(tokens)
+
+
+class QueryResultCache:
+    """
+    Size-bounded LRU cache of query results with a per-entry TTL.
+
+    Keys are `(normalized_sql, *variant)` tuples, where the variant distinguishes result
+    shapes of the same SQL (mode, row limit). `invalidate` drops everything, or only the
+    entries whose SQL mentions a given table.
+    """
+
+    def __init__(self, config: QueryCacheConfig):
+        self._enabled = config.enabled
+        self._ttl = config.ttl
+        self._max_entries = config.max_entries
+        self._entries: OrderedDict[Tuple, Tuple[float, Any]] = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def key(sql: str, *variant: Hashable) -> Tuple:
+        return (normalize_sql(sql), *variant)
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        if not self._enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[1]
+
+    def put(self, key: Tuple, value: Any):
+        if not self._enabled:
+            return
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, table: Optional[str] = None) -> int:
+        """
+        Drop cached results, all of them or those whose SQL references `table`.
+
+        Returns the number of dropped entries.
+        """
+        if table is None:
+            keys = list(self._entries)
+        else:
+            pattern = re.compile(rf"(?<![\w$]){re.escape(table.lower())}(?![\w$])")
+            keys = [key for key in self._entries if pattern.search(key[0])]
+        for key in keys:
+            del self._entries[key]
+        self._invalidations += len(keys)
+        return len(keys)
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "enabled": self._enabled,
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "ttl_seconds": self._ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "evictions": self._evictions,
+            "invalidations": self._invalidations,
+        }
@@ -0,0 +1,101 @@
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from configs.config import ResultStoreConfig
+
+
+class StoredResult:
+    """
+    Query result kept server-side in columnar form: one list of values per column.
+    """
+
+    __slots__ = ("result_id", "query", "columns", "row_count", "truncated", "created_at")
+
+    def __init__(self, query: str, columns: Dict[str, List[Any]], row_count: int, truncated: bool):
+        self.result_id = f"r_{secrets.token_hex(6)}"
+        self.query = query
+        self.columns = columns
+        self.row_count = row_count
+        self.truncated = truncated
+        self.created_at = time.time()
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        names = self.column_names
+        return [dict(zip(names, values)) for values in zip(*self.columns.values())]
+
+
+class QueryResultStore:
+    """
+    Short-lived registry of query results addressable by `result_id`.
+
+    Lets a later tool call (e.g. /generate-graph) load a result directly instead of the
+    rows round-tripping through the model. Entries expire `ttl` seconds after their last
+    use; the least recently used ones are dropped once `max_entries` or `max_total_rows`
+    is exceeded. The most recently used entry is always kept, even if it alone exceeds
+    `max_total_rows`, so a result_id just handed out is never dead on arrival.
+    """
+
+    def __init__(self, config: ResultStoreConfig):
+        self._ttl = config.ttl
+        self._max_entries = config.max_entries
+        self._max_total_rows = config.max_total_rows
+        self._results: OrderedDict[str, StoredResult] = OrderedDict()
+        self._expires: Dict[str, float] = {}
+        self._total_rows = 0
+
+        self._lookups = 0
+        self._lookup_misses = 0
+        self._evictions = 0
+
+    def put(self, result: StoredResult) -> StoredResult:
+        """Register `result` (or refresh it if already stored) and return it."""
+        if result.result_id not in self._results:
+            self._total_rows += result.row_count
+        self._results[result.result_id] = result
+        self._results.move_to_end(result.result_id)
+        self._expires[result.result_id] = time.monotonic() + self._ttl
+        self._evict()
+        return result
+
+    def get(self, result_id: str) -> Optional[StoredResult]:
+        self._lookups += 1
+        self._evict()
+        result = self._results.get(result_id)
+        if result is None:
+            self._lookup_misses += 1
+            return None
+        self._results.move_to_end(result_id)
+        self._expires[result_id] = time.monotonic() + self._ttl
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "results": len(self._results),
+            "total_rows": self._total_rows,
+            "max_entries": self._max_entries,
+            "max_total_rows": self._max_total_rows,
+            "lookups": self._lookups,
+            "lookup_misses": self._lookup_misses,
+            "evictions": self._evictions,
+        }
+
+    def _evict(self):
+        now = time.monotonic()
+        for result_id in [result_id for result_id, expires in self._expires.items() if expires < now]:
+            self._drop(result_id)
+        while len(self._results) > 1 and (
+                len(self._results) > self._max_entries or self._total_rows > self._max_total_rows
+        ):
+            self._drop(next(iter(self._results)))
+
+    def _drop(self, result_id: str):
+        result = self._results.pop(result_id)
+        del self._expires[result_id]
+        self._total_rows -= result.row_count
+        self._evictions += 1
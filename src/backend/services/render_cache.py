@@ -0,0 +1,179 @@
+import ast
+import asyncio
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+from configs.config import RenderCacheConfig, RENDER_CACHE_CONFIG
+from configs.logger import LOGGER
+
+
+def normalize_code(code: str) -> str:
+    """
+    Canonical form of plot code: its AST, so formatting, comments and quote style do not
+    change the key. Code that does not parse is keyed on its text with line endings and
+    trailing whitespace normalized.
+    """
+    try:
+        return ast.dump(ast.parse(code))
+    except SyntaxError:
+        return "\n".join(line.rstrip() for line in code.strip().splitlines())
+
+
+class RenderCache:
+    """
+    Content-addressed cache of rendered images.
+
+    Keys hash the normalized code, the render options and the ids of the query results
+    the code reads (results are immutable, so the id stands for the data). Images are kept
+    in an in-memory LRU bounded by total bytes and, when `directory` is set, in an on-disk
+    tier bounded the same way, which survives restarts. Concurrent requests for the same
+    key share one render.
+    """
+
+    def __init__(self, config: RenderCacheConfig):
+        self._enabled = config.enabled
+        self._max_bytes = config.max_bytes
+        self._directory = config.directory or None
+        self._max_disk_bytes = config.max_disk_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._bytes = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._shared = 0
+        self._misses = 0
+        self._evictions = 0
+
+        if self._directory:
+            os.makedirs(self._directory, exist_ok=True)
+
+    @staticmethod
+    def key(code: str, options: dict, data: Dict[str, str]) -> str:
+        material = json.dumps(
+            {"code": normalize_code(code), "options": options, "data": data},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    async def get_or_render(self, key: str, render: Callable[[], Awaitable[bytes]]) -> bytes:
+        if not self._enabled:
+            return await render()
+
+        image = self._entries.get(key)
+        if image is not None:
+            self._entries.move_to_end(key)
+            self._memory_hits += 1
+            return image
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self._shared += 1
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            image = await self._read_disk(key)
+            if image is not None:
+                self._disk_hits += 1
+            else:
+                self._misses += 1
+                image = await render()
+                await self._write_disk(key, image)
+            self._remember(key, image)
+            future.set_result(image)
+            return image
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; don't report it again as never retrieved.
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    def stats(self) -> dict:
+        lookups = self._memory_hits + self._disk_hits + self._shared + self._misses
+        hits = lookups - self._misses
+        return {
+            "enabled": self._enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "disk": self._directory is not None,
+            "memory_hits": self._memory_hits,
+            "disk_hits": self._disk_hits,
+            "shared_renders": self._shared,
+            "misses": self._misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evictions": self._evictions,
+        }
+
+    def _remember(self, key: str, image: bytes):
+        if len(image) > self._max_bytes:
+            return
+        self._entries[key] = image
+        self._bytes += len(image)
+        while self._bytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._evictions += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.img")
+
+    async def _read_disk(self, key: str) -> Optional[bytes]:
+        if self._directory is None:
+            return None
+        return await asyncio.to_thread(self._read_file, self._path(key))
+
+    async def _write_disk(self, key: str, image: bytes):
+        if self._directory is None:
+            return
+        await asyncio.to_thread(self._write_file, self._path(key), image)
+
+    @staticmethod
+    def _read_file(path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as file:
+                image = file.read()
+            # Mark as recently used for the disk eviction order.
+            os.utime(path)
+            return image
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            LOGGER.warning(f"Could not read cached render {path}: {e}")
+            return None
+
+    def _write_file(self, path: str, image: bytes):
+        try:
+            with open(f"{path}.tmp", "wb") as file:
+                file.write(image)
+            os.replace(f"{path}.tmp", path)
+            self._prune_disk()
+        except OSError as e:
+            LOGGER.warning(f"Could not write cached render {path}: {e}")
+
+    def _prune_disk(self):
+        files = []
+        for entry in os.scandir(self._directory):
+            if entry.is_file() and entry.name.endswith(".img"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self._max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+
+RENDER_CACHE = RenderCache(RENDER_CACHE_CONFIG)
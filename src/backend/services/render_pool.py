@@ -0,0 +1,236 @@
+import asyncio
+import pickle
+import sys
+import time
+from typing import List, Optional
+
+from configs.config import RenderConfig, RENDER_CONFIG
+from configs.logger import LOGGER
+from exceptions.render_exceptions import (
+    RenderFailedException,
+    RenderQueueFullException,
+    RenderTimeoutException,
+)
+from services import render_worker
+from services.metrics import track_dependency
+
+
+class _RenderWorker:
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.jobs = 0
+
+    async def send(self, message):
+        payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+        self.process.stdin.write(render_worker.HEADER.pack(len(payload)) + payload)
+        await self.process.stdin.drain()
+
+    async def receive(self):
+        header = await self.process.stdout.readexactly(render_worker.HEADER.size)
+        payload = await self.process.stdout.readexactly(render_worker.HEADER.unpack(header)[0])
+        return pickle.loads(payload)
+
+    async def close(self, timeout: float = 0):
+        if self.process.returncode is None and timeout > 0:
+            self.process.stdin.close()
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout)
+                return
+            except asyncio.TimeoutError:
+                pass
+        if self.process.returncode is None:
+            self.process.kill()
+            await self.process.wait()
+
+
+class RenderPool:
+    """
+    Pool of worker processes that run plot code off the event loop.
+
+    Workers are started with matplotlib, numpy and pandas already imported and render one
+    job at a time, so pyplot's global state is never shared between renders. Each worker
+    runs under an address-space limit, is killed and replaced if a job exceeds `timeout`
+    or crashes, and is recycled after `max_jobs_per_worker` jobs. Workers that fail to
+    start are retried with exponential backoff until the pool is back at `workers`. At most
+    `max_queue` jobs may wait for a free worker; further jobs are rejected, and a job that
+    waits longer than `timeout` for a worker fails.
+    """
+
+    def __init__(self, config: RenderConfig):
+        self._config = config
+        self._idle: Optional[asyncio.Queue] = None
+        self._workers: List[_RenderWorker] = []
+        self._start_lock = asyncio.Lock()
+        self._waiting = 0
+        self._spawning = 0
+        self._tasks = set()
+
+        self._jobs = 0
+        self._failures = 0
+        self._timeouts = 0
+        self._rejected = 0
+        self._crashes = 0
+        self._recycled = 0
+        self._spawn_failures = 0
+        self._render_total = 0.0
+        self._wait_total = 0.0
+
+    async def start(self):
+        async with self._start_lock:
+            if self._idle is None:
+                self._idle = asyncio.Queue()
+                self._spawning += self._config.workers
+                started = await asyncio.gather(*(self._spawn() for _ in range(self._config.workers)))
+                self._spawning -= self._config.workers
+                if not all(started):
+                    LOGGER.warning(f"Only {sum(started)} of {self._config.workers} render workers started")
+            self._top_up()
+
+    async def stop(self):
+        self._idle = None
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.gather(*(worker.close(timeout=1) for worker in self._workers))
+        self._workers.clear()
+
+    async def render(self, job: dict) -> bytes:
+        """
+        Run a render job (`code`, optional `frames` and `options`) and return the image bytes.
+        """
+        async with track_dependency("render", job.get("options", {}).get("format", "png")):
+            return await self._render(job)
+
+    async def _render(self, job: dict) -> bytes:
+        if self._idle is None:
+            await self.start()
+        self._top_up()
+        started = time.perf_counter()
+        try:
+            worker = self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            worker = await self._wait_for_worker()
+        self._wait_total += time.perf_counter() - started
+
+        self._jobs += 1
+        rendered = time.perf_counter()
+        try:
+            await worker.send(job)
+            status, result = await asyncio.wait_for(worker.receive(), self._config.timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            self._replace(worker)
+            raise RenderTimeoutException(f"Rendering took longer than {self._config.timeout:.0f}s")
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            self._crashes += 1
+            self._replace(worker)
+            raise RenderFailedException(f"Render worker exited unexpectedly (out of memory?): {e}")
+        except asyncio.CancelledError:
+            # The worker may still be busy with the job or have a reply pending.
+            self._replace(worker)
+            raise
+        finally:
+            self._render_total += time.perf_counter() - rendered
+
+        worker.jobs += 1
+        if worker.jobs >= self._config.max_jobs_per_worker:
+            self._recycled += 1
+            self._replace(worker, graceful=True)
+        else:
+            self._idle.put_nowait(worker)
+
+        if status != "ok":
+            self._failures += 1
+            raise RenderFailedException(result)
+        return result
+
+    async def _wait_for_worker(self) -> _RenderWorker:
+        if self._waiting >= self._config.max_queue:
+            self._rejected += 1
+            raise RenderQueueFullException("Too many plots are being rendered, try again later")
+        self._waiting += 1
+        try:
+            return await asyncio.wait_for(self._idle.get(), self._config.timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise RenderTimeoutException("No render worker became available in time")
+        finally:
+            self._waiting -= 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "waiting": self._waiting,
+            "jobs": self._jobs,
+            "failures": self._failures,
+            "timeouts": self._timeouts,
+            "crashes": self._crashes,
+            "rejected": self._rejected,
+            "recycled": self._recycled,
+            "spawning": self._spawning,
+            "spawn_failures": self._spawn_failures,
+            "wait_avg_ms": 1000 * self._wait_total / self._jobs if self._jobs else 0.0,
+            "render_avg_ms": 1000 * self._render_total / self._jobs if self._jobs else 0.0,
+        }
+
+    async def _spawn(self) -> bool:
+        # Started as a script rather than through multiprocessing, so workers do not
+        # re-import the application's __main__ module.
+        try:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, render_worker.__file__, str(self._config.memory_limit_mb),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            LOGGER.error(f"Render worker failed to start: {e!r}")
+            self._spawn_failures += 1
+            return False
+        worker = _RenderWorker(process)
+        try:
+            await asyncio.wait_for(worker.receive(), self._config.startup_timeout)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            LOGGER.error(f"Render worker failed to start: {e!r}")
+            self._spawn_failures += 1
+            await worker.close()
+            return False
+        if self._idle is None:
+            # The pool was stopped while the worker was starting.
+            await worker.close()
+            return True
+        self._workers.append(worker)
+        self._idle.put_nowait(worker)
+        return True
+
+    async def _spawn_with_retry(self):
+        delay = self._config.spawn_retry_backoff
+        try:
+            while self._idle is not None and not await self._spawn():
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self._config.spawn_retry_max_backoff)
+        finally:
+            self._spawning -= 1
+
+    def _top_up(self):
+        """Start replacement workers for any the pool is short of."""
+        if self._idle is None:
+            return
+        for _ in range(self._config.workers - len(self._workers) - self._spawning):
+            self._spawning += 1
+            self._background(self._spawn_with_retry())
+
+    def _replace(self, worker: _RenderWorker, graceful: bool = False):
+        self._workers.remove(worker)
+        self._background(worker.close(timeout=5 if graceful else 0))
+        self._top_up()
+
+    def _background(self, coroutine) -> asyncio.Task:
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+
+RENDER_POOL = RenderPool(RENDER_CONFIG)
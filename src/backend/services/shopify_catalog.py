@@ -0,0 +1,130 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from configs.config import CatalogConfig, CATALOG_CONFIG
+from configs.logger import LOGGER
+from schemas.shopify import ShopifyProduct
+from services.product_search import ProductSearchIndex
+from services.shopify_service import get_shopify_data, get_shopify_records
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of the product catalog with lookup indexes built once per refresh.
+    """
+
+    def __init__(self, products: List[ShopifyProduct], version: int):
+        self.products = products
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.by_id: Dict[int, ShopifyProduct] = {}
+        self.by_title: Dict[str, List[ShopifyProduct]] = defaultdict(list)
+        self.by_sku: Dict[str, List[ShopifyProduct]] = defaultdict(list)
+        self.by_vendor: Dict[str, List[ShopifyProduct]] = defaultdict(list)
+
+        for product in products:
+            if product.id is not None:
+                self.by_id[product.id] = product
+            if product.title:
+                self.by_title[product.title.lower()].append(product)
+            if product.vendor:
+                self.by_vendor[product.vendor.lower()].append(product)
+            for sku in {variant.sku.lower() for variant in product.variants if variant.sku}:
+                self.by_sku[sku].append(product)
+
+        self.search_index = ProductSearchIndex(products)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+
+class ShopifyCatalog:
+    """
+    In-process cache of the Shopify catalog fetched from the n8n webhooks.
+
+    A snapshot younger than `ttl` is served as is. Between `ttl` and `ttl + stale_ttl` the
+    stale snapshot is served while a single background refresh runs. Older (or missing)
+    snapshots are refreshed inline; concurrent callers share one in-flight refresh.
+    """
+
+    def __init__(self, loader: Callable[[], Awaitable[List[ShopifyProduct]]], config: CatalogConfig):
+        self._loader = loader
+        self._ttl = config.ttl
+        self._stale_ttl = config.stale_ttl
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._version = 0
+
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._refresh_errors = 0
+
+    async def snapshot(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.age < self._ttl:
+            self._hits += 1
+            return snapshot
+        if snapshot is not None and snapshot.age < self._ttl + self._stale_ttl:
+            self._stale_hits += 1
+            self._start_refresh()
+            return snapshot
+        self._misses += 1
+        return await asyncio.shield(self._start_refresh())
+
+    async def products(self) -> List[ShopifyProduct]:
+        return (await self.snapshot()).products
+
+    def start(self):
+        """Warm the cache in the background so the first request does not pay for it."""
+        self._start_refresh()
+
+    async def stop(self):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+
+    def invalidate(self):
+        self._snapshot = None
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "products": len(snapshot.products) if snapshot else 0,
+            "version": snapshot.version if snapshot else None,
+            "age_seconds": snapshot.age if snapshot else None,
+            "hits": self._hits,
+            "stale_hits": self._stale_hits,
+            "misses": self._misses,
+            "refreshes": self._refreshes,
+            "refresh_errors": self._refresh_errors,
+        }
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+            # Background refreshes may have no awaiter; failures are already logged.
+            self._refresh_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return self._refresh_task
+
+    async def _refresh(self) -> CatalogSnapshot:
+        try:
+            products = await self._loader()
+        except Exception as e:
+            self._refresh_errors += 1
+            LOGGER.error(f"Shopify catalog refresh failed: {e}")
+            raise
+        self._version += 1
+        self._refreshes += 1
+        self._snapshot = CatalogSnapshot(products, self._version)
+        LOGGER.debug(f"Shopify catalog refreshed: {len(products)} products")
+        return self._snapshot
+
+
+SHOPIFY_CATALOG = ShopifyCatalog(
+    get_shopify_records if CATALOG_CONFIG.storage == "records" else get_shopify_data,
+    CATALOG_CONFIG,
+)
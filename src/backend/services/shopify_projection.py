@@ -0,0 +1,88 @@
+import base64
+import dataclasses
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from schemas.shopify import ShopifyProduct, ShopifySchema, ShopifyVariant
+
+COMPACT_FIELDS = "id,title,vendor,product_type,status,tags,variants.id,variants.sku,variants.price,variants.inventory_quantity"
+
+
+class ProjectionError(ValueError):
+    pass
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Turn `id,title,variants.sku` into a pydantic `include` tree.
+
+    Returns:
+        Optional[Dict[str, Any]]: Include tree for ShopifySchema.model_dump, None for all fields.
+    """
+    if not fields:
+        return None
+
+    include: Dict[str, Any] = {}
+    variant_fields = set()
+    for field in (part.strip() for part in fields.split(",")):
+        if not field:
+            continue
+        if field.startswith("variants."):
+            variant_field = field[len("variants."):]
+            if variant_field not in ShopifyVariant.model_fields:
+                raise ProjectionError(f"Unknown variant field: {variant_field}")
+            variant_fields.add(variant_field)
+        elif field in ShopifySchema.model_fields:
+            include[field] = True
+        else:
+            raise ProjectionError(f"Unknown product field: {field}")
+
+    if variant_fields and "variants" not in include:
+        include["variants"] = {"__all__": variant_fields}
+    return include
+
+
+def _dump_record(record, include: Optional[Dict[str, Any]], exclude_none: bool) -> dict:
+    data = {}
+    for field in dataclasses.fields(record):
+        if include is not None and field.name not in include:
+            continue
+        value = getattr(record, field.name)
+        if field.name == "variants":
+            variant_include = include["variants"]["__all__"] if include and include["variants"] is not True else None
+            value = [_dump_record(variant, variant_include, exclude_none) for variant in value]
+        if value is None and exclude_none:
+            continue
+        data[field.name] = value
+    return data
+
+
+def project(products: List[ShopifyProduct], include: Optional[Dict[str, Any]], exclude_none: bool) -> List[dict]:
+    if products and dataclasses.is_dataclass(products[0]):
+        return [_dump_record(product, include, exclude_none) for product in products]
+    return [product.model_dump(include=include, exclude_none=exclude_none) for product in products]
+
+
+def encode_cursor(offset: int, version: int) -> str:
+    """
+    Encode a page position together with the catalog snapshot version it points into.
+    """
+    cursor = {"offset": offset, "version": version}
+    return base64.urlsafe_b64encode(json.dumps(cursor).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[int, Optional[int]]:
+    """
+    Returns:
+        Tuple[int, Optional[int]]: (offset, catalog version), (0, None) for the first page.
+    """
+    if not cursor:
+        return 0, None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        offset, version = data["offset"], data["version"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ProjectionError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(offset, int) or offset < 0 or not isinstance(version, int):
+        raise ProjectionError(f"Invalid cursor: {cursor}")
+    return offset, version
@@ -1,25 +1,34 @@
 import asyncio
 from typing import List
 
-import aiohttp
+from pydantic import TypeAdapter
 
-from configs.config import N8N_CONFIG
-from schemas.shopify import ShopifySchema
+from configs.config import HTTP_CLIENT_CONFIG, N8N_CONFIG
+from schemas.shopify import ShopifyProductRecord, ShopifySchema
+from services.http_client import HttpClient
 
+N8N_HTTP_CLIENT = HttpClient(HTTP_CLIENT_CONFIG, dependency="n8n")
 
-async def fetch_products(session: aiohttp.ClientSession, url: str) -> List[ShopifySchema]:
-    async with session.post(url) as response:
-        response.raise_for_status()
-        data = await response.json()
-        return [ShopifySchema(**product) for product in data]
+# Validating the whole payload in one pass over the raw bytes avoids building an
+# intermediate Python object tree and calling a model constructor per product.
+PRODUCTS_ADAPTER = TypeAdapter(List[ShopifySchema])
+PRODUCT_RECORDS_ADAPTER = TypeAdapter(List[ShopifyProductRecord])
 
 
-async def get_shopify_data_async() -> List[ShopifySchema]:
-    async with aiohttp.ClientSession() as session:
-        tasks = [fetch_products(session, url) for url in N8N_CONFIG.url]
-        results = await asyncio.gather(*tasks)
-        return [product for sublist in results for product in sublist]
+async def fetch_products(url: str, adapter: TypeAdapter = PRODUCTS_ADAPTER) -> list:
+    raw = await N8N_HTTP_CLIENT.post_bytes(url)
+    return adapter.validate_json(raw)
+
+
+async def get_shopify_data_async(adapter: TypeAdapter = PRODUCTS_ADAPTER) -> list:
+    tasks = [fetch_products(url, adapter) for url in N8N_CONFIG.url]
+    results = await asyncio.gather(*tasks)
+    return [product for sublist in results for product in sublist]
 
 
 async def get_shopify_data() -> List[ShopifySchema]:
     return await get_shopify_data_async()
+
+
+async def get_shopify_records() -> List[ShopifyProductRecord]:
+    return await get_shopify_data_async(PRODUCT_RECORDS_ADAPTER)
@@ -0,0 +1,106 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+class _RangeIndex:
+    """Positions sorted by a numeric field, for range lookups with bisect."""
+
+    def __init__(self, items: List[Dict[str, Any]], field: str):
+        pairs = sorted(
+            (value, position) for position, item in enumerate(items)
+            if (value := _number(item.get(field))) is not None
+        )
+        self._values = [value for value, _ in pairs]
+        self._positions = [position for _, position in pairs]
+
+    def between(self, low: Optional[float], high: Optional[float]) -> List[int]:
+        start = bisect_left(self._values, low) if low is not None else 0
+        end = bisect_right(self._values, high) if high is not None else len(self._values)
+        return self._positions[start:end]
+
+
+class SupplierIndex:
+    """
+    Secondary indexes over one version of the supplier snapshot.
+
+    Equality filters use hash indexes, cost and lead time ranges use sorted arrays and the
+    below-reorder-point set is precomputed. The most selective filters are applied first
+    and only the requested page of matches is sorted.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], version: int):
+        self.items = items
+        self.version = version
+        self.by_supplier_id: Dict[str, List[int]] = defaultdict(list)
+        self.by_product_id: Dict[str, List[int]] = defaultdict(list)
+        self.below_reorder_point: List[int] = []
+
+        for position, item in enumerate(items):
+            self.by_supplier_id[str(item.get("supplier_id"))].append(position)
+            self.by_product_id[str(item.get("product_id"))].append(position)
+            stock, reorder_point = _number(item.get("current_stock")), _number(item.get("reorder_point"))
+            if stock is not None and reorder_point is not None and stock < reorder_point:
+                self.below_reorder_point.append(position)
+
+        self.by_lead_time = _RangeIndex(items, "lead_time_days")
+        self.by_unit_cost = _RangeIndex(items, "unit_cost")
+
+    def query(
+            self,
+            supplier_id: Optional[str] = None,
+            product_id: Optional[str] = None,
+            below_reorder_point: bool = False,
+            min_lead_time_days: Optional[int] = None,
+            max_lead_time_days: Optional[int] = None,
+            min_unit_cost: Optional[float] = None,
+            max_unit_cost: Optional[float] = None,
+            sort_by: Optional[str] = None,
+            descending: bool = False,
+            limit: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Return up to `limit` matching items and the total number of matches."""
+        filters: List[List[int]] = []
+        if supplier_id is not None:
+            filters.append(self.by_supplier_id.get(supplier_id, []))
+        if product_id is not None:
+            filters.append(self.by_product_id.get(product_id, []))
+        if below_reorder_point:
+            filters.append(self.below_reorder_point)
+        if min_lead_time_days is not None or max_lead_time_days is not None:
+            filters.append(self.by_lead_time.between(min_lead_time_days, max_lead_time_days))
+        if min_unit_cost is not None or max_unit_cost is not None:
+            filters.append(self.by_unit_cost.between(min_unit_cost, max_unit_cost))
+
+        matches = sorted(self._intersect(filters)) if filters else range(len(self.items))
+        total = len(matches)
+
+        if sort_by is None:
+            positions: Iterable[int] = matches[:limit]
+        elif descending:
+            positions = heapq.nlargest(limit, matches, key=lambda p: self._sort_key(p, sort_by, missing=False))
+        else:
+            positions = heapq.nsmallest(limit, matches, key=lambda p: self._sort_key(p, sort_by, missing=True))
+        return [self.items[position] for position in positions], total
+
+    @staticmethod
+    def _intersect(filters: List[List[int]]) -> Set[int]:
+        filters = sorted(filters, key=len)
+        result = set(filters[0])
+        for positions in filters[1:]:
+            if not result:
+                break
+            result.intersection_update(positions)
+        return result
+
+    def _sort_key(self, position: int, field: str, missing: bool) -> tuple:
+        # Items without the field sort last in both directions.
+        value = self.items[position].get(field)
+        return (missing, 0) if value is None else (not missing, value)
@@ -0,0 +1,234 @@
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from configs.config import AzureCosmosDBConfig, SupplierSyncConfig
+from configs.logger import LOGGER
+from services.metrics import track_dependency
+from services.supplier_index import SupplierIndex
+
+SNAPSHOT_FORMAT = 2
+# Versions of changed ids kept for `changes_since`; older readers get None and rescan.
+CHANGE_LOG_SIZE = 64
+
+
+def _strip_system_properties(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in item.items() if not key.startswith("_")}
+
+
+class SupplierSnapshot:
+    """
+    In-memory copy of the supplier container kept current through the Cosmos change feed.
+
+    One Cosmos client is opened for the app lifetime. The first sync reads the change feed
+    from the beginning; later syncs resume from the continuation token of the previous one,
+    so each sync costs RUs in proportion to what changed rather than to the container size.
+    The items and the token are persisted to `snapshot_path`, so a restart resumes where it
+    left off. The latest-version change feed does not report deletes, so the snapshot is
+    rebuilt from scratch every `full_resync_interval` seconds.
+
+    `client_factory` returns an `azure.cosmos.aio.CosmosClient` or any object with the same
+    `get_database_client(...).get_container_client(...)` and `close()` API, e.g. a stub. The
+    container must expose `client_connection.last_response_headers` like the SDK's does.
+    """
+
+    def __init__(
+            self,
+            client_factory: Callable[[], Any],
+            cosmos_config: AzureCosmosDBConfig,
+            sync_config: SupplierSyncConfig,
+    ):
+        self._client_factory = client_factory
+        self._cosmos_config = cosmos_config
+        self._config = sync_config
+        self._client = None
+        self._container = None
+        self._lock = asyncio.Lock()
+        self._sync_task: Optional[asyncio.Task] = None
+
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._items_list: Optional[List[Dict[str, Any]]] = None
+        self._continuation: Optional[str] = None
+        self._full_synced_at = 0.0
+        self._synced_at: Optional[float] = None
+        self._version = 0
+        # (version, ids changed by the sync that produced it), None for a full rebuild
+        self._change_log: Deque[Tuple[int, Optional[Set[str]]]] = deque(maxlen=CHANGE_LOG_SIZE)
+        self._index: Optional[SupplierIndex] = None
+
+        self._syncs = 0
+        self._full_syncs = 0
+        self._changes = 0
+        self._sync_errors = 0
+        self._request_charge = 0.0
+
+    async def start(self):
+        await asyncio.to_thread(self._load)
+        self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self):
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+            self._container = None
+
+    async def items(self) -> List[Dict[str, Any]]:
+        if self._synced_at is None and not self._items:
+            await self.sync()
+        if self._items_list is None:
+            self._items_list = list(self._items.values())
+        return self._items_list
+
+    async def index(self) -> SupplierIndex:
+        """Secondary indexes over the current items, rebuilt when the snapshot changes."""
+        items = await self.items()
+        if self._index is None or self._index.version != self._version:
+            self._index = SupplierIndex(items, self._version)
+        return self._index
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def changes_since(self, version: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Current state of the items changed after `version`, taken from the change feed.
+
+        Returns None when that cannot be told (a full resync or load happened since, or
+        `version` is older than the change log), in which case the caller has to rescan.
+        """
+        changed: Set[str] = set()
+        expected = version + 1
+        for logged_version, ids in self._change_log:
+            if logged_version <= version:
+                continue
+            if logged_version != expected or ids is None:
+                return None
+            changed |= ids
+            expected += 1
+        if expected != self._version + 1:
+            return None
+        return [self._items[item_id] for item_id in changed if item_id in self._items]
+
+    async def sync(self):
+        """Apply the changes since the last sync, or rebuild the snapshot if a full resync is due."""
+        async with self._lock:
+            self._open()
+            full = self._continuation is None or time.time() - self._full_synced_at > self._config.full_resync_interval
+            charge = 0.0
+
+            def on_response(response_headers, _):
+                nonlocal charge
+                charge += float(response_headers.get("x-ms-request-charge", 0))
+
+            if full:
+                options = {"start_time": "Beginning"}
+                items: Dict[str, Dict[str, Any]] = {}
+            else:
+                options = {"continuation": self._continuation}
+                items = self._items
+
+            changed_ids: Set[str] = set()
+            changes = 0
+            try:
+                async with track_dependency("cosmos", "change_feed"):
+                    async for item in self._container.query_items_change_feed(response_hook=on_response, **options):
+                        items[item["id"]] = _strip_system_properties(item)
+                        changed_ids.add(item["id"])
+                        changes += 1
+            except Exception:
+                self._sync_errors += 1
+                raise
+            finally:
+                self._request_charge += charge
+
+            self._items = items
+            if changes or full:
+                self._items_list = None
+                self._version += 1
+                self._change_log.append((self._version, None if full else changed_ids))
+            # The hook sees the raw etag; the SDK rewrites it into its own continuation
+            # token afterwards and exposes that one on the client connection.
+            continuation = self._container.client_connection.last_response_headers.get("etag")
+            self._continuation = continuation or self._continuation
+            self._synced_at = time.monotonic()
+            self._syncs += 1
+            self._changes += changes
+            if full:
+                self._full_syncs += 1
+                self._full_synced_at = time.time()
+            if changes or full:
+                await asyncio.to_thread(self._persist)
+            LOGGER.debug(f"Supplier snapshot synced ({'full' if full else 'incremental'}): "
+                         f"{changes} changes, {charge:.2f} RU")
+
+    def stats(self) -> dict:
+        return {
+            "items": len(self._items),
+            "version": self._version,
+            "age_seconds": time.monotonic() - self._synced_at if self._synced_at is not None else None,
+            "syncs": self._syncs,
+            "full_syncs": self._full_syncs,
+            "changes": self._changes,
+            "sync_errors": self._sync_errors,
+            "request_charge": self._request_charge,
+        }
+
+    def _open(self):
+        if self._container is None:
+            self._client = self._client_factory()
+            database = self._client.get_database_client(self._cosmos_config.database_name)
+            self._container = database.get_container_client(self._cosmos_config.supplier_container_name)
+
+    async def _sync_loop(self):
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                LOGGER.warning(f"Supplier snapshot sync failed: {e}")
+            await asyncio.sleep(self._config.sync_interval)
+
+    def _load(self):
+        if not os.path.exists(self._config.snapshot_path):
+            return
+        try:
+            with open(self._config.snapshot_path, encoding="utf-8") as file:
+                state = json.load(file)
+        except (OSError, ValueError) as e:
+            LOGGER.warning(f"Ignoring unreadable supplier snapshot {self._config.snapshot_path}: {e}")
+            return
+        if state.get("format") != SNAPSHOT_FORMAT:
+            # Older files hold a raw etag rather than an SDK continuation token.
+            LOGGER.info(f"Ignoring supplier snapshot {self._config.snapshot_path} in an old format")
+            return
+        self._items = {item["id"]: item for item in state["items"]}
+        self._continuation = state["continuation"]
+        self._full_synced_at = state["full_synced_at"]
+        self._version += 1
+        self._change_log.append((self._version, None))
+        LOGGER.info(f"Loaded supplier snapshot with {len(self._items)} items")
+
+    def _persist(self):
+        state = {
+            "format": SNAPSHOT_FORMAT,
+            "continuation": self._continuation,
+            "full_synced_at": self._full_synced_at,
+            "items": list(self._items.values()),
+        }
+        path = self._config.snapshot_path
+        try:
+            with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+                json.dump(state, file, default=str)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            LOGGER.warning(f"Could not persist supplier snapshot to {path}: {e}")
@@ -0,0 +1,6 @@
+import os
+
+# Modules that build the LLM client or the n8n service read these at import time.
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "test")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://localhost")
+os.environ.setdefault("N8N_URL", '["http://localhost/hook"]')
@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+from handlers import chat_connection_handler
+from handlers.chat_connection_handler import ChatConnectionHandler
+from schemas.websocket import BotResponse
+
+
+class _WebSocket:
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.sent = []
+        self.closed = False
+
+    def push(self, frame):
+        text = frame if isinstance(frame, str) else json.dumps(frame)
+        self.incoming.put_nowait({"type": "websocket.receive", "text": text})
+
+    def disconnect(self):
+        self.incoming.put_nowait({"type": "websocket.disconnect", "code": 1000})
+
+    async def receive(self):
+        return await self.incoming.get()
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+    async def close(self):
+        self.closed = True
+
+    def types(self):
+        return [message["type"] for message in self.sent]
+
+
+class _SlowHandler:
+    """Sleeps for `text` seconds, then answers."""
+    cancelled = []
+
+    def __init__(self, user_request, connection):
+        self.user_request = user_request
+
+    async def handle_request(self):
+        try:
+            await asyncio.sleep(float(self.user_request.text))
+        except asyncio.CancelledError:
+            self.cancelled.append(self.user_request.session_id)
+            raise
+        return BotResponse(text="done", session_id=self.user_request.session_id)
+
+
+async def _until(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+def _connect(monkeypatch, max_pending=8, max_concurrent_turns=2):
+    monkeypatch.setattr(chat_connection_handler, "AgentChatHandler", _SlowHandler)
+    websocket = _WebSocket()
+    handler = ChatConnectionHandler(websocket, max_pending=max_pending, max_concurrent_turns=max_concurrent_turns)
+    return websocket, asyncio.create_task(handler.run())
+
+
+def test_ping_is_answered_during_a_long_turn(monkeypatch):
+    async def run():
+        websocket, connection = _connect(monkeypatch)
+        websocket.push({"text": "0.5", "sessionId": "a"})
+        websocket.push({"type": "ping"})
+        await _until(lambda: "pong" in websocket.types())
+        assert "final" not in websocket.types()
+        await _until(lambda: "final" in websocket.types())
+        websocket.disconnect()
+        await connection
+
+    asyncio.run(run())
+
+
+def test_cancel_stops_the_running_turn(monkeypatch):
+    _SlowHandler.cancelled.clear()
+
+    async def run():
+        websocket, connection = _connect(monkeypatch)
+        websocket.push({"text": "5", "sessionId": "a"})
+        websocket.push({"text": "5", "sessionId": "a"})
+        await asyncio.sleep(0.05)
+        websocket.push({"type": "cancel", "sessionId": "a"})
+        await _until(lambda: _SlowHandler.cancelled == ["a"])
+        assert websocket.types() == ["cancelled"]
+        websocket.push({"text": "0", "sessionId": "a"})
+        await _until(lambda: "final" in websocket.types())
+        websocket.disconnect()
+        await connection
+
+    asyncio.run(run())
+
+
+def test_requests_over_the_pending_limit_are_rejected(monkeypatch):
+    async def run():
+        websocket, connection = _connect(monkeypatch, max_pending=2)
+        for session_id in ("a", "b", "c"):
+            websocket.push({"text": "0.2", "sessionId": session_id})
+        await _until(lambda: websocket.types().count("final") == 2)
+        [error] = [message for message in websocket.sent if message["type"] == "error"]
+        assert error["sessionId"] == "c"
+        websocket.disconnect()
+        await connection
+
+    asyncio.run(run())
+
+
+def test_malformed_frames_do_not_close_the_connection(monkeypatch):
+    async def run():
+        websocket, connection = _connect(monkeypatch)
+        websocket.push({"text": "0.2", "sessionId": "a"})
+        for frame in ("not json", "[1]", '"x"', {"sessionId": "a"}):
+            websocket.push(frame)
+        websocket.push({"type": "ping"})
+        await _until(lambda: "final" in websocket.types())
+        assert websocket.types() == ["error"] * 4 + ["pong", "final"]
+        assert not websocket.closed
+        websocket.disconnect()
+        await connection
+
+    asyncio.run(run())
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from configs.config import CHAT_CONFIG
+from handlers import agent_chat_handler
+from handlers.agent_chat_handler import AgentChatHandler, check_image_delivery
+from handlers.chat_connection_handler import ChatConnectionHandler
+from schemas.websocket import UserRequest
+
+REFERENCE = {"image_id": "img_1", "url": "/images/img_1", "mime_type": "image/png", "size": 3}
+
+
+class _WebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, data):
+        await asyncio.sleep(0)
+        self.sent.append(data)
+
+    async def send_bytes(self, data):
+        await asyncio.sleep(0)
+        self.sent.append(data)
+
+
+def _handler(websocket):
+    connection = ChatConnectionHandler(websocket, max_pending=1, max_concurrent_turns=1)
+    return connection, AgentChatHandler(UserRequest(text="plot", sessionId="s"), connection)
+
+
+def test_binary_image_bytes_follow_their_header(monkeypatch):
+    fetched = []
+
+    async def get_bytes(url, stats_key=None):
+        fetched.append((url, stats_key))
+        return b"png"
+
+    monkeypatch.setattr(CHAT_CONFIG, "image_delivery", "binary")
+    monkeypatch.setattr(agent_chat_handler.IMAGE_HTTP_CLIENT, "get_bytes", get_bytes)
+    websocket = _WebSocket()
+    connection, handler = _handler(websocket)
+
+    async def run():
+        # Other events sent meanwhile must not land between the header and its bytes.
+        await asyncio.gather(
+            handler._send_image(REFERENCE),
+            *(connection.send_json({"type": "token", "text": str(i)}) for i in range(5)),
+        )
+
+    asyncio.run(run())
+
+    index = next(i for i, message in enumerate(websocket.sent) if isinstance(message, dict) and message["type"] == "image")
+    header = websocket.sent[index]
+    assert header["binary"] is True and header["size"] == 3 and header["sessionId"] == "s"
+    assert header["url"] is None
+    assert websocket.sent[index + 1] == b"png"
+    assert fetched[0][0].endswith("/images/img_1")
+    assert fetched[0][1].endswith("/images/{image_id}")
+
+
+def test_url_image_links_to_the_public_url(monkeypatch):
+    monkeypatch.setattr(CHAT_CONFIG, "image_delivery", "url")
+    monkeypatch.setattr(CHAT_CONFIG, "image_public_url", "https://mcp.example.com")
+    websocket = _WebSocket()
+    _, handler = _handler(websocket)
+
+    asyncio.run(handler._send_image(REFERENCE))
+
+    [event] = websocket.sent
+    assert event["url"] == "https://mcp.example.com/images/img_1" and event["binary"] is False
+
+
+def test_url_delivery_requires_an_absolute_public_url(monkeypatch):
+    monkeypatch.setattr(CHAT_CONFIG, "image_delivery", "url")
+    monkeypatch.setattr(CHAT_CONFIG, "image_public_url", "")
+    with pytest.raises(RuntimeError):
+        check_image_delivery()
+
+    monkeypatch.setattr(CHAT_CONFIG, "image_delivery", "binary")
+    check_image_delivery()
@@ -0,0 +1,16 @@
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+from prompts.chat_system_prompt import CHAT_SYSTEM_PROMPT
+
+
+def test_chat_system_prompt_has_no_template_variables():
+    # agent/graph.py loads the prompt as a template: literal braces must be doubled.
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", CHAT_SYSTEM_PROMPT),
+        MessagesPlaceholder("messages"),
+    ])
+
+    messages = prompt.format_messages(messages=[])
+
+    assert prompt.input_variables == ["messages"]
+    assert '{"df": "<result_id>"}' in messages[0].content
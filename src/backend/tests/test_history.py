@@ -0,0 +1,25 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from agent.history import compact_tool_messages
+from configs.config import HistoryConfig
+
+
+def _history(tool_content):
+    return [
+        HumanMessage("first", id="h1"),
+        AIMessage("", id="a1", tool_calls=[{"name": "query", "args": {}, "id": "call1"}]),
+        ToolMessage(tool_content, tool_call_id="call1", id="t1"),
+        HumanMessage("second", id="h2"),
+        AIMessage("", id="a2", tool_calls=[{"name": "query", "args": {}, "id": "call2"}]),
+        ToolMessage("x" * 500, tool_call_id="call2", id="t2"),
+    ]
+
+
+def test_previous_turn_outputs_are_truncated_once():
+    config = HistoryConfig(tool_payload_max_chars=100)
+    [replacement] = compact_tool_messages(_history("y" * 500), config)
+    assert replacement.id == "t1"
+    assert replacement.content.startswith("y" * 100 + "...")
+    assert "truncated 400 characters" in replacement.content
+
+    assert compact_tool_messages(_history(replacement.content), config) == []
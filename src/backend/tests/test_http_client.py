@@ -0,0 +1,37 @@
+import asyncio
+
+from aiohttp import web
+
+from configs.config import HttpClientConfig
+from services.http_client import HttpClient
+
+
+def test_get_bytes_groups_stats_under_stats_key():
+    async def image(request):
+        return web.Response(body=request.match_info["image_id"].encode())
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/images/{image_id}", image)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        client = HttpClient(HttpClientConfig(max_retries=0))
+        await client.start()
+        try:
+            base = f"http://127.0.0.1:{port}"
+            bodies = [
+                await client.get_bytes(f"{base}/images/{image_id}", stats_key=f"{base}/images/{{image_id}}")
+                for image_id in ("a", "b", "c")
+            ]
+            return base, bodies, client.stats()
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    base, bodies, stats = asyncio.run(run())
+    assert bodies == [b"a", b"b", b"c"]
+    assert list(stats) == [f"{base}/images/{{image_id}}"]
+    assert stats[f"{base}/images/{{image_id}}"]["requests"] == 3
@@ -0,0 +1,40 @@
+import time
+
+from configs.config import ImageStoreConfig
+from services.image_store import ImageStore
+
+
+def test_same_bytes_get_the_same_id():
+    store = ImageStore(ImageStoreConfig(ttl=60, max_bytes=100))
+    first = store.put(b"png-bytes", "image/png")
+    second = store.put(b"png-bytes", "image/png")
+
+    assert second is first
+    assert first.image_id.startswith("img_")
+    assert store.get(first.image_id).data == b"png-bytes"
+    assert store.stats()["stored"] == 1
+
+
+def test_least_recently_used_images_are_dropped_over_the_byte_budget():
+    store = ImageStore(ImageStoreConfig(ttl=60, max_bytes=10))
+    a = store.put(b"aaaa", "image/png")
+    b = store.put(b"bbbb", "image/png")
+    store.get(a.image_id)
+    c = store.put(b"cccc", "image/png")
+
+    assert store.get(b.image_id) is None
+    assert store.get(a.image_id) is a and store.get(c.image_id) is c
+
+    # An image larger than the whole budget is still kept, as the only one.
+    big = store.put(b"x" * 20, "image/png")
+    assert store.get(big.image_id) is big
+    assert store.stats()["images"] == 1
+
+
+def test_images_expire_after_ttl():
+    store = ImageStore(ImageStoreConfig(ttl=0.05, max_bytes=100))
+    image = store.put(b"png-bytes", "image/png")
+    time.sleep(0.1)
+
+    assert store.get(image.image_id) is None
+    assert store.stats()["not_found"] == 1
@@ -0,0 +1,77 @@
+import asyncio
+
+from configs.config import InventoryConfig
+from schemas.shopify import ShopifySchema, ShopifyVariant
+from services.inventory_view import InventoryView
+
+
+class _Catalog:
+    def __init__(self, products):
+        self.products = products
+        self.version = 1
+
+    async def snapshot(self):
+        return self
+
+
+class _Suppliers:
+    def __init__(self, items):
+        self.items_by_id = {item["id"]: item for item in items}
+        self.version = 1
+        self.changed = None
+
+    async def items(self):
+        return list(self.items_by_id.values())
+
+    def update(self, item):
+        self.items_by_id[item["id"]] = item
+        self.version += 1
+        self.changed = [item]
+
+    def changes_since(self, version):
+        return self.changed if version == self.version - 1 else None
+
+
+def _product(product_id, sku, stock):
+    return ShopifySchema(id=product_id, title=f"p{product_id}",
+                         variants=[ShopifyVariant(sku=sku, inventory_quantity=stock)])
+
+
+def test_only_touched_rows_are_rebuilt():
+    catalog = _Catalog([_product(1, "A", 10), _product(2, "B", 0), _product(3, "C", 5)])
+    suppliers = _Suppliers([
+        {"id": "s1", "product_id": "a", "lead_time_days": 7},
+        {"id": "s2", "product_id": "2", "lead_time_days": 3},
+    ])
+    sales = [("1", None, 30), (None, "c", 60)]
+
+    async def load_sales(_):
+        return list(sales)
+
+    view = InventoryView(catalog, suppliers, load_sales, InventoryConfig(sales_window_days=30, sales_ttl=0))
+
+    async def run():
+        first = {item.product_id: item for item in await view.items()}
+        assert first["1"].units_sold == 30 and first["1"].min_lead_time_days == 7
+        assert first["3"].units_sold == 60 and first["3"].days_of_cover == 2.5
+
+        # The sales refresh returns the same totals: nothing is rebuilt.
+        assert await view.items() == list(first.values())
+        assert view.stats()["rows_rebuilt"] == 3
+
+        suppliers.update({"id": "s1", "product_id": "3", "lead_time_days": 5})
+        second = {item.product_id: item for item in await view.items()}
+        assert second["2"] is first["2"]
+        assert second["1"].min_lead_time_days is None
+        assert second["3"].min_lead_time_days == 5 and second["3"].needs_reorder
+
+        sales.append(("2", None, 3))
+        catalog.products = [_product(1, "A", 10), _product(2, "B", 4)]
+        catalog.version += 1
+        third = {item.product_id: item for item in await view.items()}
+        assert list(third) == ["1", "2"]
+        assert third["1"] is second["1"]
+        assert third["2"].stock == 4 and third["2"].units_sold == 3
+        assert view.stats()["rows_rebuilt"] == 3 + 2 + 2
+
+    asyncio.run(run())
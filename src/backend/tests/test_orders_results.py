@@ -0,0 +1,75 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from configs.config import ResultStoreConfig
+from services import cosmos_db_service
+from services.query_results import QueryResultStore, StoredResult
+
+
+def test_query_cache_holds_ids_and_refetches_evicted_results(monkeypatch):
+    executed = []
+
+    @asynccontextmanager
+    async def cursor(query, *args, prefetch):
+        executed.append(query)
+
+        async def rows():
+            for i in range(3):
+                yield {"order_id": i}
+        yield rows()
+
+    monkeypatch.setattr(cosmos_db_service.ORDERS_DB_POOL, "cursor", cursor)
+    store = QueryResultStore(ResultStoreConfig(ttl=60, max_entries=10, max_total_rows=100))
+    monkeypatch.setattr(cosmos_db_service, "ORDERS_RESULT_STORE", store)
+    cosmos_db_service.ORDERS_QUERY_CACHE.invalidate()
+
+    async def fetch():
+        return await cosmos_db_service.fetch_orders_result("select * from orders_data", 10)
+
+    first = asyncio.run(fetch())
+    second = asyncio.run(fetch())
+    assert second is first
+    assert len(executed) == 1
+    assert cosmos_db_service.ORDERS_QUERY_CACHE.get(
+        cosmos_db_service.ORDERS_QUERY_CACHE.key("select * from orders_data", "result", 10)
+    ) == first.result_id
+
+    store._drop(first.result_id)
+    third = asyncio.run(fetch())
+    assert third.result_id != first.result_id
+    assert third.row_count == 3
+    assert len(executed) == 2
+
+
+def test_store_keeps_a_new_result_larger_than_the_row_budget():
+    store = QueryResultStore(ResultStoreConfig(ttl=60, max_entries=10, max_total_rows=5))
+    small = store.put(StoredResult("q1", {"a": [1, 2]}, 2, False))
+    large = store.put(StoredResult("q2", {"a": list(range(8))}, 8, False))
+
+    assert store.get(large.result_id) is large
+    assert store.get(small.result_id) is None
+
+
+def test_empty_result_keeps_column_names(monkeypatch):
+    class _Attribute:
+        def __init__(self, name):
+            self.name = name
+
+    @asynccontextmanager
+    async def cursor(query, *args, prefetch):
+        async def rows():
+            return
+            yield
+        yield rows()
+
+    async def attributes(query):
+        return (_Attribute("order_id"), _Attribute("sku"))
+
+    monkeypatch.setattr(cosmos_db_service.ORDERS_DB_POOL, "cursor", cursor)
+    monkeypatch.setattr(cosmos_db_service.ORDERS_DB_POOL, "attributes", attributes)
+    cosmos_db_service.ORDERS_QUERY_CACHE.invalidate()
+
+    result = asyncio.run(cosmos_db_service.fetch_orders_result("select order_id, sku from orders_data where false", 10))
+
+    assert result.row_count == 0
+    assert result.column_names == ["order_id", "sku"]
@@ -0,0 +1,40 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+from configs.config import POSTGRESQL_CONFIG
+from services import cosmos_db_service
+
+
+def _stream(monkeypatch, total_rows, max_rows=None, export=False):
+    @asynccontextmanager
+    async def cursor(query, *args, prefetch):
+        async def rows():
+            for i in range(total_rows):
+                yield {"order_id": i}
+        yield rows()
+
+    monkeypatch.setattr(cosmos_db_service.ORDERS_DB_POOL, "cursor", cursor)
+
+    async def collect():
+        return [json.loads(line) async for line in cosmos_db_service.stream_orders_container("select 1", max_rows, export)]
+
+    return asyncio.run(collect())
+
+
+def test_stream_is_capped_without_max_rows(monkeypatch):
+    monkeypatch.setattr(POSTGRESQL_CONFIG, "query_default_rows", 5)
+
+    lines = _stream(monkeypatch, total_rows=20)
+
+    assert len(lines) == 6
+    assert lines[-1] == {"_meta": {"row_count": 5, "truncated": True}}
+
+
+def test_tool_stream_gets_the_query_cap_not_the_export_cap(monkeypatch):
+    monkeypatch.setattr(POSTGRESQL_CONFIG, "query_max_rows", 5)
+    monkeypatch.setattr(POSTGRESQL_CONFIG, "stream_max_rows", 15)
+
+    assert _stream(monkeypatch, total_rows=20, max_rows=1000)[-1]["_meta"]["row_count"] == 5
+    assert _stream(monkeypatch, total_rows=20, max_rows=1000, export=True)[-1]["_meta"]["row_count"] == 15
+    assert _stream(monkeypatch, total_rows=20, export=True)[-1]["_meta"]["row_count"] == 15
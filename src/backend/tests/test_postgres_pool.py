@@ -0,0 +1,81 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from configs.config import PostgreSQLConfig
+from services import postgres_pool
+from services.postgres_pool import PostgresPool
+
+
+class _Cursor:
+    def __init__(self, rows):
+        self._rows = rows
+
+    async def fetch(self, n, timeout=None):
+        batch, self._rows = self._rows[:n], self._rows[n:]
+        await asyncio.sleep(0.01)
+        return batch
+
+
+class _Connection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.transactions = []
+
+    async def fetch(self, query, *args, timeout=None):
+        return self.rows
+
+    async def cursor(self, query, *args, timeout=None):
+        return _Cursor(self.rows)
+
+    @asynccontextmanager
+    async def transaction(self, readonly):
+        self.transactions.append(readonly)
+        yield
+
+
+def test_cursor_times_only_database_round_trips(monkeypatch):
+    observed = []
+    pool = PostgresPool(PostgreSQLConfig())
+    connection = _Connection(list(range(5)))
+
+    @asynccontextmanager
+    async def acquire():
+        yield connection
+
+    @asynccontextmanager
+    async def track_dependency(dependency, operation):
+        observed.append(operation)
+        yield
+
+    monkeypatch.setattr(pool, "acquire", acquire)
+    monkeypatch.setattr(postgres_pool, "track_dependency", track_dependency)
+
+    async def run():
+        rows = []
+        async with pool.cursor("select 1", prefetch=2) as cursor:
+            async for row in cursor:
+                rows.append(row)
+                await asyncio.sleep(0.1)
+        return rows
+
+    assert asyncio.run(run()) == [0, 1, 2, 3, 4]
+    assert observed == ["cursor_open", "cursor_fetch", "cursor_fetch", "cursor_fetch"]
+    stats = pool.stats()
+    assert stats["queries"] == 1
+    assert stats["query_max_ms"] < 200
+
+
+def test_fetch_can_run_in_a_read_only_transaction(monkeypatch):
+    pool = PostgresPool(PostgreSQLConfig())
+    connection = _Connection([1])
+
+    @asynccontextmanager
+    async def acquire():
+        yield connection
+
+    monkeypatch.setattr(pool, "acquire", acquire)
+
+    assert asyncio.run(pool.fetch("select 1")) == [1]
+    assert connection.transactions == []
+    assert asyncio.run(pool.fetch("select 1", readonly=True)) == [1]
+    assert connection.transactions == [True]
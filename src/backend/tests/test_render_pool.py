@@ -0,0 +1,68 @@
+import asyncio
+
+from configs.config import RenderConfig
+from services.render_pool import RenderPool
+
+
+def _config(**overrides) -> RenderConfig:
+    return RenderConfig(**{"workers": 1, "timeout": 10, "startup_timeout": 30, "spawn_retry_backoff": 0.01, **overrides})
+
+
+async def _wait_for_workers(pool: RenderPool, count: int):
+    for _ in range(600):
+        if pool.stats()["idle"] == count:
+            return
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"pool did not reach {count} idle workers: {pool.stats()}")
+
+
+def test_failed_spawns_are_retried_until_the_pool_is_full():
+    pool = RenderPool(_config())
+    spawn = pool._spawn
+    failures = 2
+
+    async def flaky_spawn():
+        nonlocal failures
+        if failures:
+            failures -= 1
+            pool._spawn_failures += 1
+            return False
+        return await spawn()
+
+    pool._spawn = flaky_spawn
+
+    async def run():
+        await pool.start()
+        try:
+            await _wait_for_workers(pool, 1)
+            return await pool.render({"code": "plt.plot([1, 2])"}), pool.stats()
+        finally:
+            await pool.stop()
+
+    image, stats = asyncio.run(run())
+
+    assert image.startswith(b"\x89PNG")
+    assert stats["spawn_failures"] == 2
+    assert stats["workers"] == 1
+
+
+def test_cancelled_render_replaces_the_worker():
+    pool = RenderPool(_config())
+
+    async def run():
+        await pool.start()
+        try:
+            await _wait_for_workers(pool, 1)
+            job = asyncio.create_task(pool.render({"code": "import time; time.sleep(30)"}))
+            await asyncio.sleep(0.5)
+            job.cancel()
+            await asyncio.gather(job, return_exceptions=True)
+            await _wait_for_workers(pool, 1)
+            return await pool.render({"code": "plt.plot([1, 2])"}), pool.stats()
+        finally:
+            await pool.stop()
+
+    image, stats = asyncio.run(run())
+
+    assert image.startswith(b"\x89PNG")
+    assert stats["workers"] == 1
@@ -0,0 +1,22 @@
+import io
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from PIL import Image
+
+from services.render_worker import _save_options
+
+
+def test_max_width_holds_when_labels_overflow_the_canvas():
+    figure = plt.figure(figsize=(3, 2))
+    plt.plot([1, 2, 3])
+    plt.title("a title that is much wider than the three inch canvas it is drawn on")
+    try:
+        for max_width in (333, 500, 801):
+            buffer = io.BytesIO()
+            figure.savefig(buffer, **_save_options(figure, {"format": "png", "max_width": max_width}))
+            assert Image.open(buffer).size[0] <= max_width
+    finally:
+        plt.close("all")
@@ -0,0 +1,27 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from configs.config import CatalogConfig
+from routers import shopify_router as shopify_router_module
+from schemas.shopify import ShopifySchema
+from services.shopify_catalog import ShopifyCatalog
+
+
+def test_cursor_is_rejected_after_catalog_refresh(monkeypatch):
+    async def loader():
+        return [ShopifySchema(id=i, title=f"product {i}") for i in range(5)]
+
+    catalog = ShopifyCatalog(loader, CatalogConfig(ttl=600, stale_ttl=0))
+    monkeypatch.setattr(shopify_router_module, "SHOPIFY_CATALOG", catalog)
+    app = FastAPI()
+    app.include_router(shopify_router_module.shopify_router, prefix="/shopify")
+
+    with TestClient(app) as client:
+        first = client.get("/shopify/all", params={"limit": 2, "fields": "id"}).json()
+        assert [item["id"] for item in first["items"]] == [0, 1]
+        second = client.get("/shopify/all", params={"limit": 2, "fields": "id", "cursor": first["next_cursor"]})
+        assert [item["id"] for item in second.json()["items"]] == [2, 3]
+
+        catalog.invalidate()
+        stale = client.get("/shopify/all", params={"limit": 2, "cursor": second.json()["next_cursor"]})
+        assert stale.status_code == 409
@@ -0,0 +1,68 @@
+import asyncio
+
+from configs.config import AZURE_COSMOS_DB_CONFIG, SupplierSyncConfig
+from services.supplier_snapshot import SupplierSnapshot
+
+
+class _Connection:
+    def __init__(self):
+        self.last_response_headers = {}
+
+
+class _Container:
+    """Change feed stub that rewrites the etag after the hook, like the SDK's fetcher."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.client_connection = _Connection()
+        self.calls = []
+
+    async def query_items_change_feed(self, response_hook, **options):
+        self.calls.append(options)
+        etag, items = self.pages.pop(0)
+        response_hook({"etag": etag, "x-ms-request-charge": "1.5"}, items)
+        self.client_connection.last_response_headers = {"etag": f"token-{etag}"}
+        for item in items:
+            yield item
+
+
+class _Client:
+    def __init__(self, container):
+        self.container = container
+
+    def get_database_client(self, _):
+        return self
+
+    def get_container_client(self, _):
+        return self.container
+
+    async def close(self):
+        pass
+
+
+def test_sync_resumes_from_sdk_continuation_token(tmp_path):
+    container = _Container([
+        ('"1"', [{"id": "a", "supplier_id": "s1", "_etag": "x"}]),
+        ('"2"', [{"id": "b", "supplier_id": "s2"}]),
+    ])
+    snapshot = SupplierSnapshot(
+        lambda: _Client(container),
+        AZURE_COSMOS_DB_CONFIG,
+        SupplierSyncConfig(snapshot_path=str(tmp_path / "suppliers.json")),
+    )
+
+    async def run():
+        await snapshot.sync()
+        first_version = snapshot.version
+        await snapshot.sync()
+        return first_version, await snapshot.items()
+
+    first_version, items = asyncio.run(run())
+
+    assert container.calls == [{"start_time": "Beginning"}, {"continuation": 'token-"1"'}]
+    assert sorted(item["id"] for item in items) == ["a", "b"]
+    assert "_etag" not in items[0]
+    assert snapshot.changes_since(first_version) == [{"id": "b", "supplier_id": "s2"}]
+    assert snapshot.changes_since(snapshot.version) == []
+    # The first sync was a full one, so what changed before it is unknown.
+    assert snapshot.changes_since(0) is None
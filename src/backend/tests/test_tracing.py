@@ -0,0 +1,65 @@
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+from langgraph.graph import END, START, MessagesState, StateGraph
+from langgraph.prebuilt import ToolNode, tools_condition
+
+from agent.tracing import TurnTracer
+
+
+@tool
+def lookup_stock(sku: str) -> str:
+    """Return the stock of a SKU."""
+    return f"{sku}: 12 units"
+
+
+def _graph():
+    model = GenericFakeChatModel(messages=iter([
+        AIMessage("", tool_calls=[{"name": "lookup_stock", "args": {"sku": "A-1"}, "id": "call1"}],
+                  usage_metadata={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15}),
+        AIMessage("12 units left", usage_metadata={"input_tokens": 20, "output_tokens": 4, "total_tokens": 24}),
+    ]))
+
+    async def history_node(state):
+        return {"messages": []}
+
+    async def chat_node(state):
+        # A nested runnable inherits the node's metadata but must not become a span.
+        return {"messages": [await model.ainvoke(state["messages"])]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("history_node", history_node)
+    builder.add_node("chat_node", chat_node)
+    builder.add_node("tool_node", ToolNode([lookup_stock]))
+    builder.add_edge(START, "history_node")
+    builder.add_edge("history_node", "chat_node")
+    builder.add_conditional_edges("chat_node", tools_condition, {"tools": "tool_node", END: END})
+    builder.add_edge("tool_node", "chat_node")
+    return builder.compile()
+
+
+def test_tracer_records_a_tool_calling_turn():
+    tracer = TurnTracer("session", "request")
+
+    async def run():
+        return await _graph().ainvoke(
+            {"messages": [HumanMessage("How many A-1 are left?")]},
+            config={"callbacks": [tracer]},
+        )
+
+    result = asyncio.run(run())
+    trace = tracer.finish("ok")
+
+    assert result["messages"][-1].content == "12 units left"
+    assert [span["node"] for span in trace["spans"]] == ["history_node", "chat_node", "tool_node", "chat_node"]
+    assert all(span["status"] == "ok" for span in trace["spans"])
+    assert trace["iterations"] == 2
+    assert len(trace["llm_calls"]) == 2
+    assert [call["node"] for call in trace["llm_calls"]] == ["chat_node", "chat_node"]
+    assert trace["llm_calls"][0]["tool_calls"] == 1
+    assert (trace["input_tokens"], trace["output_tokens"]) == (30, 9)
+    [tool_call] = trace["tool_calls"]
+    assert tool_call["name"] == "lookup_stock" and tool_call["status"] == "ok"
+    assert tool_call["result_chars"] == len("A-1: 12 units")
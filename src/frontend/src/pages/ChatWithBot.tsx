@@ -9,8 +9,10 @@ type ChatMessage = {
   sender: 'user' | 'bot';
   text?: string; // plain text
   markdown?: string; // markdown content from backend
-  image?: string; // base64 image string
+  image?: string; // image URL (server URL or blob: object URL)
+  mime?: string;
   sessionId?: string;
+  streaming?: boolean; // bot message still receiving token deltas
 };
 
 const ChatWithBot: React.FC = () => {
@@ -19,11 +21,38 @@ const ChatWithBot: React.FC = () => {
   const ws = useRef<WebSocket | null>(null);
   const sessionId = useRef<string>(generateSessionId());
   const [expandedImage, setExpandedImage] = useState<{src: string, mime: string} | null>(null);
+  const [toolStatus, setToolStatus] = useState<string | null>(null);
+  // Image event waiting for the binary frame that carries its bytes
+  const pendingImage = useRef<any>(null);
+  // blob: URLs created for binary images, revoked once no message shows them
+  const objectUrls = useRef<Set<string>>(new Set());
 
   useEffect(() => {
+    const shown = new Set(messages.map((m) => m.image));
+    objectUrls.current.forEach((src) => {
+      if (!shown.has(src)) {
+        URL.revokeObjectURL(src);
+        objectUrls.current.delete(src);
+      }
+    });
+  }, [messages]);
+
+  useEffect(() => {
+    const urls = objectUrls.current;
     ws.current = new WebSocket('ws://localhost:8000/ws/chat');
+    ws.current.binaryType = 'arraybuffer';
 
     ws.current.onmessage = (event) => {
+      if (event.data instanceof ArrayBuffer) {
+        const header = pendingImage.current;
+        pendingImage.current = null;
+        if (!header) return;
+        const src = URL.createObjectURL(new Blob([event.data], { type: header.mime_type }));
+        urls.add(src);
+        setMessages((prev) => [...prev, { sender: 'bot', image: src, mime: header.mime_type, sessionId: header.sessionId }]);
+        return;
+      }
+
       let parsed: any = null;
       try {
         parsed = JSON.parse(event.data);
@@ -40,21 +69,59 @@ const ChatWithBot: React.FC = () => {
 
       if (parsed === null) return;
 
-      // If image key is present, treat as base64 image
-      if (parsed.image) {
-        // Try to auto-detect MIME type from base64 header
-        let mime = 'image/png';
-        if (parsed.image.startsWith('/9j/')) mime = 'image/jpeg';
-        if (parsed.image.startsWith('R0lGOD')) mime = 'image/gif';
-        setMessages((prev) => [...prev, {
-          sender: parsed.sender === 'user' ? 'user' : 'bot',
-          image: parsed.image,
-          sessionId: parsed.sessionId,
-          // @ts-ignore
-          mime,
-        }]);
-        // Debug log
-        console.log('Received image base64:', parsed.image.slice(0, 40), '...');
+      // Streaming protocol: token deltas are appended to the bot message in progress,
+      // tool events only update a status line, and the final message replaces the draft.
+      if (parsed.type === 'token') {
+        setMessages((prev) => {
+          const last = prev[prev.length - 1];
+          if (last && last.sender === 'bot' && last.streaming) {
+            return [...prev.slice(0, -1), { ...last, markdown: (last.markdown || '') + parsed.text }];
+          }
+          return [...prev, { sender: 'bot', markdown: parsed.text, streaming: true }];
+        });
+        return;
+      }
+
+      if (parsed.type === 'tool_start') {
+        setToolStatus(`Running ${parsed.name}...`);
+        return;
+      }
+
+      if (parsed.type === 'tool_end') {
+        setToolStatus(null);
+        // Text streamed before a tool call is not part of the final answer
+        setMessages((prev) => prev.filter((m) => !m.streaming));
+        return;
+      }
+
+      if (parsed.type === 'error') {
+        setToolStatus(null);
+        setMessages((prev) => [...prev.filter((m) => !m.streaming), { sender: 'bot', text: `Error: ${parsed.detail}` }]);
+        return;
+      }
+
+      if (parsed.type === 'trace') {
+        console.debug('Agent turn trace', parsed.trace);
+        return;
+      }
+
+      if (parsed.type === 'pong' || parsed.type === 'cancelled') {
+        return;
+      }
+
+      if (parsed.type === 'final') {
+        setToolStatus(null);
+        setMessages((prev) => [...prev.filter((m) => !m.streaming), { sender: 'bot', markdown: parsed.text }]);
+        return;
+      }
+
+      // Images arrive as a URL, or as a header followed by a binary frame with the bytes
+      if (parsed.type === 'image') {
+        if (parsed.binary) {
+          pendingImage.current = parsed;
+        } else {
+          setMessages((prev) => [...prev, { sender: 'bot', image: parsed.url, mime: parsed.mime_type, sessionId: parsed.sessionId }]);
+        }
         return;
       }
 
@@ -98,6 +165,8 @@ const ChatWithBot: React.FC = () => {
 
     return () => {
       ws.current?.close();
+      urls.forEach((src) => URL.revokeObjectURL(src));
+      urls.clear();
     };
   }, []);
 
@@ -144,10 +213,10 @@ const ChatWithBot: React.FC = () => {
               }}>
                 {msg.image ? (
                   <img
-                    src={`data:${(msg as any).mime || 'image/png'};base64,${msg.image}`}
+                    src={msg.image}
                     alt="chat image"
                     style={{maxWidth:'300px',borderRadius:8,cursor:'pointer'}}
-                    onClick={() => setExpandedImage({src: `data:${(msg as any).mime || 'image/png'};base64,${msg.image}`, mime: (msg as any).mime || 'image/png'})}
+                    onClick={() => setExpandedImage({src: msg.image!, mime: msg.mime || 'image/png'})}
                   />
                 ) : msg.markdown ? (
                   <Markdown>{msg.markdown}</Markdown>
@@ -159,6 +228,9 @@ const ChatWithBot: React.FC = () => {
           );
         })}
       </div>
+      {toolStatus && (
+        <div className="chat-tool-status" style={{marginTop:8,color:'#888',fontStyle:'italic'}}>{toolStatus}</div>
+      )}
       <div style={{ display: 'flex', gap: 8, width: '100%', marginTop: 12 }}>
         <input
           value={input}